@@ -0,0 +1,55 @@
+"""
+Escalado de MarkdownParser con el número de headings.
+
+Uso::
+
+    python benchmarks/bench_markdown.py [--headings 50000]
+
+Genera documentos con N/4, N/2 y N headings (más fences y comentarios HTML)
+y mide el tiempo de parseo. Con el índice de offsets de línea el tiempo por
+heading debe mantenerse aproximadamente constante (crecimiento lineal).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from repogpt.adapters.parser.md_parser import MarkdownParser
+from repogpt.models import ParserInput
+
+sys.path.insert(0, str(Path(__file__).parent))
+from synthetic import markdown_doc  # noqa: E402
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--headings", type=int, default=50_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    parser = MarkdownParser()
+    rows = []
+    for n in (args.headings // 4, args.headings // 2, args.headings):
+        data = markdown_doc(n).encode()
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            parser.parse(ParserInput(Path("bench.md"), {}, data))
+            best = min(best, time.perf_counter() - t0)
+        rows.append(
+            {
+                "headings": n,
+                "bytes": len(data),
+                "seconds": round(best, 4),
+                "us_per_heading": round(best / n * 1e6, 2),
+            }
+        )
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
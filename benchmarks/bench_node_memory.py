@@ -0,0 +1,102 @@
+"""
+Bytes por nodo de las distintas representaciones de árboles CodeNode.
+
+Uso::
+
+    python benchmarks/bench_node_memory.py [--classes 500] [--methods 10]
+
+Parsea un módulo Python sintético con el PythonParser real y mide con
+``tracemalloc`` la memoria retenida por:
+
+* ``dict-dataclass``: CodeNode sin slots (la representación original);
+* ``slots-dataclass``: CodeNode actual (``@dataclass(slots=True)``);
+* ``node-table``: NodeTable columnar construida a partir de los árboles.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import json
+import sys
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from repogpt.adapters.parser.py_parser import PythonParser
+from repogpt.models import CodeNode, ParserInput
+from repogpt.utils.node_table import NodeTable
+
+sys.path.insert(0, str(Path(__file__).parent))
+from synthetic import python_module  # noqa: E402
+
+DictCodeNode = dataclasses.make_dataclass(
+    "DictCodeNode",
+    [(f.name, f.type, f) for f in dataclasses.fields(CodeNode)],
+)
+
+
+def _copy(node: CodeNode, cls: Any) -> Any:
+    """Copia el árbol en ``cls`` reutilizando los mismos objetos str."""
+    copy = cls(**{f.name: getattr(node, f.name) for f in dataclasses.fields(CodeNode)})
+    copy.children = [_copy(c, cls) for c in node.children]
+    copy.comments = list(node.comments)
+    copy.tags = list(node.tags)
+    copy.dependencies = list(node.dependencies)
+    copy.metrics = dict(node.metrics)
+    return copy
+
+
+def _count(node: CodeNode) -> int:
+    return 1 + sum(_count(c) for c in node.children)
+
+
+def _measure(build: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--classes", type=int, default=500)
+    ap.add_argument("--methods", type=int, default=10)
+    ap.add_argument("--files", type=int, default=4)
+    args = ap.parse_args()
+
+    source = python_module(args.classes, args.methods).encode()
+    parser = PythonParser()
+    trees = [
+        parser.parse(ParserInput(Path(f"pkg/mod_{i}.py"), {}, source))
+        for i in range(args.files)
+    ]
+    n_nodes = sum(_count(t) for t in trees)
+
+    def build_table() -> NodeTable:
+        table = NodeTable()
+        for t in trees:
+            table.add_tree(t)
+        return table
+
+    # Los strings (ids, nombres, docstrings) son comunes a todas: se miden
+    # solo las estructuras que cada representación añade sobre ellos.
+    results: dict[str, Any] = {"nodes": n_nodes}
+    for label, build in (
+        ("dict-dataclass", lambda: [_copy(t, DictCodeNode) for t in trees]),
+        ("slots-dataclass", lambda: [_copy(t, CodeNode) for t in trees]),
+        ("node-table", build_table),
+    ):
+        total = _measure(build)
+        results[label] = {"bytes": total, "bytes_per_node": round(total / n_nodes, 1)}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
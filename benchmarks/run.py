@@ -0,0 +1,246 @@
+"""
+Benchmarks por etapa de RepoGPT sobre repositorios sintéticos.
+
+Uso::
+
+    # medir y guardar
+    python benchmarks/run.py --shape mixed --scale 0.5 -o bench.json
+
+    # comparar contra un baseline guardado (exit 1 si hay regresión)
+    python benchmarks/run.py --shape mixed --scale 0.5 --baseline bench.json
+
+Cada etapa se mide por separado y en un proceso nuevo, para que el pico de
+RSS sea el de esa etapa y no el acumulado de las anteriores:
+
+* ``collect``: ``SimpleCollector.collect``.
+* ``pipeline.<ext>``: ``SimplePipeline.process`` sobre los ficheros de cada
+  parser (secuencial y sin caché: coste por fichero).
+* ``publish.<format>.<flatten>``: ``SimplePublisher.publish`` de resultados
+  ya parseados (el parseo previo no se cronometra).
+
+Se reporta ``seconds`` (mejor de ``--repeat``), ``files_per_s``,
+``mb_per_s`` (entrada para collect/pipeline, salida para publish) y
+``peak_rss_mb``. El JSON resultante sirve directamente como baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import resource
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from repogpt import __version__
+from repogpt.adapters.collector.simple_collector import SimpleCollector
+from repogpt.adapters.parser import parsers
+from repogpt.adapters.pipeline.simple_pipeline import SimplePipeline
+from repogpt.adapters.publisher.simple_publisher import SimplePublisher
+from repogpt.models import AnalysisConf
+
+sys.path.insert(0, str(Path(__file__).parent))
+from synthetic import SHAPES, generate_repo  # noqa: E402
+
+PUBLISH_VARIANTS: tuple[tuple[str, str], ...] = (
+    ("json", "node"),
+    ("ndjson", "node"),
+    ("ndjson", "file"),
+)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KiB; macOS, bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _conf(repo: str, **kw: Any) -> AnalysisConf:
+    return AnalysisConf(
+        repo_path=Path(repo),
+        include_tests=True,
+        max_file_size=1 << 40,  # los ficheros «huge» también cuentan
+        **kw,
+    )
+
+
+def _quiet() -> None:
+    # Los logs nunca deben ensuciar el JSON de resultados
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING),
+        logger_factory=structlog.PrintLoggerFactory(file=sys.stderr),
+    )
+
+
+# === Etapas (se ejecutan en un proceso hijo) ===
+
+
+def _stage_collect(repo: str) -> dict[str, Any]:
+    conf = _conf(repo)
+    t0 = time.perf_counter()
+    files = SimpleCollector().collect(conf).files
+    seconds = time.perf_counter() - t0
+    return {
+        "seconds": seconds,
+        "files": len(files),
+        "bytes": sum(f.stat().st_size for f in files),
+    }
+
+
+def _stage_pipeline(repo: str, lang: str) -> dict[str, Any]:
+    conf = _conf(repo, languages=[lang])
+    files = SimpleCollector().collect(conf).files
+    pipeline = SimplePipeline(parsers=parsers, processors={})
+    failed = 0
+    t0 = time.perf_counter()
+    for f in files:
+        failed += pipeline.process(f, conf).root is None
+    seconds = time.perf_counter() - t0
+    return {
+        "seconds": seconds,
+        "files": len(files),
+        "bytes": sum(f.stat().st_size for f in files),
+        "failed": failed,
+    }
+
+
+def _stage_publish(repo: str, fmt: str, flatten: str, out_dir: str) -> dict[str, Any]:
+    output = Path(out_dir) / f"out.{fmt}.{flatten}"
+    conf = _conf(repo, output=output, output_format=fmt, flatten_kind=flatten)
+    pipeline = SimplePipeline(parsers=parsers, processors={})
+    results = [pipeline.process(f, conf) for f in SimpleCollector().collect(conf).files]
+    t0 = time.perf_counter()
+    SimplePublisher().publish(results, conf)
+    seconds = time.perf_counter() - t0
+    size = output.stat().st_size
+    output.unlink()
+    return {"seconds": seconds, "files": len(results), "bytes": size}
+
+
+def _in_child(fn: Callable[..., dict[str, Any]], *args: Any) -> dict[str, Any]:
+    """Ejecuta la etapa en un proceso nuevo y añade su pico de RSS."""
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1, initializer=_quiet) as pool:
+        return pool.apply(_measure, (fn, *args))
+
+
+def _measure(fn: Callable[..., dict[str, Any]], *args: Any) -> dict[str, Any]:
+    out = fn(*args)
+    out["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+    return out
+
+
+def run_stage(
+    fn: Callable[..., dict[str, Any]], *args: Any, repeat: int = 3
+) -> dict[str, Any]:
+    runs = [_in_child(fn, *args) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r["seconds"])
+    seconds = max(best["seconds"], 1e-9)
+    return {
+        **best,
+        "seconds": round(seconds, 4),
+        "files_per_s": round(best["files"] / seconds, 1),
+        "mb_per_s": round(best["bytes"] / seconds / 1e6, 2),
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+    }
+
+
+def run_suite(repo: Path, repeat: int) -> dict[str, dict[str, Any]]:
+    stages: dict[str, dict[str, Any]] = {}
+    stages["collect"] = run_stage(_stage_collect, str(repo), repeat=repeat)
+    for lang in sorted(parsers):
+        stages[f"pipeline.{lang}"] = run_stage(
+            _stage_pipeline, str(repo), lang, repeat=repeat
+        )
+    with tempfile.TemporaryDirectory() as out_dir:
+        for fmt, flatten in PUBLISH_VARIANTS:
+            stages[f"publish.{fmt}.{flatten}"] = run_stage(
+                _stage_publish, str(repo), fmt, flatten, out_dir, repeat=repeat
+            )
+    return stages
+
+
+# === Comparación con baseline ===
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Devuelve las regresiones (tiempo o RSS por encima de ``1 + tolerance``)."""
+    if current["meta"]["workload"] != baseline["meta"]["workload"]:
+        raise SystemExit("baseline was recorded with a different workload")
+    regressions = []
+    for name, cur in current["stages"].items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            continue
+        for metric in ("seconds", "peak_rss_mb"):
+            ratio = cur[metric] / max(base[metric], 1e-9)
+            status = "REGRESSION" if ratio > 1 + tolerance else "ok"
+            print(
+                f"{name:<24} {metric:<12} {base[metric]:>10} → {cur[metric]:>10} "
+                f"({ratio:5.2f}x) {status}",
+                file=sys.stderr,
+            )
+            if status != "ok":
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="Per-stage RepoGPT benchmarks on synthetic repositories.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    ap.add_argument("--shape", choices=SHAPES, default="mixed")
+    ap.add_argument("--scale", type=float, default=0.25)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--repo-dir", help="Reuse/generate the repository here.")
+    ap.add_argument("-o", "--output", help="Write results JSON here (default stdout).")
+    ap.add_argument("--baseline", help="Compare against a previous results JSON.")
+    ap.add_argument("--tolerance", type=float, default=0.15)
+    args = ap.parse_args()
+
+    workload = {"shape": args.shape, "scale": args.scale, "seed": args.seed}
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(args.repo_dir or Path(tmp) / "repo")
+        if not repo.exists():
+            generate_repo(repo, args.shape, args.scale, args.seed)
+        stages = run_suite(repo, args.repeat)
+
+    results = {
+        "meta": {
+            "workload": workload,
+            "repogpt": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "stages": stages,
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"regressions: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
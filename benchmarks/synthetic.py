@@ -0,0 +1,139 @@
+"""
+Generador de repositorios sintéticos para los benchmarks.
+
+Todo es determinista para una misma ``seed``: dos ejecuciones con los mismos
+parámetros producen exactamente los mismos ficheros, así que los resultados
+son comparables entre máquinas y versiones.
+
+Formas disponibles (``SHAPES``):
+
+* ``many-small``: miles de ficheros pequeños repartidos en paquetes.
+* ``few-huge``: unos pocos módulos y documentos muy grandes.
+* ``deep``: árbol de directorios muy profundo.
+* ``markdown-heavy``: sobre todo documentación Markdown.
+* ``mixed``: un poco de todo, más árboles ignorados (``node_modules``,
+  ``.git``) que el collector debe podar.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from pathlib import Path
+
+SHAPES: tuple[str, ...] = ("many-small", "few-huge", "deep", "markdown-heavy", "mixed")
+
+
+def python_module(
+    n_classes: int, n_methods: int, rng: random.Random | None = None
+) -> str:
+    """Módulo con imports, clases con docstring, métodos y comentarios."""
+    rng = rng or random.Random(0)
+    out = ["import os", "import sys", "from typing import Any", ""]
+    for c in range(n_classes):
+        out.append(f"class Service{c}:")
+        out.append(f'    """Servicio {c}: {rng.randint(0, 10**6)}."""')
+        out.append("")
+        for m in range(n_methods):
+            out.append(f"    def method_{m}(self, x: Any) -> Any:")
+            if rng.random() < 0.5:
+                out.append(f"        # paso {m}: TODO revisar")
+            out.append(f'        """Método {m}."""')
+            out.append(f"        return x + {rng.randint(0, 100)}")
+            out.append("")
+    out.append("def main() -> None:")
+    out.append("    pass")
+    return "\n".join(out) + "\n"
+
+
+def markdown_doc(n_headings: int, rng: random.Random | None = None) -> str:
+    """Documento con headings anidados, enlaces, bloques de código y comentarios."""
+    rng = rng or random.Random(0)
+    out = []
+    for i in range(n_headings):
+        out.append(f"{'#' * (1 + i % 3)} Sección {i}")
+        out.append("")
+        out.append(
+            f"Texto {rng.randint(0, 10**6)} con un [enlace](https://ex.com/{i})."
+        )
+        if i % 10 == 0:
+            out.extend(["```python", f"x = {i}", "```", f"<!-- TODO: revisar {i} -->"])
+        out.append("")
+    return "\n".join(out) + "\n"
+
+
+def _write(path: Path, text: str) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return 1
+
+
+def _many_small(root: Path, scale: float, rng: random.Random) -> int:
+    n = 0
+    for i in range(int(2000 * scale)):
+        pkg = root / "src" / f"pkg{i % 20}" / f"sub{i % 7}"
+        n += _write(pkg / f"mod_{i}.py", python_module(2, 3, rng))
+        if i % 4 == 0:
+            n += _write(pkg / f"notes_{i}.md", markdown_doc(6, rng))
+    return n
+
+
+def _few_huge(root: Path, scale: float, rng: random.Random) -> int:
+    n = 0
+    for i in range(max(1, int(6 * scale))):
+        n += _write(root / "gen" / f"huge_{i}.py", python_module(400, 12, rng))
+    for i in range(max(1, int(2 * scale))):
+        n += _write(root / "docs" / f"reference_{i}.md", markdown_doc(8000, rng))
+    return n
+
+
+def _deep(root: Path, scale: float, rng: random.Random) -> int:
+    n = 0
+    for branch in range(max(1, int(10 * scale))):
+        d = root / f"b{branch}"
+        for depth in range(30):
+            d = d / f"level{depth}"
+            n += _write(d / f"m{depth}.py", python_module(1, 2, rng))
+    return n
+
+
+def _markdown_heavy(root: Path, scale: float, rng: random.Random) -> int:
+    n = 0
+    for i in range(int(800 * scale)):
+        n += _write(
+            root / "docs" / f"section{i % 25}" / f"page_{i}.md", markdown_doc(40, rng)
+        )
+    return n
+
+
+def _mixed(root: Path, scale: float, rng: random.Random) -> int:
+    n = _many_small(root / "app", scale / 2, rng)
+    n += _markdown_heavy(root / "site", scale / 4, rng)
+    n += _deep(root / "legacy", scale / 2, rng)
+    # Árboles que el collector debe podar sin listarlos
+    for i in range(int(3000 * scale)):
+        _write(root / "node_modules" / f"dep{i % 50}" / f"index_{i}.md", "# dep\n")
+    for i in range(int(500 * scale)):
+        _write(root / ".git" / "objects" / f"{i:04x}.py", "x = 1\n")
+    return n
+
+
+_BUILDERS: dict[str, Callable[[Path, float, random.Random], int]] = {
+    "many-small": _many_small,
+    "few-huge": _few_huge,
+    "deep": _deep,
+    "markdown-heavy": _markdown_heavy,
+    "mixed": _mixed,
+}
+
+
+def generate_repo(root: Path, shape: str, scale: float = 1.0, seed: int = 0) -> int:
+    """
+    Crea un repositorio sintético en ``root``.
+
+    Returns:
+        Número de ficheros que el collector debería aceptar.
+    """
+    if shape not in _BUILDERS:
+        raise ValueError(f"Unknown shape '{shape}' (use one of {SHAPES})")
+    return _BUILDERS[shape](root, scale, random.Random(seed))
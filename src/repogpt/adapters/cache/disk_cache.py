@@ -0,0 +1,115 @@
+"""Caché en disco de árboles CodeNode, indexada por hash de contenido."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import structlog
+
+from repogpt.core.ports import CachePort
+from repogpt.models import CodeNode
+from repogpt.utils.tree_utils import node_from_dict, node_to_dict
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+CACHE_FORMAT = 1  # súbelo si cambia la forma serializada de CodeNode
+PRUNE_TARGET = 0.8  # tras podar, queda como mucho este % de max_bytes
+
+
+def default_cache_dir() -> Path:
+    """Caché por usuario: ``$XDG_CACHE_HOME/repogpt`` o ``~/.cache/repogpt``."""
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "repogpt"
+
+
+class DiskCache(CachePort):
+    """
+    Un fichero JSON por entrada en ``<root>/<k[:2]>/<k>.json``.
+
+    * Escrituras atómicas (temporal + ``os.replace``): varios procesos o
+      ejecuciones concurrentes pueden compartir el directorio sin locks; un
+      lector ve la entrada completa o ninguna.
+    * Expulsión LRU aproximada por mtime (``get`` lo refresca) cuando el total
+      supera ``max_bytes``; ver :meth:`prune`.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> CodeNode | None:
+        entry = self._entry(key)
+        try:
+            with entry.open("r", encoding="utf-8") as fh:
+                payload = json.load(fh)
+            if not isinstance(payload, dict) or payload.get("format") != CACHE_FORMAT:
+                raise ValueError("not a cache entry")
+            if not isinstance(payload.get("root"), dict):
+                raise ValueError("entry without a root node")
+            root = node_from_dict(payload["root"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            # Entrada corrupta o de otra versión: se trata como fallo de caché
+            logger.debug("cache entry discarded", path=str(entry), error=str(exc))
+            entry.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(entry)  # marca de uso para la expulsión LRU
+        except OSError:
+            pass
+        return root
+
+    def put(self, key: str, root: CodeNode) -> None:
+        entry = self._entry(key)
+        payload = {"format": CACHE_FORMAT, "root": node_to_dict(root, nested=True)}
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    json.dump(payload, fh, ensure_ascii=False)
+                os.replace(tmp, entry)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as exc:
+            # Una caché que no se puede escribir nunca debe romper el análisis
+            logger.warning("cache write failed", path=str(entry), error=str(exc))
+
+    def prune(self) -> int:
+        """Expulsa las entradas menos usadas si se supera ``max_bytes``.
+
+        Returns:
+            Número de entradas eliminadas.
+        """
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+        for entry in self.root.glob("*/*.json"):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:  # borrada por otro proceso
+                continue
+            entries.append((st.st_mtime, st.st_size, entry))
+            total += st.st_size
+        if total <= self.max_bytes:
+            return 0
+
+        removed = 0
+        target = self.max_bytes * PRUNE_TARGET
+        for _, size, entry in sorted(entries):
+            if total <= target:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        logger.debug("cache pruned", removed=removed, bytes=total)
+        return removed
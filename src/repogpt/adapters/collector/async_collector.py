@@ -0,0 +1,71 @@
+"""
+Collector async: el mismo walk que ``SimpleCollector`` con los listados en paralelo.
+
+Cada directorio se lista (``scandir`` + ``stat`` de sus ficheros) en un hilo
+antes de que le llegue el turno: se adelantan los ``io_concurrency``
+siguientes en preorden, así que ni los listados en vuelo ni los ya hechos
+pendientes de consumir crecen con el ancho del árbol. Los ficheros se
+siguen emitiendo en el mismo preorden alfabético que el walk síncrono. Útil
+cuando cada llamada al sistema de ficheros cuesta milisegundos (NFS, FUSE…).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from repogpt.adapters.collector.simple_collector import FileFilter, SimpleCollector
+from repogpt.models import AnalysisConf
+
+_Listing = tuple[list[tuple[Path, bool]], list[tuple[str, str]]]
+
+
+class AsyncCollector(SimpleCollector):
+    """``SimpleCollector`` que además implementa ``AsyncCollectorPort``."""
+
+    async def aiter_files(self, conf: AnalysisConf) -> AsyncIterator[Path]:
+        repo_root = await asyncio.to_thread(self._repo_root, conf)
+        rules = await asyncio.to_thread(FileFilter, repo_root, conf)
+
+        def listing(dir_path: str, rel_dir: str) -> asyncio.Future[_Listing]:
+            return asyncio.ensure_future(
+                asyncio.to_thread(self._scan_dir, rules, dir_path, rel_dir, conf)
+            )
+
+        window = max(1, conf.io_concurrency)
+        # Directorios pendientes en preorden (la cima es el siguiente) con su
+        # listado, si ya se lanzó
+        stack: list[tuple[str, str, asyncio.Future[_Listing] | None]] = [
+            (str(repo_root), "", None)
+        ]
+        in_flight = 0  # listados lanzados y aún sin consumir
+
+        def prefetch() -> None:
+            # Lanza los pendientes más cercanos a la cima hasta llenar la
+            # ventana; tras cada ``pop`` queda hueco, así que la cima siempre
+            # está lanzada.
+            nonlocal in_flight
+            i = len(stack) - 1
+            while i >= 0 and in_flight < window:
+                dir_path, rel_dir, fut = stack[i]
+                if fut is None:
+                    stack[i] = (dir_path, rel_dir, listing(dir_path, rel_dir))
+                    in_flight += 1
+                i -= 1
+
+        try:
+            while stack:
+                prefetch()
+                fut = stack.pop()[2]
+                assert fut is not None
+                files, subdirs = await fut
+                in_flight -= 1
+                stack.extend((d, rel, None) for d, rel in reversed(subdirs))
+                for path, accepted in files:
+                    if accepted:
+                        yield path
+        finally:
+            for _, _, pending in stack:
+                if pending is not None:
+                    pending.cancel()
@@ -0,0 +1,107 @@
+"""
+Collector basado en git: enumera ficheros desde el índice en lugar del disco.
+
+``git ls-files`` ya descarta lo que ``.gitignore`` excluye y nunca entra en
+``node_modules`` o ``build`` no versionados, así que no hay walk que podar.
+Con ``since`` solo se devuelven los ficheros cambiados respecto al merge-base
+de esa revisión con ``HEAD`` (el diff de una PR), incluidos los cambios aún
+sin commitear.
+
+Sobre esa lista se aplican las mismas reglas que en ``SimpleCollector``
+(extensiones, tests, ``.repogptignore``, ocultos, tamaño).
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import stat
+import subprocess
+from collections.abc import Iterator
+from pathlib import Path
+
+import structlog
+
+from repogpt.adapters.collector.simple_collector import FileFilter, SimpleCollector
+from repogpt.exceptions import ConfigurationError
+from repogpt.models import AnalysisConf
+
+logger = structlog.get_logger(__name__)
+
+
+def _git(repo_root: Path, *args: str) -> bytes:
+    git = shutil.which("git")
+    if git is None:
+        raise ConfigurationError("git collector needs a 'git' executable on PATH")
+    proc = subprocess.run(
+        [git, "-C", str(repo_root), *args],
+        capture_output=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        err = proc.stderr.decode("utf-8", "replace").strip()
+        raise ConfigurationError(f"git {args[0]} failed: {err}")
+    return proc.stdout
+
+
+def _split_z(out: bytes) -> list[str]:
+    # -z: rutas sin escapar, separadas por NUL
+    return [os.fsdecode(p) for p in out.split(b"\0") if p]
+
+
+class GitCollector(SimpleCollector):
+    """``SimpleCollector`` con la lista de ficheros sacada de git."""
+
+    def __init__(self, since: str | None = None) -> None:
+        self.since = since
+
+    def iter_files(self, conf: AnalysisConf) -> Iterator[Path]:
+        repo_root = self._repo_root(conf)
+        # git se ejecuta ya: sus errores salen aquí, no al consumir
+        paths = self._git_paths(repo_root)
+        return (p for p, accepted in self._filter(repo_root, paths, conf) if accepted)
+
+    # ------------------------------------------------------------------
+    def _git_paths(self, repo_root: Path) -> list[str]:
+        """Rutas relativas a ``repo_root`` (posix), ordenadas."""
+        if self.since is None:
+            paths = _split_z(_git(repo_root, "ls-files", "-z", "--cached"))
+        else:
+            base = _git(repo_root, "merge-base", self.since, "HEAD").decode().strip()
+            # --relative: rutas relativas a repo_root (puede ser un subdirectorio
+            # del repositorio git) y limitadas a él; sin borrados
+            paths = _split_z(
+                _git(
+                    repo_root,
+                    "diff",
+                    "--name-only",
+                    "-z",
+                    "--relative",
+                    "--diff-filter=d",
+                    base,
+                )
+            )
+        logger.debug("git files", count=len(paths), since=self.since)
+        return sorted(set(paths))
+
+    def _scan(self, repo_root: Path, conf: AnalysisConf) -> Iterator[tuple[Path, bool]]:
+        return self._filter(repo_root, self._git_paths(repo_root), conf)
+
+    @staticmethod
+    def _filter(
+        repo_root: Path, paths: list[str], conf: AnalysisConf
+    ) -> Iterator[tuple[Path, bool]]:
+        rules = FileFilter(repo_root, conf)
+        for rel in paths:
+            path = repo_root / rel
+            if not rules.accepts_path(rel):
+                yield path, False
+                continue
+            try:
+                st = path.lstat()
+            except FileNotFoundError:  # en el índice pero borrado del disco
+                yield path, False
+                continue
+            # Symlinks y submódulos (directorios) no se siguen
+            accepted = stat.S_ISREG(st.st_mode) and st.st_size <= conf.max_file_size
+            yield path, accepted
@@ -1,3 +1,5 @@
+import os
+from collections.abc import Iterator
 from pathlib import Path
 
 import pathspec
@@ -6,7 +8,8 @@ import structlog
 from repogpt.adapters.parser import parsers
 from repogpt.core.ports import CollectorPort
 from repogpt.models import AnalysisConf, CollectionResult
-from repogpt.utils.file_utils import is_likely_binary
+
+logger = structlog.get_logger(__name__)
 
 # Carpeta/archivo siempre ignorados
 DEFAULT_IGNORES: set[str] = {
@@ -59,9 +62,68 @@ def should_ignore(
     return False
 
 
+class FileFilter:
+    """
+    Reglas de selección compartidas por los collectors.
+
+    Trabaja sobre rutas relativas al repo en formato posix, así que sirve
+    tanto para el walk de ``SimpleCollector`` como para listas de ficheros
+    que vienen de otra fuente (p. ej. ``git ls-files``).
+    """
+
+    def __init__(self, repo_root: Path, conf: AnalysisConf) -> None:
+        self.conf = conf
+        self.allowed_exts = set(conf.languages or parsers.keys())
+        self.spec = load_pathspec(repo_root)
+
+    @staticmethod
+    def ignored_name(name: str) -> bool:
+        """Ignores fijos y entradas ocultas (ficheros o directorios)."""
+        return name in DEFAULT_IGNORES or name.startswith(".")
+
+    def accepts_dir(self, name: str, rel: str) -> bool:
+        # Un patrón que casa con el directorio lo poda entero
+        if self.spec and self.spec.match_file(rel + "/"):
+            return False
+        # Excluye tests si así lo pide la conf
+        return self.conf.include_tests or name != "tests"
+
+    def accepts_file(self, name: str, rel: str) -> bool:
+        # Solo extensiones soportadas
+        _, dot, ext = name.rpartition(".")
+        if not dot or ext.lower() not in self.allowed_exts:
+            return False
+        if not self.conf.include_tests and name.startswith(("test_", "test-")):
+            return False
+        return not (self.spec and self.spec.match_file(rel))
+
+    def accepts_path(self, rel: str) -> bool:
+        """Aplica todas las reglas a una ruta completa (sin mirar el disco)."""
+        *dirs, name = rel.split("/")
+        prefix = ""
+        for d in dirs:
+            if self.ignored_name(d) or not self.accepts_dir(d, prefix + d):
+                return False
+            prefix += d + "/"
+        return not self.ignored_name(name) and self.accepts_file(name, rel)
+
+
 class SimpleCollector(CollectorPort):
     def collect(self, conf: AnalysisConf) -> CollectionResult:
+        files: list[Path] = []
+        skipped: list[Path] = []
+        for p, accepted in self._scan(self._repo_root(conf), conf):
+            (files if accepted else skipped).append(p)
+        return CollectionResult(files=files, skipped=skipped, types=None)
+
+    def iter_files(self, conf: AnalysisConf) -> Iterator[Path]:
+        # Los sanity checks se hacen aquí, no al consumir el generador
+        repo_root = self._repo_root(conf)
+        return (p for p, accepted in self._scan(repo_root, conf) if accepted)
 
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _repo_root(conf: AnalysisConf) -> Path:
         repo_root = conf.repo_path.resolve()
         # ---------- sanity checks ----------
         if not repo_root.exists():
@@ -70,40 +132,72 @@ class SimpleCollector(CollectorPort):
             raise NotADirectoryError(
                 f"Repository path '{repo_root}' is not a directory"
             )
+        return repo_root
 
-        allowed_exts = set(conf.languages or parsers.keys())
-        spec = load_pathspec(repo_root)
-        files: list[Path] = []
-        skipped: list[Path] = []
-        slogger = structlog.get_logger(__name__)
-        for p in repo_root.rglob("*"):
-            # Ignorar directorios, symlinks y patrones .repogptignore
-            if should_ignore(p, repo_root, spec):
-                slogger.debug("skip", path=str(p), reason="ignored")
-                skipped.append(p)
+    def _scan(self, repo_root: Path, conf: AnalysisConf) -> Iterator[tuple[Path, bool]]:
+        """
+        Recorre el repo emitiendo ``(path, aceptado)`` sin acumular listas.
+
+        Walk con ``os.scandir``: los directorios ignorados se podan antes de
+        entrar (``node_modules``, ``.git``… nunca se listan), los patrones de
+        ``.repogptignore`` se evalúan una vez por directorio y se reutiliza la
+        información de tipo de ``DirEntry``. El orden es determinista.
+        """
+        rules = FileFilter(repo_root, conf)
+        # (directorio absoluto, prefijo relativo en formato posix: "" o "a/b/")
+        stack: list[tuple[str, str]] = [(str(repo_root), "")]
+        while stack:
+            entries, subdirs = self._scan_dir(rules, *stack.pop(), conf)
+            yield from entries
+            # Preorden: los subdirectorios se visitan en orden alfabético
+            stack.extend(reversed(subdirs))
+
+    @staticmethod
+    def _scan_dir(
+        rules: FileFilter, dir_path: str, rel_dir: str, conf: AnalysisConf
+    ) -> tuple[list[tuple[Path, bool]], list[tuple[str, str]]]:
+        """
+        Lista un directorio: ``(ficheros con su veredicto, subdirectorios a
+        visitar)``. Es la unidad de I/O del walk (``scandir`` + ``stat``).
+        """
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as exc:
+            logger.warning("unreadable directory", path=dir_path, error=str(exc))
+            return [], []
+
+        files: list[tuple[Path, bool]] = []
+        subdirs: list[tuple[str, str]] = []
+
+        def skip(entry: os.DirEntry[str]) -> None:
+            logger.debug("skip", path=entry.path, reason="ignored")
+            files.append((Path(entry.path), False))
+
+        for entry in entries:
+            name = entry.name
+            # Hardcoded ignores, ocultos y symlinks (no seguimos)
+            if rules.ignored_name(name) or entry.is_symlink():
+                skip(entry)
                 continue
-            if not p.is_file():
+            rel = rel_dir + name
+
+            if entry.is_dir(follow_symlinks=False):
+                if not rules.accepts_dir(name, rel):
+                    skip(entry)
+                    continue
+                subdirs.append((entry.path, rel + "/"))
                 continue
-            # Solo extensiones soportadas (puedes cambiar según tus parsers)
-            allowed_exts = set(
-                conf.languages or parsers.keys()
-            )  # parsers importado abajo
-            if p.suffix.lstrip(".").lower() not in allowed_exts:
-                slogger.debug("skip", path=str(p), reason="ignored")
-                skipped.append(p)
+            if not entry.is_file(follow_symlinks=False):
                 continue
-            # Excluye tests si así lo pide la conf
-            if not conf.include_tests:
-                filename = p.parts[-1]
-                if "tests" in p.parts or filename.startswith(("test_", "test-")):
-                    slogger.debug("skip", path=str(p), reason="ignored")
-                    skipped.append(p)
-                    continue
 
-            # Filtrar por tamaño y binarios
-            if p.stat().st_size > conf.max_file_size or is_likely_binary(p):
-                slogger.debug("skip", path=str(p), reason="ignored")
-                skipped.append(p)
+            if not rules.accepts_file(name, rel):
+                skip(entry)
                 continue
-            files.append(p)
-        return CollectionResult(files=files, skipped=skipped, types=None)
+            # Filtrar por tamaño (los binarios los detecta el pipeline sobre
+            # el buffer que ya lee, sin abrir el fichero aquí)
+            if entry.stat(follow_symlinks=False).st_size > conf.max_file_size:
+                skip(entry)
+                continue
+            files.append((Path(entry.path), True))
+        return files, subdirs
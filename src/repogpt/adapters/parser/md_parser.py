@@ -1,14 +1,22 @@
 # repogpt/adapters/parser/md_parser.py
 import re
-from uuid import uuid4
+from bisect import bisect_right
 
 from repogpt.models import CodeNode, ParserInput, ParserInterface
-from repogpt.utils.text_processing import count_blank_lines, extract_comments
+from repogpt.utils.node_ids import NodeIdFactory
+from repogpt.utils.text_processing import (
+    LineIndex,
+    count_blank_lines,
+    extract_comments,
+)
 
 
 class MarkdownParser(ParserInterface):
     """Parser para archivos Markdown, construye un árbol de CodeNode."""
 
+    # Forma parte de la clave de caché: súbela si cambia el árbol producido
+    version = "2"
+
     HEADING_RE = re.compile(r"^(#+)\s+(.*)$", re.MULTILINE)
     LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
     FENCE_RE = re.compile(r"^```", re.MULTILINE)
@@ -28,22 +36,29 @@ class MarkdownParser(ParserInterface):
             CodeNode: Root node of the parsed tree
         """
         path = input.file_path
-        content = path.read_text(encoding="utf-8", errors="replace")
+        content = input.read_text()
         lines = content.splitlines()
         total_lines = len(lines)
+        make_id = NodeIdFactory(input.id_path())
+        opts = input.analysis
+        line_index = LineIndex(content)  # compartido: headings, fences, comentarios
 
         root = CodeNode(
-            id=str(uuid4()),
+            id=make_id("Module", None),
             type="Module",
             name=path.stem,
             language="markdown",
             path=str(path),
             start_line=1,
             end_line=total_lines,
-            metrics={
-                "blank_lines": count_blank_lines(content),
-                "lines_of_code": len([line for line in lines if line.strip()]),
-            },
+            metrics=(
+                {
+                    "blank_lines": count_blank_lines(content),
+                    "lines_of_code": len([line for line in lines if line.strip()]),
+                }
+                if opts.metrics
+                else {}
+            ),
         )
 
         # 1. Headings como nodos hijos
@@ -51,16 +66,29 @@ class MarkdownParser(ParserInterface):
             {
                 "level": len(m.group(1)),
                 "title": m.group(2).strip(),
-                "start_line": content.count("\n", 0, m.start()) + 1,
+                "start_line": line_index.line_of(m.start()),
             }
             for m in self.HEADING_RE.finditer(content)
         ]
+        # qualname = ruta de títulos por nivel ("Guía > Instalación"): estable
+        # aunque se añadan secciones en otras partes del documento
+        outline: list[tuple[int, str]] = []
+        heading_lines: list[int] = []
+        heading_paths: list[str] = []
         for h in headings:
+            level, title = int(h["level"]), str(h["title"])
+            while outline and outline[-1][0] >= level:
+                outline.pop()
+            outline.append((level, title))
+            qualname = " > ".join(t for _, t in outline)
+            heading_lines.append(int(h["start_line"]))
+            heading_paths.append(qualname)
             root.children.append(
                 CodeNode(
-                    id=str(uuid4()),
+                    id=make_id("Heading", qualname),
                     type="Heading",
-                    name=str(h["title"]),
+                    name=title,
+                    qualname=qualname,
                     language="markdown",
                     path=root.path,
                     start_line=int(h["start_line"]),
@@ -79,15 +107,18 @@ class MarkdownParser(ParserInterface):
         # 3. Code blocks como hijos anónimos
         code_blocks = []
         for m in self.FENCE_RE.finditer(content):
-            code_blocks.append(content.count("\n", 0, m.start()) + 1)
+            code_blocks.append(line_index.line_of(m.start()))
         # Group code blocks by pairs (start, end)
         for i in range(0, len(code_blocks), 2):
             try:
                 start = code_blocks[i]
                 end = code_blocks[i + 1]
+                # Anónimo: se identifica por la sección que lo contiene
+                section = bisect_right(heading_lines, start) - 1
+                scope = heading_paths[section] if section >= 0 else None
                 root.children.append(
                     CodeNode(
-                        id=str(uuid4()),
+                        id=make_id("CodeBlock", scope),
                         type="CodeBlock",
                         name=None,
                         language="markdown",
@@ -101,8 +132,15 @@ class MarkdownParser(ParserInterface):
                 # Unmatched ```
                 continue
 
-        # 4. Comentarios HTML
-        comments = extract_comments(content, language="markdown")
+        # 4. Métricas por sección (modo full): líneas hasta el siguiente
+        # heading del mismo nivel o superior
+        if opts.extras:
+            self._section_metrics(root, total_lines)
+
+        # 5. Comentarios HTML
+        if not opts.comments:
+            return root
+        comments = extract_comments(content, language="markdown", line_index=line_index)
         for c in comments:
             root.comments.append(c)
             # Extra tags tipo TODO/FIXME
@@ -113,3 +151,17 @@ class MarkdownParser(ParserInterface):
                 root.tags.append("FIXME")
 
         return root
+
+    @staticmethod
+    def _section_metrics(root: CodeNode, total_lines: int) -> None:
+        headings = [c for c in root.children if c.type == "Heading"]
+        for i, h in enumerate(headings):
+            end = total_lines
+            for nxt in headings[i + 1 :]:
+                if nxt.metrics["level"] <= h.metrics["level"]:
+                    end = (nxt.start_line or end) - 1
+                    break
+            h.metrics["section_lines"] = end - (h.start_line or 1) + 1
+        for c in root.children:
+            if c.type == "CodeBlock" and c.start_line and c.end_line:
+                c.metrics["lines"] = c.end_line - c.start_line + 1
@@ -2,78 +2,156 @@
 
 import ast
 from typing import Any
-from uuid import uuid4
 
-from repogpt.models import CodeNode, ParserInput, ParserInterface
-from repogpt.utils.text_processing import (
-    count_blank_lines,
-    extract_comments,
-)
+from repogpt.models import AnalysisProfile, CodeNode, ParserInput, ParserInterface
+from repogpt.utils.node_ids import NodeIdFactory
+from repogpt.utils.text_processing import extract_todos_fixmes, scan_python_source
 
 
 class PythonParser(ParserInterface):
+    # Forma parte de la clave de caché: súbela si cambia el árbol producido
+    version = "2"
+
+    # Nodos que abren una rama más (complejidad ciclomática aproximada)
+    BRANCHES = (
+        ast.If,
+        ast.IfExp,
+        ast.For,
+        ast.AsyncFor,
+        ast.While,
+        ast.ExceptHandler,
+        ast.With,
+        ast.AsyncWith,
+        ast.Assert,
+        ast.comprehension,
+        ast.match_case,
+    )
+
     def __init__(self) -> None:
         pass
 
     def parse(self, input: ParserInput) -> CodeNode:
         path = input.file_path
-        content = path.read_text(encoding="utf-8", errors="replace")
+        content = input.read_text()
         tree = ast.parse(content, filename=str(path))
+        make_id = NodeIdFactory(input.id_path())
+        opts = input.analysis
+
+        # --- Comments + line metrics: one tokenizer pass (skipped if no '#')
+        comments, blank_lines, lines_of_code = scan_python_source(
+            content, comments=opts.comments, metrics=opts.metrics
+        )
 
         # --- Root node (Module) ---
         root = CodeNode(
-            id=str(uuid4()),
+            id=make_id("Module", None),
             type="Module",
             name=path.stem,
             language="python",
             path=str(path),
             start_line=1,
             end_line=content.count("\n") + 1,
-            metrics={
-                "blank_lines": count_blank_lines(content),
-                "lines_of_code": len(
-                    [line for line in content.splitlines() if line.strip()]
-                ),
-            },
+            metrics=(
+                {
+                    "blank_lines": blank_lines,
+                    "lines_of_code": lines_of_code,
+                }
+                if opts.metrics
+                else {}
+            ),
         )
 
-        # --- Extract comments (flat, will associate later)
-        comments = extract_comments(content, language="python")
-
         # --- Build CodeNode tree ---
-        self._visit(tree, parent_node=root)
+        self._visit(tree, parent_node=root, make_id=make_id, opts=opts)
 
         # --- Associate comments ---
-        self._associate_comments(root, comments)
+        if comments:
+            self._associate_comments(root, comments)
+            if opts.extras:
+                self._tag_comments(root)
 
         return root
 
-    def _visit(self, node: ast.AST, parent_node: CodeNode) -> None:
+    def _visit(
+        self,
+        node: ast.AST,
+        parent_node: CodeNode,
+        make_id: NodeIdFactory,
+        opts: AnalysisProfile,
+    ) -> None:
         """Recursively visit AST nodes and build CodeNode instances."""
         for child in ast.iter_child_nodes(node):
             cn = None
             if isinstance(
                 child, ast.Import | ast.ImportFrom
             ):  # <-- nuevo (Python 3.10+)
-                cn = self._make_import_node(child, parent_node)
+                cn = self._make_import_node(child, parent_node, make_id)
             elif isinstance(child, ast.ClassDef):
-                cn = self._make_class_node(child, parent_node)
+                cn = self._make_class_node(child, parent_node, make_id, opts)
             elif isinstance(child, ast.FunctionDef | ast.AsyncFunctionDef):
-                cn = self._make_function_node(child, parent_node)
+                cn = self._make_function_node(child, parent_node, make_id, opts)
 
             if cn:
+                if opts.extras:
+                    cn.metrics = self._node_metrics(child, cn)
                 parent_node.children.append(cn)
-                self._visit(child, parent_node=cn)
+                self._visit(child, parent_node=cn, make_id=make_id, opts=opts)
             else:
                 # Sigue recorriendo (por si hay anidados, ej: funciones en funciones)
-                self._visit(child, parent_node=parent_node)
+                self._visit(child, parent_node=parent_node, make_id=make_id, opts=opts)
+
+    def _node_metrics(self, node: ast.AST, cn: CodeNode) -> dict[str, Any]:
+        """Métricas por nodo (modo full)."""
+        metrics: dict[str, Any] = {}
+        if cn.start_line and cn.end_line:
+            metrics["lines"] = cn.end_line - cn.start_line + 1
+        if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+            args = node.args
+            metrics["args"] = (
+                len(args.posonlyargs)
+                + len(args.args)
+                + len(args.kwonlyargs)
+                + (args.vararg is not None)
+                + (args.kwarg is not None)
+            )
+            metrics["complexity"] = 1 + sum(
+                len(n.values) - 1 if isinstance(n, ast.BoolOp) else 1
+                for n in ast.walk(node)
+                if isinstance(n, self.BRANCHES + (ast.BoolOp,))
+            )
+        elif isinstance(node, ast.ClassDef):
+            metrics["methods"] = sum(
+                isinstance(n, ast.FunctionDef | ast.AsyncFunctionDef) for n in node.body
+            )
+        return metrics
+
+    @staticmethod
+    def _tag_comments(root: CodeNode) -> None:
+        """Tags TODO/FIXME en el nodo al que pertenece cada comentario."""
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            todos, fixmes = extract_todos_fixmes(node.comments)
+            if todos:
+                node.tags.append("TODO")
+            if fixmes:
+                node.tags.append("FIXME")
+            stack.extend(node.children)
+
+    @staticmethod
+    def _qualname(parent: CodeNode, name: str) -> str:
+        return f"{parent.qualname}.{name}" if parent.qualname else name
 
     def _make_import_node(
-        self, node: ast.Import | ast.ImportFrom, parent: CodeNode
+        self,
+        node: ast.Import | ast.ImportFrom,
+        parent: CodeNode,
+        make_id: NodeIdFactory,
     ) -> CodeNode:
         imports = [{"name": a.name, "type": "external"} for a in node.names]
         return CodeNode(
-            id=str(uuid4()),
+            # Anónimo: se identifica por su ámbito y su orden dentro de él
+            id=make_id("Import", parent.qualname),
             type="Import",
             name=None,
             path=parent.path,
@@ -84,54 +162,79 @@ class PythonParser(ParserInterface):
             language=parent.language,
         )
 
-    def _make_class_node(self, node: ast.ClassDef, parent: CodeNode) -> CodeNode:
+    def _make_class_node(
+        self,
+        node: ast.ClassDef,
+        parent: CodeNode,
+        make_id: NodeIdFactory,
+        opts: AnalysisProfile,
+    ) -> CodeNode:
+        qualname = self._qualname(parent, node.name)
         return CodeNode(
-            id=str(uuid4()),
+            id=make_id("Class", qualname),
             type="Class",
             name=node.name,
+            qualname=qualname,
             path=parent.path,
             parent_id=parent.id,
             start_line=node.lineno,
             end_line=getattr(node, "end_lineno", node.lineno),
-            docstring=ast.get_docstring(node),
+            docstring=ast.get_docstring(node) if opts.docstrings else None,
             language=parent.language,
         )
 
     def _make_function_node(
-        self, node: ast.FunctionDef | ast.AsyncFunctionDef, parent: CodeNode
+        self,
+        node: ast.FunctionDef | ast.AsyncFunctionDef,
+        parent: CodeNode,
+        make_id: NodeIdFactory,
+        opts: AnalysisProfile,
     ) -> CodeNode:
+        qualname = self._qualname(parent, node.name)
         return CodeNode(
-            id=str(uuid4()),
+            id=make_id("Function", qualname),
             type="Function",
             name=node.name,
+            qualname=qualname,
             path=parent.path,
             parent_id=parent.id,
             start_line=node.lineno,
             end_line=getattr(node, "end_lineno", node.lineno),
-            docstring=ast.get_docstring(node),
+            docstring=ast.get_docstring(node) if opts.docstrings else None,
             language=parent.language,
         )
 
     def _associate_comments(
         self, root: CodeNode, comments: list[dict[str, Any]]
     ) -> None:
-        """Attach comments to the smallest containing CodeNode by line range."""
-
-        def walk(node: CodeNode, comment: dict[str, Any]) -> CodeNode | None:
-            if (
-                node.start_line
-                and node.end_line
-                and node.start_line <= comment["line"] <= node.end_line
-            ):
-                for child in node.children:
-                    found = walk(child, comment)
-                    if found:
-                        return found
-                return node
-            return None
-
-        for comment in comments:
-            owner = walk(root, comment) or root
+        """
+        Attach comments to the smallest containing CodeNode by line range.
+
+        Merge-style sweep: comments are visited in line order and every node
+        keeps a cursor into its children that only moves forward (sibling
+        ranges are ordered), so each child is skipped at most once overall.
+        Cost is O(n + c·depth) instead of walking the tree for every comment.
+        Ties (several statements on one line) go to the first sibling, as the
+        recursive lookup did.
+        """
+        cursors: dict[int, int] = {}
+        for comment in sorted(comments, key=lambda c: c["line"]):
+            line = comment["line"]
+            owner = root
+            while owner.children:
+                children = owner.children
+                j = cursors.get(id(owner), 0)
+                while j < len(children) and (
+                    not children[j].end_line or children[j].end_line < line
+                ):
+                    j += 1
+                cursors[id(owner)] = j
+                if j == len(children):
+                    break
+                child = children[j]
+                if not child.start_line or child.start_line > line:
+                    break
+                owner = child
             owner.comments.append(comment)
 
     def _alias(self, a: ast.alias) -> str:
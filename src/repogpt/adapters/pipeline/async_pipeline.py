@@ -0,0 +1,28 @@
+"""Pipeline async: lectura concurrente en hilos, parseo igual que ``SimplePipeline``."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from repogpt.adapters.pipeline.simple_pipeline import SimplePipeline
+from repogpt.models import AnalysisConf, PipelineResult
+from repogpt.utils.file_utils import FileBuffer, read_file_buffer
+
+
+class AsyncPipeline(SimplePipeline):
+    """
+    ``SimplePipeline`` que además implementa ``AsyncPipelinePort``.
+
+    ``aread`` solo hace el I/O; el resto (hash, caché, parser, processors) es
+    ``process_bytes``, que el executor async manda al pool de CPU. ``process``
+    sigue disponible para el modo síncrono.
+    """
+
+    async def aread(
+        self, file: Path, conf: AnalysisConf
+    ) -> FileBuffer | PipelineResult:
+        try:
+            return await asyncio.to_thread(read_file_buffer, file)
+        except OSError as exc:
+            return self.read_error(file, exc)
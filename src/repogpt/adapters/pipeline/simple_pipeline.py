@@ -2,24 +2,57 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
+import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Generic, Protocol, TypeVar
 
-
 import structlog
 
-from repogpt.core.ports import PipelinePort
+from repogpt import __version__
+from repogpt.core.executor import resolve_jobs
+from repogpt.core.ports import CachePort, PipelinePort
 from repogpt.models import (
     AnalysisConf,
     CodeNode,
     ParserInput,
     PipelineResult,
 )
-from repogpt.utils.file_utils import calculate_file_hash
+from repogpt.utils.file_utils import (
+    FileBuffer,
+    content_digest,
+    get_hasher,
+    looks_binary,
+    read_file_buffer,
+    release_buffer,
+)
 
 logger = structlog.get_logger(__name__)
 
+# Ficheros a partir de este tamaño se hashean en un hilo mientras se parsean
+# (hashlib y xxhash sueltan el GIL); por debajo no compensa el cambio de hilo
+PARALLEL_HASH_THRESHOLD = 1024 * 1024
+CPUS = os.cpu_count() or 1
+
+_hash_lock = threading.Lock()
+_hash_executor: tuple[int, ThreadPoolExecutor] | None = None
+
+
+def _hash_pool() -> ThreadPoolExecutor:
+    """Hilo de hash del proceso actual (se recrea tras un fork)."""
+    global _hash_executor
+    with _hash_lock:
+        pid = os.getpid()
+        if _hash_executor is None or _hash_executor[0] != pid:
+            pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="repogpt-hash")
+            _hash_executor = (pid, pool)
+        return _hash_executor[1]
+
+
 T_co = TypeVar("T_co", bound=CodeNode)
 
 
@@ -31,23 +64,151 @@ class Processor(Protocol, Generic[T_co]):
     def __call__(self, node: T_co) -> T_co: ...
 
 
+def _rel_path(file: Path, conf: AnalysisConf) -> str | None:
+    try:
+        return file.relative_to(conf.repo_path).as_posix()
+    except ValueError:  # fuera del repo: el parser usa la ruta tal cual
+        return None
+
+
+def _rebase_paths(root: CodeNode, path: str) -> None:
+    """Apunta ``node.path`` a la ruta actual: la entrada puede ser de otro checkout."""
+    if root.path == path:
+        return
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        node.path = path
+        stack.extend(node.children)
+
+
 class SimplePipeline(PipelinePort):
     def __init__(
         self,
         parsers: dict[str, Parser],
         processors: dict[str, Processor[Any]] | None = None,
+        cache: CachePort | None = None,
     ) -> None:
         self.parsers = parsers
         self.processors = processors or {}
+        self.cache = cache
+
+    @staticmethod
+    def cache_key(input: ParserInput, digest: str, parser: Parser) -> str:
+        """
+        Clave de caché: fichero, contenido, modo de análisis y versión del
+        parser que lo lee.
+
+        El fichero entra por su ruta relativa al repo (de ella dependen los
+        IDs de nodo): otro checkout del mismo repo, en otra ruta, reutiliza
+        las entradas.
+        """
+        parts = (
+            input.id_path(),
+            digest,
+            input.analysis.name,
+            type(parser).__qualname__,
+            str(getattr(parser, "version", "0")),
+            __version__,
+        )
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _parse(self, parser: Parser, input: ParserInput) -> CodeNode:
+        digest = content_digest(input.file_info)
+        if self.cache is None or digest is None:
+            return parser.parse(input)
+
+        key = self.cache_key(input, digest, parser)
+        root = self.cache.get(key)
+        if root is None:
+            root = parser.parse(input)
+            self.cache.put(key, root)
+        else:
+            _rebase_paths(root, str(input.file_path))
+        return root
 
     # ------------------------------------------------------------------
     def process(self, file: Path, conf: AnalysisConf) -> PipelineResult:  # noqa: D401
+        t0 = time.perf_counter()
+        # Una sola lectura: tamaño, hash, detección de binarios y texto del
+        # parser salen del mismo buffer.
+        try:
+            data = read_file_buffer(file)
+        except OSError as exc:
+            return self.read_error(file, exc)
+        try:
+            return self.process_bytes(file, data, conf, time.perf_counter() - t0)
+        finally:
+            release_buffer(data)
+
+    @staticmethod
+    def read_error(file: Path, exc: OSError) -> PipelineResult:
+        logger.error("read error", path=str(file), error=str(exc))
+        return PipelineResult(
+            path=file,
+            language=file.suffix.lower().lstrip("."),
+            root=None,
+            error=f"read error: {exc}",
+        )
+
+    def process_bytes(
+        self, file: Path, data: FileBuffer, conf: AnalysisConf, read_time: float = 0.0
+    ) -> PipelineResult:
+        """Parte CPU de ``process``: todo lo que sigue a la lectura."""
         ext = file.suffix.lower().lstrip(".")
-        file_info = {
-            "size": file.stat().st_size,
-            "sha256": calculate_file_hash(file),
-        }
+        timings: dict[str, float] = {}
+        t1 = time.perf_counter()
+        analysis = conf.analysis
+        algorithm = conf.hash_algorithm
+        file_info: dict[str, Any] = {"size": len(data)}
+        pending: Future[str] | None = None
+        if analysis.hash:  # fast: sin hash (y por tanto sin caché)
+            hasher = get_hasher(algorithm)
+            file_info["hash_algorithm"] = algorithm
+            if self._hash_in_background(data, conf):
+                pending = _hash_pool().submit(hasher, data)
+            else:
+                file_info[algorithm] = hasher(data)
+        t2 = time.perf_counter()
+        if conf.profile:
+            timings["read"] = read_time
+            timings["hash"] = t2 - t1
+
+        try:
+            return self._analyze(file, ext, data, conf, file_info, timings, t2)
+        finally:
+            if pending is not None:
+                # El resultado ya referencia ``file_info``: el hash se añade al
+                # mismo dict. Con --profile, "hash" es lo que queda por esperar
+                # tras el parseo.
+                t3 = time.perf_counter()
+                file_info[algorithm] = pending.result()
+                if conf.profile:
+                    timings["hash"] = time.perf_counter() - t3
+
+    def _hash_in_background(self, data: FileBuffer, conf: AnalysisConf) -> bool:
+        """
+        Hashear en paralelo con el parseo: solo ficheros grandes, sin caché y
+        si los ``--jobs`` workers dejan algún core libre (cada uno sumaría un
+        hilo de hash). La clave de la caché es el hash, que hace falta *antes*
+        de parsear, así que el solape solo existe con ``--no-cache``.
+        """
+        return (
+            self.cache is None
+            and len(data) >= PARALLEL_HASH_THRESHOLD
+            and resolve_jobs(conf.jobs) < CPUS
+        )
 
+    def _analyze(
+        self,
+        file: Path,
+        ext: str,
+        data: FileBuffer,
+        conf: AnalysisConf,
+        file_info: dict[str, Any],
+        timings: dict[str, float],
+        t2: float,
+    ) -> PipelineResult:
         parser = self.parsers.get(ext)
         if parser is None:
             return PipelineResult(
@@ -56,20 +217,48 @@ class SimplePipeline(PipelinePort):
                 root=None,
                 error="no parser",
                 file_info=file_info,
+                timings=timings,
+            )
+        if looks_binary(data):
+            # Lo filtraba el collector; aquí sale del buffer ya leído
+            logger.debug("skip", path=str(file), reason="binary")
+            return PipelineResult(
+                path=file,
+                language=ext,
+                root=None,
+                file_info=file_info,
+                timings=timings,
+                skipped=True,
             )
 
         try:
-            root = parser.parse(ParserInput(file, file_info))
+            # La caché guarda la salida del parser; los processors se aplican
+            # siempre, así que pueden cambiar sin invalidarla.
+            input = ParserInput(
+                file, file_info, data, _rel_path(file, conf), conf.analysis
+            )
+            root = self._parse(parser, input)
+            t3 = time.perf_counter()
             for processor in self.processors.values():
                 root = processor(root)
+            if conf.profile:
+                timings["parse"] = t3 - t2
+                timings["process"] = time.perf_counter() - t3
             return PipelineResult(
-                path=file, language=ext, root=root, file_info=file_info
+                path=file, language=ext, root=root, file_info=file_info, timings=timings
             )
         except Exception as exc:  # noqa: BLE001 – queremos capturarlo todo
             tb_short = "\n".join(
                 traceback.format_exception_only(type(exc), exc)
             ).strip()
             logger.exception("pipeline error", path=file, error=tb_short)
+            if conf.profile:
+                timings["parse"] = time.perf_counter() - t2
             return PipelineResult(
-                path=file, language=ext, root=None, error=tb_short, file_info=file_info
+                path=file,
+                language=ext,
+                root=None,
+                error=tb_short,
+                file_info=file_info,
+                timings=timings,
             )
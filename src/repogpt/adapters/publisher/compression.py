@@ -0,0 +1,118 @@
+"""
+Compresión en línea de la salida del publisher.
+
+gzip, bz2 y xz vienen en la librería estándar; zstd usa ``zstandard`` si está
+instalado (``pip install repogpt[zstd]``). La compresión se elige por la
+extensión del fichero (``analysis.ndjson.gz``) o explícitamente con
+``--compress``.
+"""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, cast
+
+from repogpt.exceptions import ConfigurationError
+
+COMPRESSIONS: tuple[str, ...] = ("none", "gzip", "bz2", "xz", "zstd")
+
+SUFFIXES: dict[str, str] = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+}
+EXTENSIONS: dict[str, str] = {codec: suffix for suffix, codec in SUFFIXES.items()}
+
+# (mínimo, máximo, por defecto) de cada códec
+LEVELS: dict[str, tuple[int, int, int]] = {
+    "gzip": (0, 9, 6),
+    "bz2": (1, 9, 9),
+    "xz": (0, 9, 6),
+    "zstd": (1, 22, 3),
+}
+
+WRITE_BUFFER = 1 << 20  # agrupa las escrituras pequeñas antes del compresor
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_compression(compression: str | None, path: Path | None) -> str:
+    """
+    Códec efectivo: ``None`` → según la extensión de ``path``; ``auto`` →
+    zstd si está instalado y gzip si no.
+    """
+    if compression is None:
+        suffix = path.suffix.lower() if path is not None else ""
+        return SUFFIXES.get(suffix, "none")
+    if compression == "auto":
+        return "zstd" if zstd_available() else "gzip"
+    if compression not in COMPRESSIONS:
+        raise ConfigurationError(
+            f"Unknown compression '{compression}' (use one of {COMPRESSIONS})"
+        )
+    return compression
+
+
+def compressed_writer(raw: BinaryIO, compression: str, level: int | None) -> BinaryIO:
+    """
+    Envuelve ``raw`` con el compresor pedido.
+
+    Cerrar el writer devuelto escribe el trailer del formato pero **no** cierra
+    ``raw``; quien lo abrió se encarga.
+    """
+    if compression == "none":
+        return raw
+
+    lo, hi, default = LEVELS[compression]
+    level = default if level is None else level
+    if not lo <= level <= hi:
+        raise ConfigurationError(
+            f"{compression} level must be between {lo} and {hi}, got {level}"
+        )
+
+    writer: Any
+    if compression == "gzip":
+        # mtime=0: misma entrada → mismos bytes
+        writer = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=level, mtime=0)
+    elif compression == "bz2":
+        writer = bz2.BZ2File(raw, mode="wb", compresslevel=level)
+    elif compression == "xz":
+        writer = lzma.LZMAFile(raw, mode="wb", preset=level)
+    else:  # zstd
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise ConfigurationError(
+                "zstd output needs the 'zstandard' package (pip install zstandard)"
+            ) from exc
+        writer = zstandard.ZstdCompressor(level=level).stream_writer(raw, closefd=False)
+    # Los compresores pagan cada write(); el buffer los agrupa en bloques
+    return cast(BinaryIO, io.BufferedWriter(writer, WRITE_BUFFER))
+
+
+@contextmanager
+def compressing(
+    raw: BinaryIO, compression: str, level: int | None = None
+) -> Iterator[BinaryIO]:
+    """``with compressing(fh, "gzip") as out: out.write(...)``"""
+    writer = compressed_writer(raw, compression, level)
+    try:
+        yield writer
+    finally:
+        if writer is raw:
+            raw.flush()
+        else:
+            writer.close()  # trailer del formato; ``raw`` sigue abierto
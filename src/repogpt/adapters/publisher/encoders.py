@@ -0,0 +1,151 @@
+"""
+Codificadores JSON intercambiables para el publisher.
+
+Todos producen ``bytes`` UTF-8 listos para escribir en un sink binario con
+buffer, sin pasar por ``str`` intermedio. ``orjson`` y ``msgspec`` son
+dependencias opcionales (``pip install repogpt[fast]``); sin ellas se usa la
+librería estándar.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, Protocol
+
+from repogpt.exceptions import ConfigurationError
+
+JSON_BACKENDS: tuple[str, ...] = ("auto", "orjson", "msgspec", "json")
+
+
+class JsonEncoder(Protocol):
+    name: str
+    compact: bool
+
+    def encode(self, obj: Any) -> bytes:
+        """Documento completo (indentado salvo en modo compacto)."""
+        ...
+
+    def encode_line(self, obj: Any) -> bytes:
+        """Una línea NDJSON, con ``\\n`` final."""
+        ...
+
+
+class StdlibEncoder:
+    name = "json"
+
+    def __init__(self, compact: bool = False) -> None:
+        self.compact = compact
+        self._indent = None if compact else 2
+        # compacto: sin espacios tras ',' y ':' (como orjson/msgspec)
+        self._separators = (",", ":") if compact else None
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(
+            obj,
+            ensure_ascii=False,
+            indent=self._indent,
+            separators=self._separators,
+        ).encode("utf-8")
+
+    def encode_line(self, obj: Any) -> bytes:
+        text = json.dumps(obj, ensure_ascii=False, separators=self._separators)
+        return (text + "\n").encode("utf-8")
+
+
+class OrjsonEncoder:
+    name = "orjson"
+
+    def __init__(self, compact: bool = False) -> None:
+        import orjson
+
+        self.compact = compact
+        self._dumps = orjson.dumps
+        self._doc_option = 0 if compact else orjson.OPT_INDENT_2
+        self._line_option = orjson.OPT_APPEND_NEWLINE
+
+    def encode(self, obj: Any) -> bytes:
+        return self._dumps(obj, option=self._doc_option)
+
+    def encode_line(self, obj: Any) -> bytes:
+        return self._dumps(obj, option=self._line_option)
+
+
+class MsgspecEncoder:
+    name = "msgspec"
+
+    def __init__(self, compact: bool = False) -> None:
+        import msgspec
+
+        self._encode = msgspec.json.Encoder().encode
+        self._format = msgspec.json.format
+        self.compact = compact
+
+    def encode(self, obj: Any) -> bytes:
+        data: bytes = self._encode(obj)
+        return data if self.compact else self._format(data, indent=2)
+
+    def encode_line(self, obj: Any) -> bytes:
+        data: bytes = self._encode(obj)
+        return data + b"\n"
+
+
+def iter_json_array(encoder: JsonEncoder, objs: Iterable[Any]) -> Iterator[bytes]:
+    """
+    Un array JSON por trozos: ``[``, cada elemento y ``]``.
+
+    Memoria constante frente a ``encoder.encode(list(objs))``. Con el backend
+    estándar la salida es byte a byte la de ``json.dump(..., indent=2)``: cada
+    elemento se codifica indentado y se desplaza un nivel (los ``\\n`` solo
+    pueden ser de formato; dentro de cadenas JSON van escapados).
+    """
+    if encoder.compact:
+        sep = b"["
+        for obj in objs:
+            yield sep
+            yield encoder.encode(obj)
+            sep = b","
+        yield b"]" if sep == b"," else b"[]"
+        return
+
+    sep = b"[\n  "
+    for obj in objs:
+        yield sep
+        yield encoder.encode(obj).replace(b"\n", b"\n  ")
+        sep = b",\n  "
+    yield b"\n]" if sep != b"[\n  " else b"[]"
+
+
+_BACKENDS: dict[str, Callable[[bool], JsonEncoder]] = {
+    "orjson": OrjsonEncoder,
+    "msgspec": MsgspecEncoder,
+    "json": StdlibEncoder,
+}
+
+
+def get_encoder(backend: str = "auto", compact: bool = False) -> JsonEncoder:
+    """
+    Devuelve el codificador pedido.
+
+    ``auto`` prueba orjson, luego msgspec y por último la librería estándar.
+    Un backend explícito que no está instalado es un error de configuración.
+    """
+    if backend == "auto":
+        for name in ("orjson", "msgspec"):
+            try:
+                return _BACKENDS[name](compact)
+            except ImportError:
+                continue
+        return StdlibEncoder(compact)
+
+    factory = _BACKENDS.get(backend)
+    if factory is None:
+        raise ConfigurationError(
+            f"Unknown JSON backend '{backend}' (use one of {JSON_BACKENDS})"
+        )
+    try:
+        return factory(compact)
+    except ImportError as exc:
+        raise ConfigurationError(
+            f"JSON backend '{backend}' is not installed (pip install {backend})"
+        ) from exc
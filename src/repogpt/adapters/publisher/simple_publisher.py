@@ -2,82 +2,156 @@
 
 from __future__ import annotations
 
-import dataclasses
-import json
 import os
+import stat
 import sys
-from collections.abc import Generator
-from typing import Any
+import tempfile
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, cast
 
 import structlog
 
+from repogpt.adapters.publisher.compression import (
+    EXTENSIONS,
+    compressing,
+    resolve_compression,
+)
+from repogpt.adapters.publisher.encoders import (
+    JsonEncoder,
+    get_encoder,
+    iter_json_array,
+)
 from repogpt.core.ports import PublisherPort
+from repogpt.exceptions import ConfigurationError
 from repogpt.models import AnalysisConf, PipelineResult
-from repogpt.utils.tree_utils import flatten_tree
+from repogpt.utils.file_utils import default_file_mode
+from repogpt.utils.tree_utils import iter_flat_nodes, node_to_dict
 
 logger = structlog.get_logger(__name__)
 
+WRITE_BUFFER = 1 << 20  # 1 MiB: pocas llamadas write() al sistema
+
+
+@contextmanager
+def _atomic_output(path: Path) -> Iterator[BinaryIO]:
+    """
+    Abre un temporal junto a ``path`` y lo renombra encima solo si el bloque
+    termina bien: un lector (o una ejecución abortada) nunca deja un fichero
+    a medias. El temporal toma los permisos de un ``open`` normal.
+
+    Los enlaces simbólicos se siguen hasta el destino real. Si el destino
+    existe y no es un fichero regular (``/dev/null``, una FIFO…) se escribe
+    en él directamente.
+    """
+    path = path.resolve()
+    try:
+        regular = stat.S_ISREG(path.stat().st_mode)
+    except FileNotFoundError:
+        regular = True
+    if not regular:
+        with open(path, "wb", buffering=WRITE_BUFFER) as fh:
+            yield fh
+        return
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with open(fd, "wb", buffering=WRITE_BUFFER) as fh:
+            os.chmod(tmp, default_file_mode())  # mkstemp lo crea 0600
+            yield fh
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def serialize_result(
+    r: PipelineResult, flatten_kind: str
+) -> Generator[dict[str, Any], None, None]:
+    """Genera los objetos listos para json.dumps según flatten_kind."""
+    if r.root is None:
+        return  # fail handled elsewhere
+
+    root = r.root
+    nodes: Iterable[dict[str, Any]]
+    if flatten_kind == "node":
+        nodes = iter_flat_nodes(root)
+    else:  # file
+        nodes = [node_to_dict(root, nested=True)]
+
+    for node in nodes:
+        node.update(
+            {
+                "path": str(r.path),
+                "lang": r.language,
+                **r.file_info,
+            }
+        )
+        yield node
+
 
 class SimplePublisher(PublisherPort):
     def _yield_serialized_nodes(
         self, r: PipelineResult, conf: AnalysisConf
     ) -> Generator[dict[str, Any], None, None]:
-        """Genera los objetos listos para json.dumps según flatten_kind."""
-        if r.root is None:
-            return  # fail handled elsewhere
-
-        root = r.root
-        if conf.flatten_kind == "node":
-            nodes = flatten_tree(root)
-        else:  # file
-            nodes = [dataclasses.asdict(root)]
-
-        for node in nodes:
-            node.update(
-                {
-                    "path": str(r.path),
-                    "lang": r.language,
-                    **r.file_info,
-                }
-            )
-            yield node
+        """Objetos serializados de ``r``; ver :func:`serialize_result`."""
+        return serialize_result(r, conf.flatten_kind)
 
     # ------------------------------------------------------------------
     def publish(
-        self, results: list[PipelineResult], conf: AnalysisConf
+        self, results: Iterable[PipelineResult], conf: AnalysisConf
     ) -> None:  # noqa: D401
-        data_iterables: list[Generator[dict[str, Any], None, None]] = []
         failures = []
-
-        for res in results:
-            if res.root is None:
-                failures.append({"path": str(res.path), "error": res.error})
-                continue
-            data_iterables.append(self._yield_serialized_nodes(res, conf))
+        ok = 0
 
         def line_iter() -> Generator[dict[str, Any], None, None]:
-            for it in data_iterables:
-                yield from it
+            # Consume ``results`` de forma perezosa: cada árbol se serializa y
+            # se libera antes de pedir el siguiente resultado.
+            nonlocal ok
+            for res in results:
+                if res.skipped:
+                    continue
+                if res.root is None:
+                    failures.append({"path": str(res.path), "error": res.error})
+                    continue
+                ok += 1
+                yield from self._yield_serialized_nodes(res, conf)
 
         # Decide sink ---------------------------------------------------
+        encoder = get_encoder(conf.json_backend, conf.compact)
         sink_stdout = (
             conf.to_stdout or conf.output is None and conf.output_format == "ndjson"
         )
+        compression = resolve_compression(
+            conf.compression, None if sink_stdout else conf.output
+        )
         if sink_stdout:
-            self._write_stream(line_iter(), conf)
-        else:
-            output_path = conf.output or os.path.join(os.getcwd(), "analysis.json")
-            with open(output_path, "w", encoding="utf-8") as fh:
+            sys.stdout.flush()  # no adelantar texto pendiente en el wrapper
+            buffer = getattr(sys.stdout, "buffer", None)
+            if buffer is None and compression != "none":
+                raise ConfigurationError("compressed output needs a binary stdout")
+            stream = buffer or cast(BinaryIO, _TextSink())
+            with compressing(stream, compression, conf.compress_level) as out:
+                self._write(line_iter(), out, encoder, conf)
                 if conf.output_format == "json":
-                    json.dump(list(line_iter()), fh, ensure_ascii=False, indent=2)
-                else:  # ndjson
-                    for obj in line_iter():
-                        fh.write(json.dumps(obj, ensure_ascii=False) + "\n")
+                    out.write(b"\n")
+        else:
+            output_path = conf.output or Path.cwd() / (
+                "analysis.json" + EXTENSIONS.get(compression, "")
+            )
+            with (
+                _atomic_output(output_path) as fh,
+                compressing(fh, compression, conf.compress_level) as out,
+            ):
+                self._write(line_iter(), out, encoder, conf)
             logger.info(
                 "analysis saved",
                 path=output_path,
-                ok=len(results) - len(failures),
+                ok=ok,
                 fails=len(failures),
+                encoder=encoder.name,
+                compression=compression,
             )
 
         if failures:
@@ -87,14 +161,28 @@ class SimplePublisher(PublisherPort):
 
     # ------------------------------------------------------------------
     @staticmethod
-    def _write_stream(
-        objs: Generator[dict[str, Any], None, None], conf: AnalysisConf
+    def _write(
+        objs: Iterator[dict[str, Any]],
+        sink: BinaryIO,
+        encoder: JsonEncoder,
+        conf: AnalysisConf,
     ) -> None:
-        """Escribe a stdout según formato."""
-        stream = sys.stdout
+        """Codifica ``objs`` directamente a bytes en ``sink`` según formato."""
         if conf.output_format == "json":
-            json.dump(list(objs), stream, ensure_ascii=False, indent=2)
-            stream.write("\n")
+            # Streaming: nunca se materializa la lista completa de nodos
+            for chunk in iter_json_array(encoder, objs):
+                sink.write(chunk)
         else:  # ndjson
+            write, encode_line = sink.write, encoder.encode_line
             for obj in objs:
-                stream.write(json.dumps(obj, ensure_ascii=False) + "\n")
+                write(encode_line(obj))
+
+
+class _TextSink:
+    """Adapta un stdout sin ``.buffer`` (p. ej. StringIO) a escritura binaria."""
+
+    def write(self, data: bytes) -> int:
+        return sys.stdout.write(data.decode("utf-8"))
+
+    def flush(self) -> None:
+        sys.stdout.flush()
@@ -0,0 +1,344 @@
+"""
+Publisher SQLite: tablas normalizadas e indexadas, actualizadas por hash.
+
+Esquema::
+
+    files(id, path UNIQUE, language, size, sha256, error)
+    nodes(id, node_id, file_id, parent_id, type, name, qualname, language,
+          start_line, end_line, docstring, tags, metrics)
+    comments(node_id → nodes.id, file_id, line, text)
+    dependencies(node_id → nodes.id, file_id, target, kind, data)
+
+``tags``, ``metrics`` y ``dependencies.data`` son JSON. Las rutas se guardan
+relativas al repo, así que la base sigue valiendo si el repo se mueve.
+
+Re-ejecutar sobre la misma base solo reescribe los ficheros cuyo hash ha
+cambiado; los que ya no aparecen se eliminan (``prune``). La columna
+``sha256`` guarda ``content_digest``: el hex de sha256, o ``"algoritmo:hex"``
+con ``--hash-algorithm``.
+
+Se escribe sobre una copia temporal junto a la base, confirmando cada
+``BATCH_FILES`` ficheros (el journal no crece con el repo), y la copia
+sustituye a la original con ``os.replace`` al terminar: si la ejecución se
+aborta (p. ej. fail-fast), la base queda como estaba.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from repogpt import __version__
+from repogpt.core.ports import PublisherPort
+from repogpt.exceptions import ConfigurationError
+from repogpt.models import AnalysisConf, CodeNode, PipelineResult
+from repogpt.utils.file_utils import content_digest, default_file_mode
+
+logger = structlog.get_logger(__name__)
+
+SCHEMA_VERSION = "1"
+BATCH_FILES = 500  # ficheros por transacción
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    id       INTEGER PRIMARY KEY,
+    path     TEXT NOT NULL UNIQUE,
+    language TEXT,
+    size     INTEGER,
+    sha256   TEXT,
+    error    TEXT
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    id         INTEGER PRIMARY KEY,
+    node_id    TEXT NOT NULL,
+    file_id    INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    parent_id  TEXT,
+    type       TEXT NOT NULL,
+    name       TEXT,
+    qualname   TEXT,
+    language   TEXT,
+    start_line INTEGER,
+    end_line   INTEGER,
+    docstring  TEXT,
+    tags       TEXT,
+    metrics    TEXT
+);
+CREATE TABLE IF NOT EXISTS comments (
+    node_id INTEGER NOT NULL REFERENCES nodes(id) ON DELETE CASCADE,
+    file_id INTEGER NOT NULL,
+    line    INTEGER,
+    text    TEXT
+);
+CREATE TABLE IF NOT EXISTS dependencies (
+    node_id INTEGER NOT NULL REFERENCES nodes(id) ON DELETE CASCADE,
+    file_id INTEGER NOT NULL,
+    target  TEXT,
+    kind    TEXT,
+    data    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_nodes_type      ON nodes(type);
+CREATE INDEX IF NOT EXISTS idx_nodes_name      ON nodes(name);
+CREATE INDEX IF NOT EXISTS idx_nodes_qualname  ON nodes(qualname);
+CREATE INDEX IF NOT EXISTS idx_nodes_parent_id ON nodes(parent_id);
+CREATE INDEX IF NOT EXISTS idx_nodes_node_id   ON nodes(node_id);
+CREATE INDEX IF NOT EXISTS idx_nodes_file_id   ON nodes(file_id);
+CREATE INDEX IF NOT EXISTS idx_comments_file   ON comments(file_id);
+CREATE INDEX IF NOT EXISTS idx_deps_file       ON dependencies(file_id);
+CREATE INDEX IF NOT EXISTS idx_deps_target     ON dependencies(target);
+"""
+
+_TABLES = ("dependencies", "comments", "nodes", "files", "meta")
+
+
+def _rel(path: Path, conf: AnalysisConf) -> str:
+    try:
+        return path.relative_to(conf.repo_path).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _json(value: Any) -> str | None:
+    return json.dumps(value, ensure_ascii=False) if value else None
+
+
+def _preorder(root: CodeNode) -> Iterator[CodeNode]:
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.children))
+
+
+class SqlitePublisher(PublisherPort):
+    def __init__(self, batch_size: int = BATCH_FILES, prune: bool = True) -> None:
+        self.batch_size = batch_size
+        # prune=False para ejecuciones parciales (solo algunos ficheros)
+        self.prune = prune
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _prepare(conn: sqlite3.Connection, path: Path, mode: str) -> bool:
+        """
+        Crea (o recrea si cambió de versión) el esquema.
+
+        Devuelve si las filas existentes siguen siendo reutilizables: con otra
+        versión de RepoGPT o con otro ``--mode`` los parsers producen otro
+        árbol para el mismo contenido. Un fichero que no es una base SQLite
+        lanza ``sqlite3.DatabaseError``.
+        """
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        meta: dict[str, str] = {}
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.OperationalError:
+            pass  # base nueva
+        if meta and meta.get("schema_version") != SCHEMA_VERSION:
+            logger.warning("sqlite schema changed, rebuilding", path=str(path))
+            for table in _TABLES:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            meta = {}
+        conn.executescript(_SCHEMA)
+        return meta.get("repogpt_version") == __version__ and meta.get("mode") == mode
+
+    @staticmethod
+    def _write_meta(conn: sqlite3.Connection, mode: str) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)",
+            [
+                ("schema_version", SCHEMA_VERSION),
+                ("repogpt_version", __version__),
+                ("mode", mode),
+            ],
+        )
+
+    # ------------------------------------------------------------------
+    def publish(
+        self, results: Iterable[PipelineResult], conf: AnalysisConf
+    ) -> None:  # noqa: D401
+        if conf.to_stdout:
+            raise ConfigurationError("--format sqlite needs an output file, not stdout")
+        output_path = (conf.output or Path.cwd() / "analysis.sqlite").resolve()
+
+        fd, name = tempfile.mkstemp(
+            dir=output_path.parent, prefix=f".{output_path.name}.", suffix=".tmp"
+        )
+        os.close(fd)
+        tmp = Path(name)
+        try:
+            if output_path.exists():
+                shutil.copyfile(output_path, tmp)
+                shutil.copymode(output_path, tmp)
+            else:
+                os.chmod(tmp, default_file_mode())  # mkstemp lo crea 0600
+            counts, pruned, failures = self._publish_into(
+                tmp, output_path, results, conf
+            )
+            os.replace(tmp, output_path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+        logger.info("analysis saved", path=str(output_path), pruned=pruned, **counts)
+        if failures:
+            print("Failed files:", file=sys.stderr)
+            for f in failures:
+                logger.error("parse error", **f)
+
+    def _publish_into(
+        self,
+        db_path: Path,
+        output_path: Path,
+        results: Iterable[PipelineResult],
+        conf: AnalysisConf,
+    ) -> tuple[dict[str, int], int, list[dict[str, Any]]]:
+        """
+        Vuelca ``results`` en ``db_path`` (la copia temporal de
+        ``output_path``); devuelve contadores, ficheros podados y fallos.
+        """
+        conn = sqlite3.connect(db_path)
+        try:
+            try:
+                reusable = self._prepare(conn, output_path, conf.mode)
+            except sqlite3.DatabaseError as exc:
+                raise ConfigurationError(
+                    f"{output_path} exists and is not a SQLite database ({exc})"
+                ) from exc
+            # path → (id, sha256) de la ejecución anterior
+            known: dict[str, tuple[int, str | None]] = {
+                path: (fid, sha)
+                for fid, path, sha in conn.execute("SELECT id, path, sha256 FROM files")
+            }
+            seen: set[str] = set()
+            counts = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
+            failures: list[dict[str, Any]] = []
+            next_node = conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM nodes"
+            ).fetchone()[0]
+
+            pending = 0
+            for res in results:
+                if res.skipped:  # sin fila; si la tenía, ``prune`` la borra
+                    continue
+                path = _rel(res.path, conf)
+                seen.add(path)
+                if res.root is None:
+                    counts["failed"] += 1
+                    failures.append({"path": str(res.path), "error": res.error})
+
+                sha = content_digest(res.file_info)
+                prev = known.get(path)
+                if reusable and prev is not None and sha is not None and prev[1] == sha:
+                    counts["unchanged"] += 1
+                    continue
+
+                file_id = self._upsert_file(conn, path, res, prev)
+                counts["updated" if prev is not None else "inserted"] += 1
+                if res.root is not None:
+                    next_node = self._insert_tree(conn, file_id, res.root, next_node)
+
+                pending += 1
+                if pending >= self.batch_size:
+                    conn.commit()
+                    pending = 0
+
+            pruned = 0
+            if self.prune:
+                gone = [(fid,) for path, (fid, _) in known.items() if path not in seen]
+                self._delete_children(conn, gone)
+                conn.executemany("DELETE FROM files WHERE id = ?", gone)
+                pruned = len(gone)
+            self._write_meta(conn, conf.mode)
+            conn.commit()
+        finally:
+            conn.close()
+        return counts, pruned, failures
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _delete_children(conn: sqlite3.Connection, file_ids: list[tuple[int]]) -> None:
+        for table in ("comments", "dependencies", "nodes"):
+            conn.executemany(f"DELETE FROM {table} WHERE file_id = ?", file_ids)
+
+    def _upsert_file(
+        self,
+        conn: sqlite3.Connection,
+        path: str,
+        res: PipelineResult,
+        prev: tuple[int, str | None] | None,
+    ) -> int:
+        row = (
+            res.language,
+            res.file_info.get("size"),
+            content_digest(res.file_info),
+            res.error,
+        )
+        if prev is None:
+            cur = conn.execute(
+                "INSERT INTO files(path, language, size, sha256, error) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (path, *row),
+            )
+            assert cur.lastrowid is not None
+            return cur.lastrowid
+
+        file_id = prev[0]
+        self._delete_children(conn, [(file_id,)])
+        conn.execute(
+            "UPDATE files SET language = ?, size = ?, sha256 = ?, error = ? "
+            "WHERE id = ?",
+            (*row, file_id),
+        )
+        return file_id
+
+    @staticmethod
+    def _insert_tree(
+        conn: sqlite3.Connection, file_id: int, root: CodeNode, last_id: int
+    ) -> int:
+        """Inserta el árbol con ids explícitos; devuelve el último id usado."""
+        nodes, comments, deps = [], [], []
+        for node in _preorder(root):
+            last_id += 1
+            nodes.append(
+                (
+                    last_id,
+                    node.id,
+                    file_id,
+                    node.parent_id,
+                    node.type,
+                    node.name,
+                    node.qualname,
+                    node.language,
+                    node.start_line,
+                    node.end_line,
+                    node.docstring,
+                    _json(node.tags),
+                    _json(node.metrics),
+                )
+            )
+            for c in node.comments:
+                comments.append((last_id, file_id, c.get("line"), c.get("text")))
+            for d in node.dependencies:
+                target = d.get("name") or d.get("url")
+                kind = d.get("type") or ("link" if "url" in d else None)
+                deps.append((last_id, file_id, target, kind, _json(d)))
+
+        conn.executemany(
+            "INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", nodes
+        )
+        conn.executemany("INSERT INTO comments VALUES (?, ?, ?, ?)", comments)
+        conn.executemany("INSERT INTO dependencies VALUES (?, ?, ?, ?, ?)", deps)
+        return last_id
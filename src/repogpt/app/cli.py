@@ -3,16 +3,41 @@ from __future__ import annotations
 import argparse
 import logging
 import sys
+from dataclasses import replace
 from pathlib import Path
 
 import structlog
 
+from repogpt.adapters.cache.disk_cache import (
+    DEFAULT_MAX_BYTES,
+    DiskCache,
+    default_cache_dir,
+)
+from repogpt.adapters.collector.async_collector import AsyncCollector
+from repogpt.adapters.collector.git_collector import GitCollector
 from repogpt.adapters.collector.simple_collector import SimpleCollector
 from repogpt.adapters.parser import parsers
+from repogpt.adapters.pipeline.async_pipeline import AsyncPipeline
 from repogpt.adapters.pipeline.simple_pipeline import SimplePipeline
+from repogpt.adapters.publisher.compression import COMPRESSIONS
+from repogpt.adapters.publisher.encoders import JSON_BACKENDS
 from repogpt.adapters.publisher.simple_publisher import SimplePublisher
+from repogpt.adapters.publisher.sqlite_publisher import SqlitePublisher
+from repogpt.app.server import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    AnalysisServer,
+    make_http_server,
+)
+from repogpt.app.watch import WATCH_BACKENDS, make_watcher, publish_atomic, watch
+from repogpt.core.executor import EXECUTORS
+from repogpt.core.incremental import IncrementalAnalysis
+from repogpt.core.ports import CollectorPort, PublisherPort
+from repogpt.core.profiling import Profiler
 from repogpt.core.service import CodeRepoAnalysisService
-from repogpt.models import AnalysisConf
+from repogpt.exceptions import AnalysisError, ConfigurationError
+from repogpt.models import ANALYSIS_MODES, AnalysisConf
+from repogpt.utils.file_utils import HASH_ALGORITHMS, get_hasher
 
 LEVELS: dict[str, int] = {"DEBUG": logging.DEBUG, "INFO": logging.INFO}
 
@@ -25,38 +50,139 @@ def _configure_logging(level: str) -> None:
     )
 
 
-def main() -> int:  # noqa: D401
+def _build_parser(
+    prog: str | None, description: str, repo_nargs: str | None = None
+) -> argparse.ArgumentParser:
+    """Opciones comunes a ``repogpt``, ``repogpt watch`` y ``repogpt serve``."""
     parser = argparse.ArgumentParser(
-        description="Analyze a code repository and output structured summaries.",
+        prog=prog,
+        description=description,
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
-    parser.add_argument("repo_path")
+    parser.add_argument("repo_path", nargs=repo_nargs)
     parser.add_argument("--include-tests", action="store_true")
+    parser.add_argument(
+        "--mode",
+        choices=list(ANALYSIS_MODES),
+        default="standard",
+        help="fast: structure only (no hashing, cache, comments, docstrings or "
+        "metrics); full: adds per-node metrics and TODO/FIXME tags.",
+    )
     parser.add_argument("--flatten", choices=["node", "file"], default="node")
-    parser.add_argument("--format", choices=["json", "ndjson"], default="json")
+    parser.add_argument(
+        "--format", choices=["json", "ndjson", "sqlite"], default="json"
+    )
     parser.add_argument("--stdout", action="store_true")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="No indentation in --format json (smaller and faster).",
+    )
+    parser.add_argument(
+        "--compress",
+        nargs="?",
+        const="auto",
+        choices=["auto", *COMPRESSIONS],
+        help="Compress output inline; bare --compress picks zstd if installed, "
+        "else gzip. Default: from the output suffix (.gz, .bz2, .xz, .zst).",
+    )
+    parser.add_argument("--compress-level", type=int)
+    parser.add_argument(
+        "--json-backend",
+        choices=list(JSON_BACKENDS),
+        default="auto",
+        help="JSON encoder; auto prefers orjson, then msgspec, then stdlib.",
+    )
     parser.add_argument("-o", "--output")
     parser.add_argument("--languages")
     # phase‑3 flags
     parser.add_argument("--log-level", choices=["INFO", "DEBUG"], default="INFO")
     parser.add_argument("--fail-fast", action="store_true")
+    # phase‑4 flags
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Pipeline workers; 0 uses one per CPU.",
+    )
+    parser.add_argument("--executor", choices=list(EXECUTORS), default="process")
+    parser.add_argument(
+        "--async",
+        dest="async_io",
+        action="store_true",
+        help="Overlap directory listings, stats and reads with asyncio "
+        "(for network or FUSE filesystems); parsing still uses --jobs.",
+    )
+    parser.add_argument(
+        "--io-concurrency",
+        type=int,
+        default=32,
+        help="Filesystem operations in flight with --async.",
+    )
+    parser.add_argument(
+        "--hash-algorithm",
+        choices=list(HASH_ALGORITHMS),
+        default="sha256",
+        help="Content hash for change detection and the parse cache; "
+        "xxh3 needs the xxhash package. With --no-cache, files over 1 MiB are "
+        "hashed while they are parsed if --jobs leaves a CPU free.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Parse cache directory, keyed by file content hash "
+        "(default: $XDG_CACHE_HOME/repogpt or ~/.cache/repogpt).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the parse cache (also lets large files be hashed while "
+        "they are parsed).",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Evict least recently used cache entries above this size.",
+    )
+    parser.add_argument(
+        "--collector",
+        choices=["fs", "git"],
+        default="fs",
+        help="Enumerate files by walking the tree or from the git index.",
+    )
+    parser.add_argument(
+        "--since",
+        metavar="REV",
+        help="Only files changed since the merge-base with REV (implies git).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each stage and file; print a summary to stderr.",
+    )
+    parser.add_argument("--profile-output", default="repogpt-profile.json")
+    parser.add_argument("--profile-top", type=int, default=10)
 
-    args = parser.parse_args()
+    return parser
 
-    _configure_logging(args.log_level)
-    log = structlog.get_logger()
 
+def _conf_from_args(
+    args: argparse.Namespace, repo_path: str | None = None
+) -> AnalysisConf:
     langs = (
         [s.strip().lower() for s in args.languages.split(",")]
         if args.languages
         else None
     )
+    get_hasher(args.hash_algorithm)  # falla ya si falta xxhash
     to_stdout = args.stdout or (
         args.output and Path(args.output).as_posix() == "/dev/stdout"
     )
+    cache_dir = Path(args.cache_dir) if args.cache_dir else default_cache_dir()
 
-    conf = AnalysisConf(
-        repo_path=Path(args.repo_path).resolve(),
+    return AnalysisConf(
+        repo_path=Path(repo_path or args.repo_path).resolve(),
         include_tests=args.include_tests,
         output=None if to_stdout else Path(args.output) if args.output else None,
         flatten_kind=args.flatten,
@@ -65,18 +191,212 @@ def main() -> int:  # noqa: D401
         languages=langs,
         log_level=args.log_level,
         fail_fast=args.fail_fast,
+        jobs=args.jobs,
+        executor=args.executor,
+        io_concurrency=args.io_concurrency,
+        cache_dir=None if args.no_cache else cache_dir,
+        cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+        profile=args.profile,
+        json_backend=args.json_backend,
+        compact=args.compact,
+        compression=args.compress,
+        compress_level=args.compress_level,
+        mode=args.mode,
+        hash_algorithm=args.hash_algorithm,
+    )
+
+
+def _make_cache(conf: AnalysisConf) -> DiskCache | None:
+    if conf.cache_dir is None:
+        return None
+    return DiskCache(conf.cache_dir, max_bytes=conf.cache_max_bytes)
+
+
+def _make_collector(args: argparse.Namespace) -> CollectorPort:
+    if args.collector == "git" or args.since:
+        return GitCollector(since=args.since)
+    return AsyncCollector() if args.async_io else SimpleCollector()
+
+
+def _make_pipeline(args: argparse.Namespace, cache: DiskCache | None) -> SimplePipeline:
+    pipeline_cls = AsyncPipeline if args.async_io else SimplePipeline
+    return pipeline_cls(parsers=parsers, processors={}, cache=cache)
+
+
+def _make_publisher(args: argparse.Namespace, conf: AnalysisConf) -> PublisherPort:
+    if conf.output_format == "sqlite":
+        # --since solo ve parte del repo: no podar el resto de la base
+        return SqlitePublisher(prune=args.since is None)
+    return SimplePublisher()
+
+
+def main(argv: list[str] | None = None) -> int:  # noqa: D401
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        if argv[:1] == ["watch"]:
+            return watch_main(argv[1:])
+        if argv[:1] == ["serve"]:
+            return serve_main(argv[1:])
+        return analyze_main(argv)
+    except ConfigurationError as exc:
+        # Error de uso (p. ej. --git fuera de un repo): mismo código que argparse
+        structlog.get_logger().error("configuration error", error=str(exc))
+        return 2
+
+
+def analyze_main(argv: list[str]) -> int:
+    parser = _build_parser(
+        None, "Analyze a code repository and output structured summaries."
     )
+    args = parser.parse_args(argv)
+
+    _configure_logging(args.log_level)
+    log = structlog.get_logger()
+    conf = _conf_from_args(args)
 
     log.info("starting run", repo=str(conf.repo_path), format=conf.output_format)
 
-    CodeRepoAnalysisService(
-        collector=SimpleCollector(),
-        pipeline=SimplePipeline(parsers=parsers, processors={}),
-        publisher=SimplePublisher(),
-    ).run(runtime_conf=conf)
+    cache = _make_cache(conf)
+    profiler = Profiler(top=args.profile_top) if conf.profile else None
+    try:
+        CodeRepoAnalysisService(
+            collector=_make_collector(args),
+            pipeline=_make_pipeline(args, cache),
+            publisher=_make_publisher(args, conf),
+            profiler=profiler,
+        ).run(runtime_conf=conf)
+    except AnalysisError:
+        return 1  # fail-fast: ya registrado; la salida anterior queda intacta
+    finally:
+        if cache is not None:
+            cache.prune()
+        if profiler is not None:
+            print(profiler.report(args.profile_top), file=sys.stderr)
+            profiler.write_json(Path(args.profile_output), args.profile_top)
+            log.info("profile saved", path=args.profile_output)
 
     return 0
 
 
+def _add_watch_flags(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--watch-backend",
+        choices=list(WATCH_BACKENDS),
+        default="auto",
+        help="auto uses inotify when inotify_simple is installed, else polling.",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="Polling period in seconds."
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.3,
+        help="Wait until the tree has been quiet this long before re-analysing.",
+    )
+
+
+def watch_main(argv: list[str]) -> int:
+    """``repogpt watch``: análisis completo y luego incremental por cambios."""
+    parser = _build_parser(
+        "repogpt watch",
+        "Analyze a repository, then keep the output up to date as files change.",
+    )
+    _add_watch_flags(parser)
+    args = parser.parse_args(argv)
+
+    _configure_logging(args.log_level)
+    log = structlog.get_logger()
+    conf = replace(_conf_from_args(args), fail_fast=False)
+    cache = _make_cache(conf)
+    publisher = _make_publisher(args, conf)
+    analysis = IncrementalAnalysis(
+        _make_collector(args),
+        SimplePipeline(parsers=parsers, processors={}, cache=cache),
+        conf,
+    )
+
+    analysis.full()
+    publish_atomic(publisher, analysis, conf)
+    watcher = make_watcher(args.watch_backend, conf.repo_path, args.interval)
+    log.info("watching", repo=str(conf.repo_path), backend=type(watcher).__name__)
+    try:
+        watch(
+            analysis,
+            watcher,
+            debounce=args.debounce,
+            on_change=lambda _: publish_atomic(publisher, analysis, conf),
+        )
+    except KeyboardInterrupt:
+        log.info("stopped")
+    finally:
+        if cache is not None:
+            cache.prune()
+    return 0
+
+
+def serve_main(argv: list[str]) -> int:
+    """``repogpt serve``: árboles en memoria y consultas por HTTP local."""
+    parser = _build_parser(
+        "repogpt serve",
+        "Keep one or more repositories analysed in memory and answer queries "
+        "over localhost HTTP or a Unix socket.",
+        repo_nargs="+",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", help="Listen on this Unix socket instead of TCP.")
+    parser.add_argument(
+        "--no-watch",
+        action="store_true",
+        help="Do not follow file changes; refresh only via /refresh or ?refresh=1.",
+    )
+    _add_watch_flags(parser)
+    args = parser.parse_args(argv)
+
+    _configure_logging(args.log_level)
+    log = structlog.get_logger()
+    cache = _make_cache(_conf_from_args(args, args.repo_path[0]))
+    analyses = []
+    for repo in args.repo_path:
+        conf = replace(_conf_from_args(args, repo), fail_fast=False)
+        analyses.append(
+            IncrementalAnalysis(
+                _make_collector(args),
+                SimplePipeline(parsers=parsers, processors={}, cache=cache),
+                conf,
+            )
+        )
+
+    app = AnalysisServer(analyses)
+    app.load()
+    if not args.no_watch:
+        app.start_watchers(
+            lambda root: make_watcher(args.watch_backend, root, args.interval),
+            args.debounce,
+        )
+    socket_path = Path(args.socket) if args.socket else None
+    server = make_http_server(
+        app, host=args.host, port=args.port, socket_path=socket_path
+    )
+    log.info(
+        "serving",
+        repos=list(app.repos),
+        address=args.socket or f"http://{args.host}:{args.port}",
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("stopped")
+    finally:
+        server.server_close()
+        app.close()
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
+        if cache is not None:
+            cache.prune()
+    return 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
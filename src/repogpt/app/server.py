@@ -0,0 +1,385 @@
+"""
+Modo servidor: árboles residentes en memoria y consultas por HTTP local.
+
+``repogpt serve`` analiza uno o varios repos una vez y los mantiene al día
+con el mismo bucle que ``repogpt watch`` (un hilo por repo). Las consultas
+se responden desde memoria:
+
+* el :class:`RepoIndex` de cada repo se reconstruye solo cuando cambia
+  ``IncrementalAnalysis.generation``;
+* las respuestas ya codificadas se guardan en un LRU indexado por
+  ``(repo, generation, petición)``, así que repetir una consulta sin cambios
+  en disco es copiar bytes al socket.
+
+Endpoints (todas las respuestas son JSON)::
+
+    GET  /repos
+    GET  /analyze?repo=NAME&flatten=node|file
+    GET  /query?repo=NAME&type=&name=&qualname=&path=&tag=&limit=
+    GET  /node?repo=NAME&id=NODE_ID
+    POST /refresh?repo=NAME
+
+``repo`` puede omitirse si solo se sirve un repo. ``refresh=1`` en cualquier
+GET fuerza un ``refresh()`` antes de responder (útil con ``--no-watch``).
+Se escucha en ``127.0.0.1`` o en un socket Unix (``--socket``); no hay
+autenticación, así que no debe exponerse fuera de la máquina.
+"""
+
+from __future__ import annotations
+
+import os
+import socketserver
+import stat
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import structlog
+
+from repogpt.adapters.publisher.encoders import JsonEncoder, get_encoder
+from repogpt.adapters.publisher.simple_publisher import serialize_result
+from repogpt.app.watch import Watcher, watch
+from repogpt.core.incremental import IncrementalAnalysis
+from repogpt.exceptions import ConfigurationError
+from repogpt.utils.node_table import NodeView
+from repogpt.utils.repo_index import RepoIndex
+from repogpt.utils.tree_utils import node_to_dict
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+CACHE_ENTRIES = 256  # respuestas codificadas en el LRU
+DEFAULT_LIMIT = 1000  # nodos por respuesta de /query
+
+logger = structlog.get_logger(__name__)
+
+
+class RequestError(Exception):
+    """Petición inválida; se responde con ``status`` y el mensaje."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _view_to_dict(view: NodeView) -> dict[str, Any]:
+    return {
+        "id": view.id,
+        "type": view.type,
+        "name": view.name,
+        "qualname": view.qualname,
+        "language": view.language,
+        "path": view.path,
+        "start_line": view.start_line,
+        "end_line": view.end_line,
+        "docstring": view.docstring,
+        "comments": list(view.comments),
+        "tags": list(view.tags),
+        "dependencies": list(view.dependencies),
+        "parent_id": view.parent_id,
+        "metrics": dict(view.metrics),
+    }
+
+
+class RepoState:
+    """Un repo servido: su análisis incremental, su índice y su hilo de watch."""
+
+    def __init__(self, name: str, analysis: IncrementalAnalysis) -> None:
+        self.name = name
+        self.analysis = analysis
+        self._index: tuple[int, RepoIndex] | None = None
+        self._index_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def root(self) -> Path:
+        return self.analysis.conf.repo_path
+
+    @property
+    def generation(self) -> int:
+        return self.analysis.generation
+
+    def index(self) -> tuple[int, RepoIndex]:
+        """
+        ``(generation, índice)`` de la generación actual; el índice se
+        construye desde la misma instantánea cuya generación se devuelve.
+        """
+        with self._index_lock:
+            if self._index is None or self._index[0] != self.analysis.generation:
+                gen, results = self.analysis.snapshot()
+                self._index = (gen, RepoIndex.from_results(results))
+                logger.debug("index rebuilt", repo=self.name, generation=gen)
+            return self._index
+
+    def start_watch(self, watcher: Watcher, debounce: float) -> None:
+        self._thread = threading.Thread(
+            target=watch,
+            args=(self.analysis, watcher),
+            kwargs={"debounce": debounce, "stop": self._stop},
+            name=f"repogpt-watch-{self.name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class AnalysisServer:
+    """
+    Lógica de las peticiones, independiente del transporte.
+
+    ``handle(method, target)`` devuelve ``(status, cuerpo)``; el handler HTTP
+    solo lo envía. Así los tests no necesitan sockets.
+    """
+
+    def __init__(
+        self,
+        analyses: Iterable[IncrementalAnalysis],
+        *,
+        cache_entries: int = CACHE_ENTRIES,
+        encoder: JsonEncoder | None = None,
+    ) -> None:
+        self.repos: dict[str, RepoState] = {}
+        for analysis in analyses:
+            name = base = analysis.conf.repo_path.name or "repo"
+            n = 1
+            while name in self.repos:
+                n += 1
+                name = f"{base}-{n}"
+            self.repos[name] = RepoState(name, analysis)
+        self.encoder = encoder or get_encoder("auto", compact=True)
+        self.cache_entries = cache_entries
+        self._cache: OrderedDict[tuple[Any, ...], bytes] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    def load(self) -> None:
+        """Análisis completo inicial de todos los repos."""
+        for state in self.repos.values():
+            state.analysis.full()
+            state.index()
+
+    def start_watchers(
+        self, make: Callable[[Path], Watcher], debounce: float = 0.3
+    ) -> None:
+        for state in self.repos.values():
+            state.start_watch(make(state.root), debounce)
+
+    def close(self) -> None:
+        for state in self.repos.values():
+            state.stop()
+
+    # ------------------------------------------------------------------
+    def handle(self, method: str, target: str) -> tuple[int, bytes]:
+        url = urlsplit(target)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        route = url.path.rstrip("/") or "/"
+        try:
+            if route == "/repos" and method == "GET":
+                return 200, self.encoder.encode(self._repos())
+            if route == "/refresh" and method == "POST":
+                return 200, self.encoder.encode(self._refresh(self._repo(params)))
+            if route in _GET_ROUTES and method == "GET":
+                state = self._repo(params)
+                if params.pop("refresh", "") in ("1", "true"):
+                    self._refresh(state)
+                return 200, self._cached(state, route, params)
+            raise RequestError(404, f"no endpoint {method} {route}")
+        except RequestError as exc:
+            return exc.status, self.encoder.encode({"error": str(exc)})
+
+    def _cached(self, state: RepoState, route: str, params: dict[str, str]) -> bytes:
+        request = (route, tuple(sorted(params.items())))
+        key = (state.name, state.generation, *request)
+        with self._cache_lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        # Un refresh puede aplicarse mientras se calcula: la respuesta se
+        # guarda con la generación de la instantánea que se usó de verdad.
+        gen, payload = _GET_ROUTES[route](self, state, params)
+        body = self.encoder.encode(payload)
+        key = (state.name, gen, *request)
+        with self._cache_lock:
+            self._cache[key] = body
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return body
+
+    def _repo(self, params: dict[str, str]) -> RepoState:
+        name = params.pop("repo", None)
+        if name is None:
+            if len(self.repos) != 1:
+                raise RequestError(400, "several repos served: pass ?repo=NAME")
+            return next(iter(self.repos.values()))
+        state = self.repos.get(name)
+        if state is None:
+            raise RequestError(404, f"unknown repo '{name}'")
+        return state
+
+    # === Endpoints =====================================================
+
+    def _repos(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": s.name,
+                "path": str(s.root),
+                "generation": s.generation,
+                "files": len(s.analysis.results()),
+            }
+            for s in self.repos.values()
+        ]
+
+    @staticmethod
+    def _refresh(state: RepoState) -> dict[str, Any]:
+        changes = state.analysis.refresh()
+        return {
+            "repo": state.name,
+            "generation": state.generation,
+            "added": len(changes.added),
+            "modified": len(changes.modified),
+            "deleted": len(changes.deleted),
+        }
+
+    # Cada endpoint devuelve ``(generation, respuesta)``: la generación de
+    # la instantánea de la que sale la respuesta.
+
+    def _analyze(
+        self, state: RepoState, params: dict[str, str]
+    ) -> tuple[int, list[Any]]:
+        flatten = params.get("flatten", state.analysis.conf.flatten_kind)
+        if flatten not in ("node", "file"):
+            raise RequestError(400, "flatten must be 'node' or 'file'")
+        gen, results = state.analysis.snapshot()
+        return gen, [obj for r in results for obj in serialize_result(r, flatten)]
+
+    def _query(self, state: RepoState, params: dict[str, str]) -> tuple[int, list[Any]]:
+        gen, index = state.index()
+        try:
+            limit = int(params.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            raise RequestError(400, "limit must be an integer") from None
+
+        if "path" in params:
+            path = Path(params["path"])
+            params["path"] = str(path if path.is_absolute() else state.root / path)
+        lookups: dict[str, Callable[[str], list[NodeView]]] = {
+            "type": index.by_type,
+            "name": index.by_name,
+            "qualname": index.by_qualname,
+            "path": index.by_path,
+            "tag": index.by_tag,
+        }
+        filters = [(lookups[k], v) for k, v in params.items() if k in lookups]
+        if not filters:
+            raise RequestError(400, f"query needs one of {sorted(lookups)}")
+
+        # Se parte del filtro más selectivo y el resto se intersecta por id
+        candidates = sorted((lookup(v) for lookup, v in filters), key=len)
+        rows = candidates[0]
+        for other in candidates[1:]:
+            ids = {v.id for v in other}
+            rows = [v for v in rows if v.id in ids]
+        return gen, [_view_to_dict(v) for v in rows[:limit]]
+
+    def _node(
+        self, state: RepoState, params: dict[str, str]
+    ) -> tuple[int, dict[str, Any]]:
+        node_id = params.get("id")
+        if node_id is None:
+            raise RequestError(400, "node needs ?id=NODE_ID")
+        gen, index = state.index()
+        view = index.get(node_id)
+        if view is None:
+            raise RequestError(404, f"unknown node '{node_id}'")
+        return gen, node_to_dict(view.to_codenode(), nested=True)
+
+
+_Endpoint = Callable[[AnalysisServer, RepoState, dict[str, str]], tuple[int, Any]]
+_GET_ROUTES: dict[str, _Endpoint] = {
+    "/analyze": AnalysisServer._analyze,
+    "/query": AnalysisServer._query,
+    "/node": AnalysisServer._node,
+}
+
+
+# === Transporte ========================================================
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _HTTPServer | _UnixHTTPServer
+    protocol_version = "HTTP/1.1"  # keep-alive: sin handshake por petición
+
+    def _respond(self, method: str) -> None:
+        status, body = self.server.app.handle(method, self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._respond("GET")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._respond("POST")
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug("request", line=format % args)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], app: AnalysisServer) -> None:
+        self.app = app
+        super().__init__(address, _Handler)
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, app: AnalysisServer) -> None:
+        self.app = app
+        super().__init__(path, _Handler)
+
+    def get_request(self) -> tuple[Any, Any]:
+        conn, _ = super().get_request()
+        # BaseHTTPRequestHandler espera una dirección (host, puerto)
+        return conn, ("unix", 0)
+
+
+def make_http_server(
+    app: AnalysisServer,
+    *,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Path | None = None,
+) -> socketserver.BaseServer:
+    """Servidor HTTP sobre TCP o, con ``socket_path``, sobre un socket Unix."""
+    if socket_path is None:
+        return _HTTPServer((host, port), app)
+    try:
+        mode = socket_path.lstat().st_mode
+    except FileNotFoundError:
+        pass
+    else:
+        if not stat.S_ISSOCK(mode):
+            raise ConfigurationError(f"{socket_path} exists and is not a socket")
+        socket_path.unlink()  # socket de una ejecución anterior
+    server = _UnixHTTPServer(str(socket_path), app)
+    os.chmod(socket_path, 0o600)  # solo el usuario que lo arranca
+    return server
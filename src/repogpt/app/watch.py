@@ -0,0 +1,169 @@
+"""
+Modo watch: re-análisis incremental cuando cambian ficheros del repo.
+
+Dos backends para saber *cuándo* mirar:
+
+* ``inotify`` (Linux, paquete opcional ``inotify_simple``): se bloquea hasta
+  que el kernel notifica cambios en algún directorio vigilado.
+* ``poll``: se despierta cada ``interval`` segundos.
+
+En ambos casos *qué* ha cambiado lo decide ``IncrementalAnalysis.scan``
+comparando ``(mtime, tamaño)``, y no se aplica nada hasta que el árbol lleva
+``debounce`` segundos sin cambiar (un guardado suele tocar varios ficheros).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Protocol
+
+import structlog
+
+from repogpt.adapters.collector.simple_collector import FileFilter
+from repogpt.core.incremental import Changes, IncrementalAnalysis
+from repogpt.core.ports import PublisherPort
+from repogpt.exceptions import ConfigurationError
+from repogpt.models import AnalysisConf
+
+WATCH_BACKENDS: tuple[str, ...] = ("auto", "inotify", "poll")
+
+logger = structlog.get_logger(__name__)
+
+
+class Watcher(Protocol):
+    def wait(self, stop: threading.Event) -> None:
+        """Vuelve cuando puede haber cambios (o si ``stop`` se activa)."""
+        ...
+
+    def close(self) -> None: ...
+
+
+class PollWatcher:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+
+    def wait(self, stop: threading.Event) -> None:
+        stop.wait(self.interval)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Vigila todos los directorios no ignorados del repo con inotify."""
+
+    def __init__(self, root: Path) -> None:
+        from inotify_simple import INotify, flags
+
+        self._flags = flags
+        self._mask = (
+            flags.CREATE
+            | flags.MODIFY
+            | flags.CLOSE_WRITE
+            | flags.DELETE
+            | flags.MOVED_FROM
+            | flags.MOVED_TO
+        )
+        self._inotify = INotify()
+        self._dirs: dict[int, str] = {}
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not FileFilter.ignored_name(d)]
+            self._add(dirpath)
+
+    def _add(self, path: str) -> None:
+        try:
+            self._dirs[self._inotify.add_watch(path, self._mask)] = path
+        except OSError as exc:  # p. ej. límite max_user_watches
+            logger.warning("cannot watch directory", path=path, error=str(exc))
+
+    def wait(self, stop: threading.Event) -> None:
+        # Timeout corto para poder atender ``stop``
+        while not stop.is_set():
+            events = self._inotify.read(timeout=500)
+            if not events:
+                continue
+            for ev in events:
+                if ev.mask & self._flags.ISDIR and ev.mask & (
+                    self._flags.CREATE | self._flags.MOVED_TO
+                ):
+                    parent = self._dirs.get(ev.wd)
+                    if parent is not None and not FileFilter.ignored_name(ev.name):
+                        self._add(os.path.join(parent, ev.name))
+            return
+
+    def close(self) -> None:
+        self._inotify.close()
+
+
+def make_watcher(backend: str, root: Path, interval: float) -> Watcher:
+    if backend not in WATCH_BACKENDS:
+        raise ConfigurationError(
+            f"Unknown watch backend '{backend}' (use one of {WATCH_BACKENDS})"
+        )
+    if backend in ("auto", "inotify"):
+        try:
+            return InotifyWatcher(root)
+        except ImportError as exc:
+            if backend == "inotify":
+                raise ConfigurationError(
+                    "inotify backend needs the 'inotify_simple' package"
+                ) from exc
+        except OSError as exc:  # no-Linux o sin soporte
+            if backend == "inotify":
+                raise ConfigurationError(f"inotify unavailable: {exc}") from exc
+    return PollWatcher(interval)
+
+
+def publish_atomic(
+    publisher: PublisherPort, analysis: IncrementalAnalysis, conf: AnalysisConf
+) -> None:
+    """
+    Reescribe el artefacto completo sin que un lector vea nunca uno a medias.
+
+    Los publishers ya escriben a un temporal junto a la salida y lo renombran
+    encima con ``os.replace``, así que basta con publicar directamente.
+    """
+    if conf.to_stdout:
+        raise ConfigurationError("watch mode needs an output file, not stdout")
+    publisher.publish(analysis.results(), conf)
+
+
+def watch(
+    analysis: IncrementalAnalysis,
+    watcher: Watcher,
+    *,
+    debounce: float = 0.3,
+    on_change: Callable[[Changes], Any] | None = None,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Bucle del modo watch: espera, agrupa cambios y aplica ``refresh``.
+
+    ``on_change`` se llama tras cada lote aplicado (p. ej. para publicar).
+    Termina cuando se activa ``stop`` (o con Ctrl-C).
+    """
+    stop = stop or threading.Event()
+    try:
+        while not stop.is_set():
+            watcher.wait(stop)
+            if stop.is_set():
+                break
+            changes, stamps = analysis.scan()
+            if not changes:
+                continue
+            # Debounce: esperar a que el árbol deje de cambiar
+            while not stop.wait(debounce):
+                again, new_stamps = analysis.scan()
+                if new_stamps == stamps:
+                    break
+                changes, stamps = again, new_stamps
+            if stop.is_set():
+                break
+            analysis.apply(changes, stamps)
+            if on_change is not None:
+                on_change(changes)
+    finally:
+        watcher.close()
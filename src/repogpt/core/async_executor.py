@@ -0,0 +1,198 @@
+"""
+Modo async: I/O concurrente con ``asyncio`` y parseo en el pool de workers.
+
+Pensado para checkouts en red o FUSE, donde cada ``stat``/``open``/``read``
+bloquea milisegundos. Los listados y lecturas se delegan a hilos
+(``asyncio.to_thread``) y hay hasta ``conf.io_concurrency`` en vuelo; el
+parseo (CPU) va al mismo pool que en el modo síncrono (``--jobs`` /
+``--executor``). El orden de los resultados es el de los ficheros.
+
+El publisher sigue siendo síncrono: :func:`run_pipeline_async` ejecuta el
+event loop en un hilo propio y entrega los resultados como un iterador normal.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from repogpt.core.executor import (
+    EXECUTORS,
+    WINDOW_FACTOR,
+    _init_worker,
+    _process_bytes_in_worker,
+    resolve_jobs,
+)
+from repogpt.core.ports import AsyncCollectorPort, AsyncPipelinePort, CollectorPort
+from repogpt.exceptions import ConfigurationError
+from repogpt.models import AnalysisConf, PipelineResult
+from repogpt.utils.file_utils import release_buffer
+
+QUEUE_SIZE = 64  # resultados pendientes de consumir por el publisher
+
+_T = TypeVar("_T")
+
+
+def _cpu_pool(pipeline: AsyncPipelinePort, conf: AnalysisConf) -> Executor:
+    jobs = resolve_jobs(conf.jobs)
+    if conf.executor not in EXECUTORS:
+        raise ConfigurationError(
+            f"Unknown executor '{conf.executor}' (use one of {EXECUTORS})"
+        )
+    if conf.executor == "process" and jobs > 1:
+        return ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(pipeline, conf.log_level),
+        )
+    # Con un solo worker el parseo también sale del event loop, para que las
+    # lecturas sigan avanzando mientras se parsea
+    return ThreadPoolExecutor(max_workers=jobs)
+
+
+async def _from_sync(files: Iterator[Path]) -> AsyncIterator[Path]:
+    """Adapta un collector síncrono: cada ``next`` se ejecuta en un hilo."""
+    done = object()
+    while (path := await asyncio.to_thread(next, files, done)) is not done:
+        assert isinstance(path, Path)
+        yield path
+
+
+async def arun_pipeline(
+    pipeline: AsyncPipelinePort, files: AsyncIterator[Path], conf: AnalysisConf
+) -> AsyncGenerator[PipelineResult, None]:
+    """
+    Versión async de ``run_pipeline``: lee con ``pipeline.aread`` y parsea
+    con ``pipeline.process_bytes`` en el pool de CPU.
+
+    Como mucho hay ``io_concurrency + jobs * WINDOW_FACTOR`` ficheros en vuelo.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _cpu_pool(pipeline, conf)
+    in_process = isinstance(pool, ProcessPoolExecutor)
+    window = max(1, conf.io_concurrency) + resolve_jobs(conf.jobs) * WINDOW_FACTOR
+
+    async def one(path: Path) -> PipelineResult:
+        t0 = time.perf_counter()
+        data = await pipeline.aread(path, conf)
+        if isinstance(data, PipelineResult):
+            return data
+        read_time = time.perf_counter() - t0
+        try:
+            if in_process:
+                # Un mmap no viaja entre procesos: se copia una vez para el IPC
+                payload = data if isinstance(data, bytes) else bytes(data)
+                return await loop.run_in_executor(
+                    pool, _process_bytes_in_worker, path, payload, conf, read_time
+                )
+            return await loop.run_in_executor(
+                pool, pipeline.process_bytes, path, data, conf, read_time
+            )
+        finally:
+            release_buffer(data)
+
+    pending: deque[asyncio.Task[PipelineResult]] = deque()
+    try:
+        async for path in files:
+            pending.append(asyncio.ensure_future(one(path)))
+            if len(pending) >= window:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+_DONE = object()
+
+
+class _LoopThread(Generic[_T]):
+    """Event loop en un hilo que vuelca un async iterator en una cola acotada."""
+
+    def __init__(
+        self, make: Callable[[], AsyncGenerator[_T, None]], io_concurrency: int
+    ) -> None:
+        self.make = make
+        self.io_concurrency = io_concurrency
+        self.queue: queue.Queue[object] = queue.Queue(QUEUE_SIZE)
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="repogpt-async")
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self._pump())
+        except BaseException as exc:  # noqa: BLE001 – se relanza en el consumidor
+            self.queue.put(_Failure(exc))
+        else:
+            self.queue.put(_DONE)
+
+    async def _pump(self) -> None:
+        # El executor por defecto es el que usan listados y lecturas
+        # (asyncio.to_thread): su tamaño es el límite de concurrencia de I/O
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=max(1, self.io_concurrency))
+        )
+        agen = self.make()
+        try:
+            async for item in agen:
+                try:
+                    self.queue.put_nowait(item)
+                except queue.Full:  # contrapresión: el publisher va por detrás
+                    await asyncio.to_thread(self.queue.put, item)
+                if self.stop.is_set():
+                    break
+        finally:
+            await agen.aclose()
+
+    def __iter__(self) -> Iterator[_T]:
+        self.thread.start()
+        try:
+            while (item := self.queue.get()) is not _DONE:
+                if isinstance(item, _Failure):
+                    raise item.exc
+                yield item  # type: ignore[misc]
+        finally:
+            # El consumidor puede parar antes (fail-fast): vaciar la cola
+            # hasta que el hilo termine para que no se quede bloqueado
+            self.stop.set()
+            while self.thread.is_alive():
+                try:
+                    self.queue.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            self.thread.join()
+
+
+def run_pipeline_async(
+    collector: CollectorPort, pipeline: AsyncPipelinePort, conf: AnalysisConf
+) -> Iterator[PipelineResult]:
+    """
+    Collector + pipeline en modo async, consumibles desde código síncrono.
+
+    Si el collector no es async, su ``iter_files`` se consume desde un hilo.
+    """
+
+    def make() -> AsyncGenerator[PipelineResult, None]:
+        files = (
+            collector.aiter_files(conf)
+            if isinstance(collector, AsyncCollectorPort)
+            else _from_sync(collector.iter_files(conf))
+        )
+        return arun_pipeline(pipeline, files, conf)
+
+    return iter(_LoopThread(make, conf.io_concurrency))
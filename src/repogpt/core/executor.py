@@ -0,0 +1,139 @@
+"""Ejecución del pipeline por fichero: secuencial, pool de hilos o de procesos."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import sys
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from pathlib import Path
+from typing import TypeVar
+
+import structlog
+
+from repogpt.core.ports import AsyncPipelinePort, PipelinePort
+from repogpt.exceptions import ConfigurationError
+from repogpt.models import AnalysisConf, PipelineResult
+
+EXECUTORS: tuple[str, ...] = ("process", "thread")
+BATCH_SIZE = 8  # ficheros por tarea en el pool de procesos
+WINDOW_FACTOR = 4  # tareas en vuelo por worker
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+# Pipeline instalado en cada proceso worker por ``_init_worker``
+_worker_pipeline: PipelinePort | None = None
+
+
+def resolve_jobs(jobs: int) -> int:
+    """``jobs <= 0`` significa «tantos workers como CPUs»."""
+    if jobs > 0:
+        return jobs
+    return os.cpu_count() or 1
+
+
+def _init_worker(pipeline: PipelinePort, log_level: str) -> None:
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+    # Con spawn/forkserver el worker arranca sin configurar: los logs a STDERR,
+    # nunca mezclados con los datos de STDOUT.
+    if not structlog.is_configured():
+        structlog.configure(
+            wrapper_class=structlog.make_filtering_bound_logger(
+                getattr(logging, log_level, logging.INFO)
+            ),
+            logger_factory=structlog.PrintLoggerFactory(file=sys.stderr),
+        )
+
+
+def _process_in_worker(files: list[Path], conf: AnalysisConf) -> list[PipelineResult]:
+    assert _worker_pipeline is not None, "worker not initialized"
+    return [_worker_pipeline.process(p, conf) for p in files]
+
+
+def _process_bytes_in_worker(
+    file: Path, data: bytes, conf: AnalysisConf, read_time: float
+) -> PipelineResult:
+    assert isinstance(_worker_pipeline, AsyncPipelinePort), "worker not initialized"
+    return _worker_pipeline.process_bytes(file, data, conf, read_time)
+
+
+def _batched(items: Iterable[Path], size: int) -> Iterator[list[Path]]:
+    it = iter(items)
+    while batch := list(itertools.islice(it, size)):
+        yield batch
+
+
+def _ordered(
+    pool: Executor,
+    fn: Callable[[_T, AnalysisConf], _R],
+    items: Iterable[_T],
+    conf: AnalysisConf,
+    window: int,
+) -> Iterator[_R]:
+    """
+    Como ``pool.map`` pero consumiendo ``items`` de forma perezosa.
+
+    Nunca hay más de ``window`` tareas en vuelo, así que la memoria no crece
+    con el tamaño del repo, y los resultados salen en orden de entrada.
+    """
+    pending: deque[Future[_R]] = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item, conf))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def run_pipeline(
+    pipeline: PipelinePort, files: Iterable[Path], conf: AnalysisConf
+) -> Iterator[PipelineResult]:
+    """
+    Procesa ``files`` con ``pipeline`` según ``conf.jobs`` / ``conf.executor``.
+
+    ``files`` se consume en streaming y los resultados se devuelven siempre
+    en el mismo orden, independientemente del número de workers.
+    """
+    jobs = resolve_jobs(conf.jobs)
+    if jobs == 1:
+        for p in files:
+            yield pipeline.process(p, conf)
+        return
+
+    if conf.executor == "thread":
+        with ThreadPoolExecutor(max_workers=jobs) as tpool:
+            yield from _ordered(
+                tpool, pipeline.process, files, conf, window=jobs * WINDOW_FACTOR
+            )
+    elif conf.executor == "process":
+        # ast.parse / tokenize retienen el GIL: para escalar con los cores
+        # hacen falta procesos. El pipeline se envía una vez por worker y los
+        # ficheros viajan en lotes para amortizar el IPC.
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(pipeline, conf.log_level),
+        ) as ppool:
+            batches = _ordered(
+                ppool,
+                _process_in_worker,
+                _batched(files, BATCH_SIZE),
+                conf,
+                window=jobs * WINDOW_FACTOR,
+            )
+            for batch in batches:
+                yield from batch
+    else:
+        raise ConfigurationError(
+            f"Unknown executor '{conf.executor}' (use one of {EXECUTORS})"
+        )
@@ -0,0 +1,129 @@
+"""Análisis incremental: resultados por fichero que se actualizan por cambios."""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+import structlog
+
+from repogpt.core.executor import run_pipeline
+from repogpt.core.ports import CollectorPort, PipelinePort
+from repogpt.models import AnalysisConf, PipelineResult
+
+# Por debajo de este número de ficheros cambiados no compensa arrancar workers
+PARALLEL_THRESHOLD = 32
+
+# (mtime_ns, size): barato de obtener y suficiente para detectar cambios
+Stamp = tuple[int, int]
+
+
+@dataclass
+class Changes:
+    added: list[Path] = field(default_factory=list)
+    modified: list[Path] = field(default_factory=list)
+    deleted: list[Path] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.deleted)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.modified) + len(self.deleted)
+
+
+class IncrementalAnalysis:
+    """
+    Mantiene el ``PipelineResult`` de cada fichero del repo.
+
+    ``full()`` analiza todo una vez; después ``refresh()`` vuelve a listar
+    los ficheros con el collector, compara ``(mtime, tamaño)`` con la
+    instantánea anterior y solo pasa por el pipeline los añadidos o
+    modificados. Los borrados se descartan. Es seguro consultar
+    ``results()`` desde otro hilo mientras se refresca.
+    """
+
+    def __init__(
+        self, collector: CollectorPort, pipeline: PipelinePort, conf: AnalysisConf
+    ) -> None:
+        self.collector = collector
+        self.pipeline = pipeline
+        self.conf = conf
+        self._results: dict[Path, PipelineResult] = {}
+        self._stamps: dict[Path, Stamp] = {}
+        self._lock = threading.Lock()
+        self.generation = 0  # se incrementa con cada cambio aplicado
+        self.log = structlog.get_logger(__name__)
+
+    # ------------------------------------------------------------------
+    def results(self) -> list[PipelineResult]:
+        """Resultados actuales, ordenados por ruta."""
+        with self._lock:
+            return [self._results[p] for p in sorted(self._results)]
+
+    def snapshot(self) -> tuple[int, list[PipelineResult]]:
+        """``(generation, results())`` leídos a la vez, bajo el mismo lock."""
+        with self._lock:
+            return self.generation, [self._results[p] for p in sorted(self._results)]
+
+    def full(self) -> Changes:
+        with self._lock:
+            self._results.clear()
+            self._stamps.clear()
+        return self.refresh()
+
+    def scan(self) -> tuple[Changes, dict[Path, Stamp]]:
+        """Compara el estado del disco con la última instantánea."""
+        stamps: dict[Path, Stamp] = {}
+        for p in self.collector.iter_files(self.conf):
+            try:
+                st = os.stat(p)
+            except OSError:  # borrado entre el listado y el stat
+                continue
+            stamps[p] = (st.st_mtime_ns, st.st_size)
+
+        changes = Changes()
+        for p, stamp in stamps.items():
+            prev = self._stamps.get(p)
+            if prev is None:
+                changes.added.append(p)
+            elif prev != stamp:
+                changes.modified.append(p)
+        changes.deleted = [p for p in self._stamps if p not in stamps]
+        return changes, stamps
+
+    def refresh(self) -> Changes:
+        changes, stamps = self.scan()
+        if changes:
+            self.apply(changes, stamps)
+        return changes
+
+    def apply(self, changes: Changes, stamps: dict[Path, Stamp]) -> None:
+        todo = changes.added + changes.modified
+        processed = list(self._process(todo))
+        with self._lock:
+            for p in changes.deleted:
+                self._results.pop(p, None)
+            for r in processed:
+                if r.skipped:  # p. ej. pasó a ser binario
+                    self._results.pop(r.path, None)
+                else:
+                    self._results[r.path] = r
+            self._stamps = stamps
+            self.generation += 1
+        self.log.info(
+            "analysis updated",
+            added=len(changes.added),
+            modified=len(changes.modified),
+            deleted=len(changes.deleted),
+        )
+
+    def _process(self, files: list[Path]) -> Iterable[PipelineResult]:
+        conf = (
+            self.conf
+            if len(files) >= PARALLEL_THRESHOLD
+            else replace(self.conf, jobs=1)
+        )
+        return run_pipeline(self.pipeline, files, conf)
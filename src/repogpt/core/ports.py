@@ -2,24 +2,67 @@
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Iterable, Iterator
 from pathlib import Path
-from typing import Protocol
+from typing import Protocol, runtime_checkable
 
-from repogpt.models import AnalysisConf, CollectionResult, PipelineResult
+from repogpt.models import AnalysisConf, CodeNode, CollectionResult, PipelineResult
+from repogpt.utils.file_utils import FileBuffer
 
 
 class CollectorPort(Protocol):
     def collect(self, conf: AnalysisConf) -> CollectionResult:  # noqa: D401
         ...
 
+    def iter_files(self, conf: AnalysisConf) -> Iterator[Path]:  # noqa: D401
+        """Variante streaming de ``collect``: solo los ficheros aceptados."""
+        ...
+
 
 class PipelinePort(Protocol):
     def process(self, file: Path, conf: AnalysisConf) -> PipelineResult:  # noqa: D401
         ...
 
 
+@runtime_checkable
+class AsyncCollectorPort(Protocol):
+    def aiter_files(self, conf: AnalysisConf) -> AsyncIterator[Path]:  # noqa: D401
+        """``iter_files`` con el I/O (listados, ``stat``) en paralelo."""
+        ...
+
+
+@runtime_checkable
+class AsyncPipelinePort(PipelinePort, Protocol):
+    """
+    Pipeline en dos etapas para el modo async: ``aread`` (I/O, concurrente en
+    el event loop) y ``process_bytes`` (CPU, en el pool de workers).
+    """
+
+    async def aread(
+        self, file: Path, conf: AnalysisConf
+    ) -> FileBuffer | PipelineResult:  # noqa: D401
+        """
+        Contenido del fichero, o el resultado de error si no se pudo leer.
+        El executor libera el buffer tras ``process_bytes``.
+        """
+        ...
+
+    def process_bytes(
+        self, file: Path, data: FileBuffer, conf: AnalysisConf, read_time: float = 0.0
+    ) -> PipelineResult:  # noqa: D401
+        ...
+
+
 class PublisherPort(Protocol):
     def publish(
-        self, results: list[PipelineResult], conf: AnalysisConf
+        self, results: Iterable[PipelineResult], conf: AnalysisConf
     ) -> None:  # noqa: D401
         ...
+
+
+class CachePort(Protocol):
+    def get(self, key: str) -> CodeNode | None:  # noqa: D401
+        ...
+
+    def put(self, key: str, root: CodeNode) -> None:  # noqa: D401
+        ...
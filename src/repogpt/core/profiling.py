@@ -0,0 +1,201 @@
+"""Temporizadores por etapa y por fichero para ``--profile``."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import time
+from collections.abc import Generator, Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+from repogpt.models import PipelineResult
+
+_T = TypeVar("_T")
+
+# Etapas por fichero que el pipeline anota en ``PipelineResult.timings``
+FILE_STAGES: tuple[str, ...] = ("read", "hash", "parse", "process")
+DEFAULT_TOP = 10
+
+
+@dataclass
+class FileTiming:
+    path: str
+    language: str
+    size: int
+    seconds: float
+    stages: dict[str, float]
+    ok: bool
+
+
+class Profiler:
+    """
+    Acumula tiempo de reloj por etapa y tiempos por fichero.
+
+    collector, pipeline y publisher corren intercalados como generadores, así
+    que el tiempo se mide en *exclusiva*: al entrar en una etapa anidada (p.
+    ej. el publisher pide el siguiente resultado) se pausa la exterior. La
+    suma de etapas es por tanto el tiempo total de la ejecución.
+
+    Los tiempos por fichero vienen de los workers en
+    ``PipelineResult.timings``; con ``--jobs > 1`` su suma es tiempo de worker
+    y puede superar el tiempo de reloj de la etapa ``pipeline``. De cada
+    fichero solo se acumulan totales; se guardan únicamente los ``top`` más
+    lentos y más grandes (memoria constante con el tamaño del repo).
+    """
+
+    def __init__(self, top: int = DEFAULT_TOP) -> None:
+        self.stages: dict[str, float] = {}
+        self.top = top
+        self.file_count = 0
+        self._file_stages = dict.fromkeys(FILE_STAGES, 0.0)
+        self._languages: dict[str, dict[str, Any]] = {}
+        # min-heaps de (clave, secuencia, fichero): la raíz es el que sobra
+        self._slowest: list[tuple[float, int, FileTiming]] = []
+        self._largest: list[tuple[float, int, FileTiming]] = []
+        self._seq = itertools.count()
+        self._stack: list[str] = []
+        self._mark = 0.0
+        self._started = time.perf_counter()
+        self._finished: float | None = None
+
+    # --- etapas ----------------------------------------------------------
+    def _enter(self, name: str) -> None:
+        now = time.perf_counter()
+        if self._stack:
+            top = self._stack[-1]
+            self.stages[top] = self.stages.get(top, 0.0) + now - self._mark
+        self._stack.append(name)
+        self._mark = now
+
+    def _exit(self) -> None:
+        now = time.perf_counter()
+        top = self._stack.pop()
+        self.stages[top] = self.stages.get(top, 0.0) + now - self._mark
+        self._mark = now
+
+    def stage(self, name: str) -> _Stage:
+        """``with profiler.stage("publish"): ...``"""
+        return _Stage(self, name)
+
+    def timed_iter(self, name: str, items: Iterable[_T]) -> Generator[_T, None, None]:
+        """Atribuye a ``name`` el tiempo que pasa dentro de cada ``next()``."""
+        it = iter(items)
+        try:
+            while True:
+                self._enter(name)
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+                finally:
+                    self._exit()
+                yield item
+        finally:
+            close = getattr(it, "close", None)
+            if close is not None:
+                close()
+
+    # --- ficheros --------------------------------------------------------
+    def record(self, result: PipelineResult) -> None:
+        f = FileTiming(
+            path=str(result.path),
+            language=result.language,
+            size=int(result.file_info.get("size", 0)),
+            seconds=sum(result.timings.values()),
+            stages=dict(result.timings),
+            ok=result.root is not None,
+        )
+        self.file_count += 1
+        for s, sec in f.stages.items():
+            self._file_stages[s] = self._file_stages.get(s, 0.0) + sec
+        lang = self._languages.setdefault(
+            f.language, {"files": 0, "failed": 0, "bytes": 0, "seconds": 0.0}
+        )
+        lang["files"] += 1
+        lang["failed"] += not f.ok
+        lang["bytes"] += f.size
+        lang["seconds"] += f.seconds
+
+        seq = next(self._seq)
+        for heap, key in ((self._slowest, f.seconds), (self._largest, f.size)):
+            if len(heap) < self.top:
+                heapq.heappush(heap, (key, -seq, f))
+            elif self.top:
+                heapq.heappushpop(heap, (key, -seq, f))
+
+    def finish(self) -> None:
+        self._finished = time.perf_counter()
+
+    # --- informes --------------------------------------------------------
+    def summary(self, top: int | None = None) -> dict[str, Any]:
+        """``top`` no puede superar el ``top`` con el que se creó el profiler."""
+        end = self._finished if self._finished is not None else time.perf_counter()
+        total = end - self._started
+        top = self.top if top is None else min(top, self.top)
+
+        def ranked(heap: list[tuple[float, int, FileTiming]]) -> list[Any]:
+            # Mayor clave primero; a igualdad, el registrado antes
+            return [asdict(f) for *_, f in heapq.nlargest(top, heap)]
+
+        def pct(sec: float) -> float:
+            return round(100 * sec / total, 1) if total > 0 else 0.0
+
+        return {
+            "total_seconds": round(total, 4),
+            "files": self.file_count,
+            "stages": {
+                name: {"seconds": round(sec, 4), "percent": pct(sec)}
+                for name, sec in self.stages.items()
+            },
+            "file_stages": {s: round(sec, 4) for s, sec in self._file_stages.items()},
+            "languages": {
+                name: {**v, "seconds": round(v["seconds"], 4)}
+                for name, v in sorted(self._languages.items())
+            },
+            "slowest": ranked(self._slowest),
+            "largest": ranked(self._largest),
+        }
+
+    def report(self, top: int | None = None) -> str:
+        """Resumen legible (para STDERR)."""
+        s = self.summary(top)
+        lines = [f"profile: {s['total_seconds']:.3f}s total, {s['files']} files"]
+        lines.append("  stages (wall clock):")
+        for name, v in s["stages"].items():
+            lines.append(f"    {name:<10} {v['seconds']:>9.3f}s {v['percent']:>5.1f}%")
+        lines.append("  per-file stages (summed over files):")
+        for name, sec in s["file_stages"].items():
+            lines.append(f"    {name:<10} {sec:>9.3f}s")
+        lines.append("  languages:")
+        for name, v in s["languages"].items():
+            lines.append(
+                f"    {name:<10} {v['files']:>6} files {v['bytes']:>12} B "
+                f"{v['seconds']:>9.3f}s ({v['failed']} failed)"
+            )
+        lines.append("  slowest files:")
+        for f in s["slowest"]:
+            lines.append(f"    {f['seconds']:>11.4f}s  {f['path']}")
+        lines.append("  largest files:")
+        for f in s["largest"]:
+            lines.append(f"    {f['size']:>10} B  {f['path']}")
+        return "\n".join(lines)
+
+    def write_json(self, path: Path, top: int | None = None) -> None:
+        path.write_text(json.dumps(self.summary(top), indent=2), encoding="utf-8")
+
+
+class _Stage:
+    __slots__ = ("_profiler", "_name")
+
+    def __init__(self, profiler: Profiler, name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._profiler._enter(self._name)
+
+    def __exit__(self, *exc: object) -> None:
+        self._profiler._exit()
@@ -1,38 +1,111 @@
 from __future__ import annotations
 
-import sys
+from contextlib import nullcontext
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
 
 import structlog
 
-from repogpt.core.ports import CollectorPort, PipelinePort, PublisherPort
-from repogpt.models import AnalysisConf
+from repogpt.core.async_executor import run_pipeline_async
+from repogpt.core.executor import run_pipeline
+from repogpt.core.profiling import Profiler
+from repogpt.core.ports import (
+    AsyncPipelinePort,
+    CollectorPort,
+    PipelinePort,
+    PublisherPort,
+)
+from repogpt.exceptions import AnalysisError
+from repogpt.models import AnalysisConf, PipelineResult
 
 # === Service ===
 
 
+@dataclass
+class RunStats:
+    ok: int = 0
+    failed: int = 0
+    first_error: str | None = None
+
+
 class CodeRepoAnalysisService:
     def __init__(
-        self, collector: CollectorPort, pipeline: PipelinePort, publisher: PublisherPort
+        self,
+        collector: CollectorPort,
+        pipeline: PipelinePort,
+        publisher: PublisherPort,
+        profiler: Profiler | None = None,
     ):
         self.collector = collector
         self.pipeline = pipeline
         self.publisher = publisher
+        self.profiler = profiler
         self.log = structlog.get_logger(__name__)
 
     def run(self, runtime_conf: AnalysisConf) -> None:
-        col = self.collector.collect(runtime_conf)
-        results = [self.pipeline.process(p, runtime_conf) for p in col.files]
-
-        failed = [r for r in results if r.root is None]
-        ok = len(results) - len(failed)
-        self.log.info("pipeline finished", ok=ok, failed=len(failed))
-
-        if failed and runtime_conf.fail_fast:
-            self.log.error("aborting — fail-fast", first_error=failed[0].error)
-            sys.exit(1)
-
-        self.publisher.publish(results, runtime_conf)
-        if runtime_conf.fail_fast:
-            if failed or ok == 0:  # aborta si hay fallos o nada procesado
-                self.log.error("aborting — fail-fast", first_error=failed[0].error)
-                sys.exit(1)
+        # collector → pipeline → publisher encadenados como generadores:
+        # ningún paso materializa la lista completa de ficheros o resultados.
+        stats = RunStats()
+        prof = self.profiler
+        results: Iterator[PipelineResult]
+        if isinstance(self.pipeline, AsyncPipelinePort):
+            # Modo async: listado, lectura y parseo se solapan, así que el
+            # profiler los ve como una sola etapa "pipeline"
+            results = run_pipeline_async(self.collector, self.pipeline, runtime_conf)
+        else:
+            files: Iterable[Path] = self.collector.iter_files(runtime_conf)
+            if prof is not None:
+                files = prof.timed_iter("collect", files)
+            results = run_pipeline(self.pipeline, files, runtime_conf)
+        if prof is not None:
+            results = prof.timed_iter("pipeline", results)
+        # El publisher es el que tira de toda la cadena: su etapa solo cuenta
+        # el tiempo propio (serialización y escritura).
+        try:
+            with prof.stage("publish") if prof is not None else nullcontext():
+                self.publisher.publish(
+                    self._track(results, stats, runtime_conf), runtime_conf
+                )
+        finally:
+            if prof is not None:
+                prof.finish()
+
+        self.log.info("pipeline finished", ok=stats.ok, failed=stats.failed)
+
+    def _track(
+        self,
+        results: Iterator[PipelineResult],
+        stats: RunStats,
+        runtime_conf: AnalysisConf,
+    ) -> Iterator[PipelineResult]:
+        """
+        Cuenta ok/fallos al vuelo y aplica fail-fast en el primer error.
+
+        Fail-fast corta el stream con :class:`AnalysisError` (también al
+        final, si no se procesó nada): el publisher la ve en medio de
+        ``publish`` y descarta lo escrito hasta entonces.
+        """
+        try:
+            for r in results:
+                if r.skipped:  # binarios: ni se cuentan ni se publican
+                    continue
+                if r.root is None:
+                    stats.failed += 1
+                    stats.first_error = stats.first_error or r.error
+                    if runtime_conf.fail_fast:
+                        self.log.error("aborting — fail-fast", first_error=r.error)
+                        raise AnalysisError(f"fail-fast: {r.path}: {r.error}")
+                else:
+                    stats.ok += 1
+                if self.profiler is not None:
+                    self.profiler.record(r)
+                yield r
+            if runtime_conf.fail_fast and stats.ok == 0:  # nada procesado
+                # Dentro del stream: el publisher aún no ha confirmado nada
+                self.log.error("aborting — fail-fast", first_error=stats.first_error)
+                raise AnalysisError("fail-fast: no file processed")
+        finally:
+            close = getattr(results, "close", None)
+            if close is not None:
+                close()
@@ -4,6 +4,43 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Protocol
 
+from repogpt.exceptions import ConfigurationError
+from repogpt.utils.file_utils import FileBuffer, decode_text
+
+
+@dataclass(frozen=True)
+class AnalysisProfile:
+    """
+    Qué calcula el análisis además de la estructura (módulos, clases,
+    funciones, imports, headings…). Lo reciben el pipeline y cada parser.
+    """
+
+    name: str
+    hash: bool = True  # hash del contenido (y con él, la caché de parseo)
+    comments: bool = True  # comentarios y su asociación a nodos
+    docstrings: bool = True
+    metrics: bool = True  # métricas de línea por fichero
+    extras: bool = False  # métricas por nodo y tags TODO/FIXME
+
+
+PROFILES: dict[str, AnalysisProfile] = {
+    "fast": AnalysisProfile(
+        "fast", hash=False, comments=False, docstrings=False, metrics=False
+    ),
+    "standard": AnalysisProfile("standard"),
+    "full": AnalysisProfile("full", extras=True),
+}
+ANALYSIS_MODES: tuple[str, ...] = tuple(PROFILES)
+
+
+def get_profile(mode: str) -> AnalysisProfile:
+    try:
+        return PROFILES[mode]
+    except KeyError:
+        raise ConfigurationError(
+            f"Unknown analysis mode '{mode}' (use one of {ANALYSIS_MODES})"
+        ) from None
+
 
 @dataclass
 class AnalysisConf:
@@ -18,19 +55,54 @@ class AnalysisConf:
     # --- phase‑3 ---
     log_level: str = "INFO"  # DEBUG | INFO
     fail_fast: bool = False  # abort on first parser error
+    # --- phase‑4 ---
+    jobs: int = 1  # workers del pipeline (<= 0: uno por CPU)
+    executor: str = "process"  # process | thread
+    cache_dir: Path | None = None  # None: sin caché de parseo
+    cache_max_bytes: int = 512 * 1024 * 1024
+    io_concurrency: int = 32  # lecturas/listados simultáneos en modo async
+    profile: bool = False  # tiempos por etapa/fichero (--profile)
+    json_backend: str = "auto"  # auto | orjson | msgspec | json
+    compact: bool = False  # JSON sin indentación
+    compression: str | None = None  # None: según extensión de output
+    compress_level: int | None = None  # None: nivel por defecto del códec
+    mode: str = "standard"  # fast | standard | full (ver PROFILES)
+    hash_algorithm: str = "sha256"  # sha256 | blake2b | xxh3
+
+    @property
+    def analysis(self) -> AnalysisProfile:
+        return get_profile(self.mode)
 
 
 @dataclass
 class ParserInput:
     file_path: Path
     file_info: dict[str, Any]
+    # Contenido ya leído (o mapeado) por el pipeline; None → el parser lee
+    # de disco. Solo es válido durante ``parse``: el pipeline libera el mapeo
+    data: FileBuffer | None = None
+    # Ruta relativa al repo (posix) usada para los IDs estables de nodo
+    rel_path: str | None = None
+    analysis: AnalysisProfile = PROFILES["standard"]
 
+    def read_text(self) -> str:
+        """Texto del fichero, decodificado del buffer compartido si existe."""
+        if self.data is None:
+            return self.file_path.read_text(encoding="utf-8", errors="replace")
+        return decode_text(self.data)
 
-@dataclass
+    def id_path(self) -> str:
+        return self.rel_path or self.file_path.as_posix()
+
+
+@dataclass(slots=True)
 class CodeNode:
+    # slots: sin __dict__ por instancia (ver utils/node_table.py para la
+    # representación columnar de ejecuciones grandes)
     id: str
     type: str
     name: str | None = None
+    qualname: str | None = None  # relativo al fichero, p. ej. "Clase.metodo"
     language: str | None = None
     path: str | None = None
     start_line: int | None = None
@@ -54,6 +126,10 @@ class PipelineResult:
     root: CodeNode | None
     error: str | None = None
     file_info: dict[str, Any] = field(default_factory=dict)
+    # Segundos por etapa (read/hash/parse/process); solo con conf.profile
+    timings: dict[str, float] = field(default_factory=dict)
+    # Ignorado tras leerlo (p. ej. binario): ni resultado ni fallo
+    skipped: bool = False
 
 
 @dataclass
@@ -2,11 +2,121 @@
 
 import hashlib
 import logging
+import mmap
+import os
+from collections.abc import Callable, Mapping
 from pathlib import Path
+from typing import Any
+
+from repogpt.exceptions import ConfigurationError
 
 logger = logging.getLogger(__name__)
 
-CHUNK_SIZE = 8192  # Leer archivos en bloques de 8KB para hashing
+BINARY_CHECK_BYTES = 1024  # Bytes iniciales inspeccionados para detectar binarios
+# A partir de este tamaño se mapea el fichero en lugar de copiarlo con read():
+# hash y decodificación leen directamente de las páginas del kernel
+MMAP_THRESHOLD = 256 * 1024
+
+# Contenido de un fichero: bytes leídos o un mapeo de solo lectura
+FileBuffer = bytes | mmap.mmap
+
+# Hashes de contenido: solo sirven para detectar cambios, no para seguridad
+HASH_ALGORITHMS: tuple[str, ...] = ("sha256", "blake2b", "xxh3")
+
+
+def default_file_mode() -> int:
+    """Permisos que daría un ``open()`` normal: ``0o666`` menos el umask."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return 0o666 & ~mask
+
+
+def read_file_buffer(file_path: Path, threshold: int | None = None) -> FileBuffer:
+    """
+    Lee el archivo completo con una única apertura; los de ``threshold``
+    bytes o más (por defecto ``MMAP_THRESHOLD``) se mapean en vez de copiarse.
+
+    Es la lectura compartida por el pipeline: hash, detección de binarios y
+    decodificación del texto se derivan de este mismo buffer.
+
+    Un ``mmap`` devuelto hay que liberarlo con :func:`release_buffer` cuando
+    ya no se use (y sin memoryviews vivas sobre él).
+    """
+    if threshold is None:
+        threshold = MMAP_THRESHOLD
+    with file_path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size >= threshold:
+            try:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):  # p. ej. FS sin soporte de mmap
+                pass
+        return f.read()
+
+
+def release_buffer(data: FileBuffer) -> None:
+    if isinstance(data, mmap.mmap):
+        try:
+            data.close()
+        except BufferError:  # aún hay una vista exportada: lo cerrará el GC
+            pass
+
+
+def get_hasher(algorithm: str) -> Callable[[FileBuffer], str]:
+    """
+    Función ``buffer → hex`` para uno de ``HASH_ALGORITHMS``.
+
+    ``blake2b`` usa un digest de 32 bytes; ``xxh3`` (128 bits) necesita el
+    paquete opcional ``xxhash``.
+    """
+    if algorithm == "sha256":
+        return lambda data: hashlib.sha256(data).hexdigest()
+    if algorithm == "blake2b":
+        return lambda data: hashlib.blake2b(data, digest_size=32).hexdigest()
+    if algorithm == "xxh3":
+        try:
+            import xxhash
+        except ImportError as exc:
+            raise ConfigurationError(
+                "xxh3 hashing needs the 'xxhash' package (pip install xxhash)"
+            ) from exc
+        hexdigest: Callable[[FileBuffer], str] = xxhash.xxh3_128_hexdigest
+        return hexdigest
+    raise ConfigurationError(
+        f"Unknown hash algorithm '{algorithm}' (use one of {HASH_ALGORITHMS})"
+    )
+
+
+def content_digest(file_info: Mapping[str, Any]) -> str | None:
+    """
+    Hash de contenido que registró el pipeline en ``file_info``.
+
+    Con sha256 es el hex tal cual (compatible con cachés y bases SQLite ya
+    existentes); con otro algoritmo va prefijado (``"xxh3:…"``), así que
+    hashes de algoritmos distintos nunca coinciden.
+    """
+    algorithm = file_info.get("hash_algorithm", "sha256")
+    digest = file_info.get(algorithm)
+    if digest is None:
+        return None
+    return digest if algorithm == "sha256" else f"{algorithm}:{digest}"
+
+
+def looks_binary(data: FileBuffer, check_bytes: int = BINARY_CHECK_BYTES) -> bool:
+    """Misma heurística que :func:`is_likely_binary`, sobre un buffer en memoria."""
+    return b"\x00" in data[:check_bytes]
+
+
+def decode_text(data: FileBuffer) -> str:
+    """
+    Decodifica como ``Path.read_text(encoding="utf-8", errors="replace")``.
+
+    Incluye la traducción de saltos de línea universales (``\\r\\n`` y ``\\r``
+    pasan a ``\\n``) para que los números de línea no cambien.
+    """
+    text = str(data, "utf-8", "replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 
 def calculate_file_hash(file_path: Path, algorithm: str = "sha256") -> str | None:
@@ -23,8 +133,13 @@ def calculate_file_hash(file_path: Path, algorithm: str = "sha256") -> str | Non
     try:
         hasher = hashlib.new(algorithm)
         with file_path.open("rb") as f:
-            while chunk := f.read(CHUNK_SIZE):
-                hasher.update(chunk)
+            size = os.fstat(f.fileno()).st_size
+            if size >= MMAP_THRESHOLD:
+                # Un único update sobre el mapeo: sin copias ni lecturas de 8KB
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hasher.update(mm)
+            else:
+                hasher.update(f.read())
         return hasher.hexdigest()
     except FileNotFoundError:
         logger.error("Archivo no encontrado al calcular hash: %s", file_path)
@@ -42,7 +157,7 @@ def calculate_file_hash(file_path: Path, algorithm: str = "sha256") -> str | Non
     return None
 
 
-def is_likely_binary(file_path: Path, check_bytes: int = 1024) -> bool:
+def is_likely_binary(file_path: Path, check_bytes: int = BINARY_CHECK_BYTES) -> bool:
     """
     Intenta determinar si un archivo es probablemente binario.
 
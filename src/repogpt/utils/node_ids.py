@@ -0,0 +1,41 @@
+# repogpt/utils/node_ids.py
+
+import hashlib
+
+ID_DIGEST_SIZE = 12  # 24 caracteres hex: colisiones despreciables por repo
+
+
+def make_node_id(rel_path: str, kind: str, qualname: str, ordinal: int = 0) -> str:
+    """
+    ID estable de un nodo: mismo fichero, tipo, nombre cualificado y ordinal →
+    mismo ID en cada ejecución.
+
+    No depende de números de línea, así que editar otra parte del fichero no
+    cambia los IDs del resto de nodos; los consumidores (p. ej. un índice RAG)
+    pueden hacer upserts incrementales en lugar de reindexar.
+    """
+    h = hashlib.blake2b(digest_size=ID_DIGEST_SIZE)
+    h.update(f"{rel_path}\0{kind}\0{qualname}\0{ordinal}".encode())
+    return h.hexdigest()
+
+
+class NodeIdFactory:
+    """
+    Genera los IDs de un fichero.
+
+    Lleva la cuenta de ``(kind, qualname)`` repetidos (imports, funciones
+    redefinidas, bloques de código anónimos…) para desambiguarlos por orden
+    de aparición.
+    """
+
+    __slots__ = ("rel_path", "_seen")
+
+    def __init__(self, rel_path: str) -> None:
+        self.rel_path = rel_path
+        self._seen: dict[tuple[str, str], int] = {}
+
+    def __call__(self, kind: str, qualname: str | None) -> str:
+        key = (kind, qualname or "")
+        ordinal = self._seen.get(key, 0)
+        self._seen[key] = ordinal + 1
+        return make_node_id(self.rel_path, kind, key[1], ordinal)
@@ -0,0 +1,220 @@
+"""Representación columnar (struct-of-arrays) de los árboles de una ejecución."""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from types import MappingProxyType
+from typing import Any
+
+from repogpt.models import CodeNode
+
+_NONE = -1  # centinela para enteros ausentes en los arrays
+# Contenedores vacíos (inmutables) compartidos por todas las vistas
+_EMPTY: tuple[Any, ...] = ()
+_EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+
+
+def _intern(value: str | None) -> str | None:
+    return None if value is None else sys.intern(value)
+
+
+class NodeTable:
+    """
+    Todos los nodos de una ejecución en columnas paralelas.
+
+    Frente a un CodeNode por nodo (objeto + cuatro contenedores casi siempre
+    vacíos), aquí cada nodo cuesta unas pocas entradas de lista/array:
+
+    * líneas, padre e hijos en ``array("i")``;
+    * ``type``, ``language`` y ``path`` internados: un único str compartido;
+    * docstrings, comentarios, tags, dependencias y métricas en dicts
+      dispersos: solo ocupan memoria los nodos que los tienen.
+
+    Los nodos se almacenan en anchura, así que los hijos de cada nodo son
+    contiguos y basta ``(primer_hijo, n_hijos)`` para la adyacencia.
+    :class:`NodeView` ofrece la interfaz de lectura de CodeNode.
+    """
+
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+        self.types: list[str] = []
+        self.names: list[str | None] = []
+        self.qualnames: list[str | None] = []
+        self.languages: list[str | None] = []
+        self.paths: list[str | None] = []
+        self.start_lines = array("i")
+        self.end_lines = array("i")
+        self.parents = array("i")
+        self.first_child = array("i")
+        self.n_children = array("i")
+        self.parent_ids: dict[int, str | None] = {}  # solo si ≠ id del padre
+        self.docstrings: dict[int, str] = {}
+        self.comments: dict[int, list[dict[str, Any]]] = {}
+        self.tags: dict[int, list[str]] = {}
+        self.dependencies: dict[int, list[dict[str, Any]]] = {}
+        self.metrics: dict[int, dict[str, Any]] = {}
+        self.roots: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ------------------------------------------------------------------
+    def add_tree(self, root: CodeNode) -> int:
+        """Copia el árbol en la tabla; devuelve el índice de la raíz."""
+        root_idx = self._append(root, _NONE)
+        self.roots.append(root_idx)
+        queue: list[tuple[CodeNode, int]] = [(root, root_idx)]
+        head = 0
+        while head < len(queue):
+            node, idx = queue[head]
+            head += 1
+            self.n_children[idx] = len(node.children)
+            for child in node.children:
+                child_idx = self._append(child, idx)
+                if self.first_child[idx] == _NONE:
+                    self.first_child[idx] = child_idx
+                queue.append((child, child_idx))
+        return root_idx
+
+    def _append(self, node: CodeNode, parent: int) -> int:
+        idx = len(self.ids)
+        self.ids.append(node.id)
+        self.types.append(sys.intern(node.type))
+        self.names.append(node.name)
+        self.qualnames.append(node.qualname)
+        self.languages.append(_intern(node.language))
+        self.paths.append(_intern(node.path))
+        self.start_lines.append(_NONE if node.start_line is None else node.start_line)
+        self.end_lines.append(_NONE if node.end_line is None else node.end_line)
+        self.parents.append(parent)
+        self.first_child.append(_NONE)
+        self.n_children.append(0)
+        expected_parent = None if parent == _NONE else self.ids[parent]
+        if node.parent_id != expected_parent:
+            self.parent_ids[idx] = node.parent_id
+        if node.docstring is not None:
+            self.docstrings[idx] = node.docstring
+        if node.comments:
+            self.comments[idx] = node.comments
+        if node.tags:
+            self.tags[idx] = node.tags
+        if node.dependencies:
+            self.dependencies[idx] = node.dependencies
+        if node.metrics:
+            self.metrics[idx] = node.metrics
+        return idx
+
+    # ------------------------------------------------------------------
+    def view(self, idx: int) -> NodeView:
+        return NodeView(self, idx)
+
+    def iter_roots(self) -> Iterator[NodeView]:
+        return (NodeView(self, i) for i in self.roots)
+
+    def children_of(self, idx: int) -> range:
+        first = self.first_child[idx]
+        if first == _NONE:
+            return range(0)
+        return range(first, first + self.n_children[idx])
+
+
+class NodeView:
+    """Vista de solo lectura con la interfaz de CodeNode sobre una fila de la tabla."""
+
+    __slots__ = ("_table", "_idx")
+
+    def __init__(self, table: NodeTable, idx: int) -> None:
+        self._table = table
+        self._idx = idx
+
+    @property
+    def id(self) -> str:
+        return self._table.ids[self._idx]
+
+    @property
+    def type(self) -> str:
+        return self._table.types[self._idx]
+
+    @property
+    def name(self) -> str | None:
+        return self._table.names[self._idx]
+
+    @property
+    def qualname(self) -> str | None:
+        return self._table.qualnames[self._idx]
+
+    @property
+    def language(self) -> str | None:
+        return self._table.languages[self._idx]
+
+    @property
+    def path(self) -> str | None:
+        return self._table.paths[self._idx]
+
+    @property
+    def start_line(self) -> int | None:
+        v = self._table.start_lines[self._idx]
+        return None if v == _NONE else v
+
+    @property
+    def end_line(self) -> int | None:
+        v = self._table.end_lines[self._idx]
+        return None if v == _NONE else v
+
+    @property
+    def docstring(self) -> str | None:
+        return self._table.docstrings.get(self._idx)
+
+    @property
+    def comments(self) -> Sequence[dict[str, Any]]:
+        return self._table.comments.get(self._idx, _EMPTY)
+
+    @property
+    def tags(self) -> Sequence[str]:
+        return self._table.tags.get(self._idx, _EMPTY)
+
+    @property
+    def dependencies(self) -> Sequence[dict[str, Any]]:
+        return self._table.dependencies.get(self._idx, _EMPTY)
+
+    @property
+    def parent_id(self) -> str | None:
+        t = self._table
+        if self._idx in t.parent_ids:
+            return t.parent_ids[self._idx]
+        parent = t.parents[self._idx]
+        return None if parent == _NONE else t.ids[parent]
+
+    @property
+    def children(self) -> list[NodeView]:
+        return [NodeView(self._table, i) for i in self._table.children_of(self._idx)]
+
+    @property
+    def metrics(self) -> Mapping[str, Any]:
+        return self._table.metrics.get(self._idx, _EMPTY_MAPPING)
+
+    def to_codenode(self) -> CodeNode:
+        """Materializa el subárbol como CodeNode para consumidores existentes."""
+        node = CodeNode(
+            id=self.id,
+            type=self.type,
+            name=self.name,
+            qualname=self.qualname,
+            language=self.language,
+            path=self.path,
+            start_line=self.start_line,
+            end_line=self.end_line,
+            docstring=self.docstring,
+            comments=list(self.comments),
+            tags=list(self.tags),
+            dependencies=list(self.dependencies),
+            parent_id=self.parent_id,
+            metrics=dict(self.metrics),
+        )
+        node.children = [c.to_codenode() for c in self.children]
+        return node
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<{self.type}:{self.name} @{self.start_line}-{self.end_line}>"
@@ -0,0 +1,146 @@
+"""Índice de consulta en memoria sobre los resultados de una ejecución."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from repogpt.models import PipelineResult
+from repogpt.utils.node_table import NodeTable, NodeView
+
+_NONE = -1
+
+
+class RepoIndex:
+    """
+    Índices precalculados sobre todos los nodos de una ejecución.
+
+    Se construye una vez (``RepoIndex.from_results``) y cada consulta es una
+    búsqueda en diccionario, frente a los helpers de ``tree_utils`` que
+    recorren y serializan el árbol completo en cada llamada. Los nodos viven
+    en una :class:`NodeTable` y se devuelven como :class:`NodeView` (misma
+    interfaz de lectura que CodeNode, sin copiar nada).
+    """
+
+    def __init__(self) -> None:
+        self.table = NodeTable()
+        self._by_id: dict[str, int] = {}
+        self._by_type: defaultdict[str, list[int]] = defaultdict(list)
+        self._by_name: defaultdict[str, list[int]] = defaultdict(list)
+        self._by_qualname: defaultdict[str, list[int]] = defaultdict(list)
+        self._by_path: defaultdict[str, list[int]] = defaultdict(list)
+        self._by_tag: defaultdict[str, list[int]] = defaultdict(list)
+
+    @classmethod
+    def from_results(cls, results: Iterable[PipelineResult]) -> RepoIndex:
+        index = cls()
+        for r in results:
+            index.add(r)
+        return index
+
+    def add(self, result: PipelineResult) -> None:
+        """Indexa el árbol de un resultado (los fallidos se ignoran)."""
+        if result.root is None:
+            return
+        t = self.table
+        start = len(t)
+        t.add_tree(result.root)
+        for idx in range(start, len(t)):
+            self._by_id[t.ids[idx]] = idx
+            self._by_type[t.types[idx]].append(idx)
+            name, qualname, path = t.names[idx], t.qualnames[idx], t.paths[idx]
+            if name is not None:
+                self._by_name[name].append(idx)
+            if qualname is not None:
+                self._by_qualname[qualname].append(idx)
+            if path is not None:
+                self._by_path[path].append(idx)
+            for tag in t.tags.get(idx, ()):
+                self._by_tag[tag].append(idx)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def _views(self, rows: Iterable[int]) -> list[NodeView]:
+        t = self.table
+        return [NodeView(t, i) for i in rows]
+
+    # === Búsquedas =====================================================
+
+    def get(self, node_id: str) -> NodeView | None:
+        idx = self._by_id.get(node_id)
+        return None if idx is None else NodeView(self.table, idx)
+
+    def by_type(self, type_: str) -> list[NodeView]:
+        return self._views(self._by_type.get(type_, ()))
+
+    def by_name(self, name: str) -> list[NodeView]:
+        return self._views(self._by_name.get(name, ()))
+
+    def by_qualname(self, qualname: str) -> list[NodeView]:
+        return self._views(self._by_qualname.get(qualname, ()))
+
+    def by_path(self, path: str) -> list[NodeView]:
+        """Nodos de un fichero, en el orden de la tabla (raíz primero)."""
+        return self._views(self._by_path.get(path, ()))
+
+    def by_tag(self, tag: str) -> list[NodeView]:
+        return self._views(self._by_tag.get(tag, ()))
+
+    @property
+    def types(self) -> list[str]:
+        return sorted(self._by_type)
+
+    @property
+    def paths(self) -> list[str]:
+        return sorted(self._by_path)
+
+    # === Adyacencia ====================================================
+
+    def children(self, node_id: str) -> list[NodeView]:
+        idx = self._by_id.get(node_id)
+        if idx is None:
+            return []
+        return self._views(self.table.children_of(idx))
+
+    def parent(self, node_id: str) -> NodeView | None:
+        idx = self._by_id.get(node_id)
+        if idx is None or self.table.parents[idx] == _NONE:
+            return None
+        return NodeView(self.table, self.table.parents[idx])
+
+    def ancestors(self, node_id: str) -> Iterator[NodeView]:
+        """Del padre hacia la raíz."""
+        idx = self._by_id.get(node_id)
+        parents = self.table.parents
+        while idx is not None and parents[idx] != _NONE:
+            idx = parents[idx]
+            yield NodeView(self.table, idx)
+
+    # === Recorridos perezosos ==========================================
+
+    def where(
+        self, predicate: Callable[[NodeView], bool], *, type_: str | None = None
+    ) -> Iterator[NodeView]:
+        """
+        Genera los nodos que cumplen ``predicate``.
+
+        ``type_`` restringe el recorrido al índice de ese tipo en lugar de a
+        toda la tabla.
+        """
+        t = self.table
+        rows: Iterable[int] = (
+            range(len(t)) if type_ is None else self._by_type.get(type_, ())
+        )
+        for idx in rows:
+            view = NodeView(t, idx)
+            if predicate(view):
+                yield view
+
+    def comments(self) -> Iterator[dict[str, Any]]:
+        for comments in self.table.comments.values():
+            yield from comments
+
+    def docstrings(self) -> Iterator[str]:
+        return (d for d in self.table.docstrings.values() if d)
@@ -3,18 +3,47 @@
 import io
 import re
 import tokenize
+from bisect import bisect_right
 from typing import Any
 
 
+class LineIndex:
+    """
+    Tabla de offsets de inicio de línea de un texto.
+
+    Se construye una vez por fichero (O(n)) y traduce offset → número de
+    línea con bisect (O(log n)), en lugar de ``text.count("\\n", 0, offset)``,
+    que re-escanea el texto desde el principio en cada consulta.
+    """
+
+    __slots__ = ("_starts",)
+
+    def __init__(self, text: str) -> None:
+        self._starts = [0]
+        self._starts.extend(m.end() for m in re.finditer("\n", text))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def line_of(self, offset: int) -> int:
+        """Número de línea (1-based) que contiene ``offset``."""
+        return bisect_right(self._starts, offset)
+
+
 def count_blank_lines(text: str) -> int:
     """Cuenta líneas completamente en blanco."""
     return sum(1 for line in text.splitlines() if not line.strip())
 
 
-def extract_comments(content: str, language: str = "python") -> list[dict[str, Any]]:
+def extract_comments(
+    content: str, language: str = "python", line_index: LineIndex | None = None
+) -> list[dict[str, Any]]:
     """
     Extrae comentarios con línea para distintos lenguajes.
 
+    ``line_index`` permite reutilizar el índice de líneas que ya construyó el
+    llamador (solo se usa para markdown).
+
     Devuelve: [{"text": ..., "line": ...}]
     """
     comments = []
@@ -33,8 +62,9 @@ def extract_comments(content: str, language: str = "python") -> list[dict[str, A
             pass
     elif language == "markdown":
         # Busca <!-- ... --> comentarios HTML
+        index = line_index or LineIndex(content)
         for match in re.finditer(r"<!--(.*?)-->", content, re.DOTALL):
-            line = content.count("\n", 0, match.start()) + 1
+            line = index.line_of(match.start())
             comments.append(
                 {
                     "text": match.group(1).strip(),
@@ -45,6 +75,39 @@ def extract_comments(content: str, language: str = "python") -> list[dict[str, A
     return comments
 
 
+def _line_metrics(text: str) -> tuple[int, int]:
+    """(líneas en blanco, líneas con contenido) en un solo recorrido."""
+    lines = text.splitlines()
+    code = sum(map(bool, map(str.strip, lines)))  # iteración en C, sin listas
+    return len(lines) - code, code
+
+
+def scan_python_source(
+    content: str, *, comments: bool = True, metrics: bool = True
+) -> tuple[list[dict[str, Any]], int, int]:
+    """
+    Comentarios y métricas de línea de un fuente Python.
+
+    Un único recorrido por líneas para las métricas y, solo si el texto
+    contiene algún ``#``, un pase de ``tokenize`` para los comentarios: sin
+    ``#`` no puede haber comentarios y el tokenizer se omite por completo.
+    ``comments=False`` / ``metrics=False`` se saltan cada pase (el resultado
+    correspondiente sale vacío o a cero).
+
+    Returns:
+        ``(comments, blank_lines, lines_of_code)``, idénticos a
+        ``extract_comments``, ``count_blank_lines`` y el número de líneas no
+        vacías de ``splitlines``.
+    """
+    blank, code = _line_metrics(content) if metrics else (0, 0)
+    found = (
+        extract_comments(content, language="python")
+        if comments and "#" in content
+        else []
+    )
+    return found, blank, code
+
+
 def extract_todos_fixmes(comments: list[dict[str, Any]]) -> tuple[list[str], list[str]]:
     """
     Extrae TODOs y FIXMEs de una lista de comentarios.
@@ -1,45 +1,81 @@
 import dataclasses
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from typing import Any
 
 from repogpt.models import CodeNode
 
+# Campos serializados, en el orden de la dataclass (mismo orden que asdict)
+_FIELDS: tuple[str, ...] = tuple(f.name for f in dataclasses.fields(CodeNode))
+
+
+def node_to_dict(node: CodeNode, *, nested: bool = False) -> dict[str, Any]:
+    """
+    Serializa un CodeNode a dict sin la copia profunda de ``dataclasses.asdict``.
+
+    Las listas/dicts del nodo se copian en superficie (los comentarios y
+    dependencias son dicts planos). Con ``nested=True`` incluye ``children``
+    recursivamente; si no, omite la clave. Cada nodo se visita una sola vez.
+    """
+    d: dict[str, Any] = {}
+    for name in _FIELDS:
+        value = getattr(node, name)
+        if name == "children":
+            if nested:
+                d[name] = [node_to_dict(c, nested=True) for c in value]
+        elif isinstance(value, list):
+            d[name] = list(value)
+        elif isinstance(value, dict):
+            d[name] = dict(value)
+        else:
+            d[name] = value
+    return d
+
+
+def iter_flat_nodes(root: CodeNode) -> Iterator[dict[str, Any]]:
+    """Recorre el árbol en preorden emitiendo un dict plano (sin children) por nodo."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node_to_dict(node)
+        stack.extend(reversed(node.children))
+
 
 def flatten_tree(root: CodeNode) -> list[dict[str, Any]]:
-    result: list[dict[str, Any]] = []
+    return list(iter_flat_nodes(root))
 
-    def walk(node: CodeNode) -> None:
-        d = dataclasses.asdict(node).copy()
-        d.pop("children")
-        result.append(d)
-        for child in node.children:
-            walk(child)
 
-    walk(root)
-    return result
+def node_from_dict(data: dict[str, Any]) -> CodeNode:
+    """Reconstruye un árbol de CodeNode a partir de su forma anidada (asdict)."""
+    fields = dict(data)
+    children = fields.pop("children", [])
+    node = CodeNode(**fields)
+    node.children = [node_from_dict(c) for c in children]
+    return node
 
 
 # === Query-tree utils
+# Cada llamada recorre el árbol entero; para muchas consultas sobre la misma
+# ejecución usa repogpt.utils.repo_index.RepoIndex.
 
 
 def nodes_by_type(root: CodeNode, type_: str) -> list[dict[str, Any]]:
     """Devuelve todos los nodos del árbol de un tipo dado."""
-    return [n for n in flatten_tree(root) if n["type"] == type_]
+    return [n for n in iter_flat_nodes(root) if n["type"] == type_]
 
 
 def all_comments(root: CodeNode) -> list[dict[str, Any]]:
     """Devuelve todos los comentarios de todos los nodos."""
-    return [c for n in flatten_tree(root) for c in n.get("comments", [])]
+    return [c for n in iter_flat_nodes(root) for c in n.get("comments", [])]
 
 
 def all_docstrings(root: CodeNode) -> list[str | None]:
     """Devuelve todos los docstrings de los nodos (si existen)."""
-    return [n["docstring"] for n in flatten_tree(root) if n.get("docstring")]
+    return [n["docstring"] for n in iter_flat_nodes(root) if n.get("docstring")]
 
 
 def all_tags(root: CodeNode) -> list[str]:
     """Devuelve todos los tags de todos los nodos."""
-    return [tag for n in flatten_tree(root) for tag in n.get("tags", [])]
+    return [tag for n in iter_flat_nodes(root) for tag in n.get("tags", [])]
 
 
 # Avanzado: filtrado por predicado arbitrario
@@ -47,4 +83,4 @@ def nodes_where(
     root: CodeNode, predicate: Callable[[dict[str, Any]], bool]
 ) -> list[dict[str, Any]]:
     """Devuelve nodos que cumplen una condición arbitraria."""
-    return [n for n in flatten_tree(root) if predicate(n)]
+    return [n for n in iter_flat_nodes(root) if predicate(n)]
@@ -0,0 +1,92 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from repogpt.adapters.cache.disk_cache import DiskCache, default_cache_dir
+from repogpt.models import CodeNode
+
+
+def _tree() -> CodeNode:
+    root = CodeNode(id="r", type="Module", name="m", start_line=1, end_line=3)
+    root.children.append(
+        CodeNode(
+            id="c",
+            type="Function",
+            name="f",
+            parent_id="r",
+            comments=[{"text": "hola", "line": 2}],
+        )
+    )
+    return root
+
+
+def _key(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def test_roundtrip(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path)
+    key = _key("a.py")
+    assert cache.get(key) is None
+
+    cache.put(key, _tree())
+    got = cache.get(key)
+
+    assert got == _tree()
+    assert got is not None and got.children[0].comments[0]["text"] == "hola"
+
+
+def test_corrupt_entry_is_a_miss(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path)
+    key = _key("a.py")
+    cache.put(key, _tree())
+    entry = next(tmp_path.glob("*/*.json"))
+    entry.write_text("{not json", encoding="utf-8")
+
+    assert cache.get(key) is None
+    assert not entry.exists()
+
+
+@pytest.mark.parametrize(
+    "content", ["[1, 2]", '"x"', "null", '{"format": 1}', '{"format": 1, "root": 3}']
+)
+def test_foreign_entry_is_a_miss(tmp_path: Path, content: str) -> None:
+    cache = DiskCache(tmp_path)
+    key = _key("a.py")
+    cache.put(key, _tree())
+    entry = next(tmp_path.glob("*/*.json"))
+    entry.write_text(content, encoding="utf-8")
+
+    assert cache.get(key) is None
+    assert not entry.exists()
+
+
+def test_prune_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path)
+    keys = [_key(str(i)) for i in range(4)]
+    for i, key in enumerate(keys):
+        cache.put(key, _tree())
+        entry = tmp_path / key[:2] / f"{key}.json"
+        os.utime(entry, (1000 + i, 1000 + i))
+    entry_size = next(tmp_path.glob("*/*.json")).stat().st_size
+    cache.max_bytes = entry_size * 3
+
+    removed = cache.prune()
+
+    assert removed == 2
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[3]) is not None
+
+
+def test_default_dir_is_per_user(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert default_cache_dir() == tmp_path / "xdg" / "repogpt"
+
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert default_cache_dir() == tmp_path / ".cache" / "repogpt"
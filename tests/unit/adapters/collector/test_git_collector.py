@@ -0,0 +1,81 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from repogpt.adapters.collector.git_collector import GitCollector
+from repogpt.exceptions import ConfigurationError
+from repogpt.models import AnalysisConf
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not found")
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _write(repo: Path, rel: str, text: str = "x = 1\n") -> None:
+    path = repo / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init", "-q")
+    _write(tmp_path, ".gitignore", "generated/\n")
+    _write(tmp_path, "src/a.py")
+    _write(tmp_path, "src/b.py")
+    _write(tmp_path, "README.md", "# R\n")
+    _write(tmp_path, "tests/test_a.py")
+    _write(tmp_path, "data.bin")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    _git(tmp_path, "tag", "base")
+    # No versionados: uno ignorado por .gitignore y otro nuevo
+    _write(tmp_path, "generated/big.py")
+    _write(tmp_path, "src/untracked.py")
+    return tmp_path
+
+
+def _rel(paths: list[Path], repo: Path) -> list[str]:
+    return [p.relative_to(repo).as_posix() for p in paths]
+
+
+def test_lists_tracked_files_with_collector_rules(repo: Path) -> None:
+    conf = AnalysisConf(repo_path=repo)
+    result = GitCollector().collect(conf)
+
+    assert _rel(result.files, repo) == ["README.md", "src/a.py", "src/b.py"]
+    assert "tests/test_a.py" in _rel(result.skipped, repo)
+    assert _rel(list(GitCollector().iter_files(conf)), repo) == _rel(result.files, repo)
+
+
+def test_since_returns_only_changed_files(repo: Path) -> None:
+    _write(repo, "src/b.py", "x = 2\n")
+    _write(repo, "src/c.py")
+    _git(repo, "add", "src/c.py")
+    _git(repo, "commit", "-q", "-m", "c")
+    (repo / "src" / "a.py").unlink()  # borrado: no se analiza
+
+    conf = AnalysisConf(repo_path=repo)
+    files = GitCollector(since="base").collect(conf).files
+    assert _rel(files, repo) == ["src/b.py", "src/c.py"]
+
+
+def test_subdirectory_paths_are_relative_to_repo_path(repo: Path) -> None:
+    _write(repo, "src/b.py", "x = 3\n")
+    conf = AnalysisConf(repo_path=repo / "src")
+    assert _rel(GitCollector().collect(conf).files, repo) == ["src/a.py", "src/b.py"]
+    assert _rel(GitCollector(since="base").collect(conf).files, repo) == ["src/b.py"]
+
+
+def test_not_a_git_repository(tmp_path: Path) -> None:
+    with pytest.raises(ConfigurationError):
+        GitCollector().collect(AnalysisConf(repo_path=tmp_path))
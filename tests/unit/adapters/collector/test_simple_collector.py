@@ -1,7 +1,11 @@
+import asyncio
 from pathlib import Path
+from typing import Any
+
 import pytest
 
-from repogpt.adapters.collector.simple_collector import SimpleCollector
+from repogpt.adapters.collector.async_collector import AsyncCollector
+from repogpt.adapters.collector.simple_collector import FileFilter, SimpleCollector
 from repogpt.models import AnalysisConf
 
 
@@ -81,3 +85,120 @@ def test_collect_file_instead_of_directory_raises(tmp_path: Path) -> None:
     conf = AnalysisConf(repo_path=file)
     with pytest.raises(NotADirectoryError):
         collector.collect(conf)
+
+
+def test_iter_files_streams_same_files_as_collect(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text("x=1")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "b.md").write_text("# B")
+    (tmp_path / "skip.txt").write_text("no")
+
+    collector = SimpleCollector()
+    conf = AnalysisConf(repo_path=tmp_path)
+    streamed = collector.iter_files(conf)
+
+    assert not isinstance(streamed, list)
+    assert sorted(streamed) == sorted(collector.collect(conf).files)
+
+
+def test_iter_files_checks_repo_eagerly(tmp_path: Path) -> None:
+    collector = SimpleCollector()
+    conf = AnalysisConf(repo_path=tmp_path / "missing")
+    with pytest.raises(FileNotFoundError):
+        collector.iter_files(conf)
+
+
+def test_collect_prunes_ignored_directories(tmp_path: Path) -> None:
+    nm = tmp_path / "node_modules" / "pkg"
+    nm.mkdir(parents=True)
+    (nm / "index.md").write_text("# dep")
+    (tmp_path / "docs" / "build").mkdir(parents=True)
+    (tmp_path / "docs" / "build" / "gen.md").write_text("# gen")
+    (tmp_path / "docs" / "guide.md").write_text("# guide")
+    (tmp_path / ".repogptignore").write_text("docs/build/\n")
+
+    collector = SimpleCollector()
+    result = collector.collect(AnalysisConf(repo_path=tmp_path))
+
+    assert [p.relative_to(tmp_path).as_posix() for p in result.files] == [
+        "docs/guide.md"
+    ]
+    # Los directorios podados se reportan una sola vez, sin su contenido
+    skipped = {p.relative_to(tmp_path).as_posix() for p in result.skipped}
+    assert {"node_modules", "docs/build"} <= skipped
+    assert "node_modules/pkg/index.md" not in skipped
+
+
+def test_collect_skips_symlinks_and_orders_deterministically(tmp_path: Path) -> None:
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "z.py").write_text("x=1")
+    (tmp_path / "a.py").write_text("x=1")
+    (tmp_path / "c.py").write_text("x=1")
+    (tmp_path / "link.py").symlink_to(tmp_path / "a.py")
+
+    collector = SimpleCollector()
+    result = collector.collect(AnalysisConf(repo_path=tmp_path))
+
+    assert [p.relative_to(tmp_path).as_posix() for p in result.files] == [
+        "a.py",
+        "c.py",
+        "b/z.py",
+    ]
+
+
+def test_file_filter_accepts_path_matches_walk_rules(tmp_path: Path) -> None:
+    (tmp_path / ".repogptignore").write_text("docs/private/\n*.gen.py\n")
+    rules = FileFilter(tmp_path, AnalysisConf(repo_path=tmp_path))
+
+    assert rules.accepts_path("src/pkg/mod.py")
+    assert rules.accepts_path("README.md")
+    assert not rules.accepts_path("node_modules/x/index.md")
+    assert not rules.accepts_path(".github/notes.md")
+    assert not rules.accepts_path("tests/helpers.py")
+    assert not rules.accepts_path("src/test_mod.py")
+    assert not rules.accepts_path("docs/private/a.md")
+    assert not rules.accepts_path("src/a.gen.py")
+    assert not rules.accepts_path("src/data.bin")
+
+
+def test_async_collector_matches_walk_order(tmp_path: Path) -> None:
+    for rel in ("b/z.py", "b/a/x.py", "a.py", "node_modules/n.py", "c/d/e/f.md"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("x = 1\n")
+    conf = AnalysisConf(repo_path=tmp_path)
+
+    async def collect() -> list[Path]:
+        return [p async for p in AsyncCollector().aiter_files(conf)]
+
+    assert asyncio.run(collect()) == list(SimpleCollector().iter_files(conf))
+
+
+def test_async_collector_caps_outstanding_listings(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for i in range(40):
+        (tmp_path / f"d{i:02}").mkdir()
+        (tmp_path / f"d{i:02}" / "m.py").write_text("x = 1\n")
+    conf = AnalysisConf(repo_path=tmp_path, io_concurrency=4)
+    started = 0
+    real = AsyncCollector._scan_dir
+
+    def counting(*args: Any) -> Any:
+        nonlocal started
+        started += 1
+        return real(*args)
+
+    monkeypatch.setattr(AsyncCollector, "_scan_dir", staticmethod(counting))
+
+    async def collect() -> list[int]:
+        outstanding = []
+        consumed = 1  # la raíz
+        async for _ in AsyncCollector().aiter_files(conf):
+            consumed += 1  # un fichero por directorio
+            outstanding.append(started - consumed)
+            await asyncio.sleep(0.002)  # consumidor lento
+        return outstanding
+
+    outstanding = asyncio.run(collect())
+    assert len(outstanding) == 40
+    assert max(outstanding) <= conf.io_concurrency
@@ -81,3 +81,31 @@
 #     result = parser.parse(input_)
 #     assert result.single_comments_count == 0
 #     assert result.comments_count == 0
+
+
+from pathlib import Path  # noqa: E402
+
+from repogpt.adapters.parser.md_parser import MarkdownParser  # noqa: E402
+from repogpt.models import PROFILES, CodeNode, ParserInput  # noqa: E402
+
+MODES_DOC = "# Guía\n\n<!-- TODO: ampliar -->\n\n## Uso\n\n```\nx\n```\n\n# Otro\n"
+
+
+def test_md_modes(tmp_path: Path) -> None:
+    fp = tmp_path / "doc.md"
+    fp.write_text(MODES_DOC, encoding="utf-8")
+
+    def parse(mode: str) -> CodeNode:
+        return MarkdownParser().parse(ParserInput(fp, {}, analysis=PROFILES[mode]))
+
+    fast, standard, full = parse("fast"), parse("standard"), parse("full")
+
+    assert [c.id for c in fast.children] == [c.id for c in standard.children]
+    assert fast.comments == [] and fast.tags == [] and fast.metrics == {}
+    assert standard.tags == ["TODO"]
+    assert "section_lines" not in standard.children[0].metrics
+    guia, uso, otro, block = full.children
+    assert guia.metrics["section_lines"] == 10
+    assert uso.metrics["section_lines"] == 6
+    assert otro.metrics["section_lines"] == 1
+    assert block.metrics == {"lines": 3}
@@ -4,7 +4,7 @@ import os
 from pathlib import Path
 
 from repogpt.adapters.parser.py_parser import PythonParser
-from repogpt.models import ParserInput
+from repogpt.models import PROFILES, CodeNode, ParserInput
 from repogpt.utils.tree_utils import (
     all_comments,
     all_docstrings,
@@ -115,3 +115,132 @@ def test_edge_cases_comments_py() -> None:
     assert any("Comentario sin espacio" in t for t in texts)
     assert any("indentación" in t for t in texts)
     assert any("símbolos matemáticos" in t for t in texts)
+
+
+def test_node_ids_are_stable_across_runs_and_edits(tmp_path: Path) -> None:
+    source = "import os\n\nclass Bar:\n    def baz(self):\n        pass\n"
+    fp = tmp_path / "mod.py"
+    fp.write_text(source, encoding="utf-8")
+    parser = PythonParser()
+
+    def ids() -> dict[str | None, str]:
+        root = parser.parse(ParserInput(fp, {}, rel_path="pkg/mod.py"))
+        return {n["qualname"]: n["id"] for n in flatten_tree(root)}
+
+    before = ids()
+    assert before == ids()
+    assert "Bar.baz" in before
+
+    # Añadir código en otra parte no cambia los IDs existentes
+    fp.write_text("def nueva():\n    pass\n\n\n" + source, encoding="utf-8")
+    after = ids()
+    assert after["Bar.baz"] == before["Bar.baz"]
+    assert after["Bar"] == before["Bar"]
+
+
+def _owners(root: CodeNode) -> dict[int, str | None]:
+    return {c["line"]: n["qualname"] for n in flatten_tree(root) for c in n["comments"]}
+
+
+def _reference_owners(root: CodeNode) -> dict[int, str | None]:
+    """Búsqueda recursiva desde la raíz (implementación original)."""
+
+    def walk(node: CodeNode, line: int) -> CodeNode | None:
+        if (
+            node.start_line
+            and node.end_line
+            and node.start_line <= line <= node.end_line
+        ):
+            for child in node.children:
+                found = walk(child, line)
+                if found:
+                    return found
+            return node
+        return None
+
+    lines = sorted(_owners(root))
+    return {line: (walk(root, line) or root).qualname for line in lines}
+
+
+def test_comment_association_picks_innermost_node(tmp_path: Path) -> None:
+    source = (
+        "# cabecera\n"
+        "import os  # import\n"
+        "class A:\n"
+        "    # en A\n"
+        "    def f(self):\n"
+        "        # en f\n"
+        "        def g(): import sys; import re  # en g\n"
+        "        return 1\n"
+        "    # tras f\n"
+        "def h():\n"
+        "    pass\n"
+        "# final\n"
+    )
+    fp = tmp_path / "c.py"
+    fp.write_text(source, encoding="utf-8")
+    root = PythonParser().parse(ParserInput(fp, {}))
+
+    owners = _owners(root)
+    assert owners == _reference_owners(root)
+    assert owners == {
+        1: None,
+        2: None,
+        4: "A",
+        6: "A.f",
+        7: None,  # el Import dentro de g
+        9: None,  # A termina en la línea 8
+        12: None,
+    }
+    # Varias sentencias en una línea: el primer hermano, como antes
+    g = root.children[1].children[0].children[0]
+    assert g.children[0].comments == [{"text": "en g", "line": 7}]
+
+
+def test_comment_association_matches_reference_on_fixtures() -> None:
+    for name in ("docstring_examples.py", "edge_cases.py", "edge_cases_comments.py"):
+        root = PythonParser().parse(ParserInput(load_path(name), {}))
+        assert _owners(root) == _reference_owners(root)
+
+
+MODES_SOURCE = '''
+class A:
+    """Doc de A."""
+
+    def f(self, x, *args, y=1, **kw):
+        # TODO: simplificar
+        if x and y or kw:
+            return [i for i in args if i]
+        return None
+'''
+
+
+def _parse_mode(tmp_path: Path, mode: str) -> CodeNode:
+    fp = tmp_path / "m.py"
+    fp.write_text(MODES_SOURCE, encoding="utf-8")
+    return PythonParser().parse(ParserInput(fp, {}, analysis=PROFILES[mode]))
+
+
+def test_fast_mode_keeps_structure_only(tmp_path: Path) -> None:
+    fast = _parse_mode(tmp_path, "fast")
+    standard = _parse_mode(tmp_path, "standard")
+
+    def shape(root: CodeNode) -> list[tuple[str, str | None]]:
+        return [(n["id"], n["qualname"]) for n in flatten_tree(root)]
+
+    assert shape(fast) == shape(standard)
+    assert all_comments(fast) == [] and all_docstrings(fast) == []
+    assert fast.metrics == {}
+    assert all_comments(standard) and all_docstrings(standard) == ["Doc de A."]
+
+
+def test_full_mode_adds_node_metrics_and_tags(tmp_path: Path) -> None:
+    root = _parse_mode(tmp_path, "full")
+    cls = root.children[0]
+    f = cls.children[0]
+
+    assert cls.metrics == {"lines": 8, "methods": 1}
+    # 1 + if + and + or + comprehension (su filtro no cuenta aparte)
+    assert f.metrics == {"lines": 5, "args": 5, "complexity": 5}
+    assert f.tags == ["TODO"]
+    assert _parse_mode(tmp_path, "standard").children[0].children[0].tags == []
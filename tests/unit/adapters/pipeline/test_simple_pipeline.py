@@ -1,8 +1,18 @@
+import mmap
+import threading
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 import uuid
 
+import pytest
+
+from repogpt.adapters.cache.disk_cache import DiskCache
+from repogpt.adapters.pipeline import simple_pipeline
 from repogpt.adapters.pipeline.simple_pipeline import SimplePipeline, Processor
 from repogpt.models import AnalysisConf, CodeNode, ParserInput
+from repogpt.utils import file_utils
+from repogpt.utils.file_utils import FileBuffer, get_hasher
 
 
 class MockParser:
@@ -93,3 +103,195 @@ def test_process_no_processors(tmp_path: Path) -> None:
     assert result.root is not None
     assert result.root.name == "test"
     assert result.error is None
+
+
+def test_process_uses_cache_for_unchanged_files(tmp_path: Path) -> None:
+    class CountingParser(MockParser):
+        calls = 0
+
+        def parse(self, input: ParserInput) -> CodeNode:
+            CountingParser.calls += 1
+            return super().parse(input)
+
+    fp = tmp_path / "cached.py"
+    fp.write_text("x=1", encoding="utf-8")
+    pipeline = SimplePipeline(
+        parsers={"py": CountingParser()},
+        processors={},
+        cache=DiskCache(tmp_path / "cache"),
+    )
+    conf = AnalysisConf(repo_path=tmp_path)
+
+    first = pipeline.process(fp, conf)
+    second = pipeline.process(fp, conf)
+    assert CountingParser.calls == 1
+    assert second.root == first.root
+
+    fp.write_text("x=2", encoding="utf-8")
+    pipeline.process(fp, conf)
+    assert CountingParser.calls == 2
+
+
+def test_cache_is_shared_between_checkouts(tmp_path: Path) -> None:
+    class CountingParser(MockParser):
+        calls = 0
+
+        def parse(self, input: ParserInput) -> CodeNode:
+            CountingParser.calls += 1
+            return super().parse(input)
+
+    pipeline = SimplePipeline(
+        parsers={"py": CountingParser()}, cache=DiskCache(tmp_path / "cache")
+    )
+    results = []
+    for checkout in ("ws1", "ws2"):
+        repo = tmp_path / checkout
+        (repo / "pkg").mkdir(parents=True)
+        fp = repo / "pkg" / "mod.py"
+        fp.write_text("x=1", encoding="utf-8")
+        results.append(pipeline.process(fp, AnalysisConf(repo_path=repo)))
+
+    assert CountingParser.calls == 1
+    root = results[1].root
+    assert root is not None and root.path == str(tmp_path / "ws2" / "pkg" / "mod.py")
+
+
+def test_modes_control_hashing_and_cache(tmp_path: Path) -> None:
+    seen: list[str] = []
+
+    class ModeParser(MockParser):
+        def parse(self, input: ParserInput) -> CodeNode:
+            seen.append(input.analysis.name)
+            return super().parse(input)
+
+    fp = tmp_path / "m.py"
+    fp.write_text("x=1", encoding="utf-8")
+    pipeline = SimplePipeline(
+        parsers={"py": ModeParser()}, cache=DiskCache(tmp_path / "cache")
+    )
+
+    for mode in ("fast", "fast", "standard", "full", "standard"):
+        res = pipeline.process(fp, AnalysisConf(repo_path=tmp_path, mode=mode))
+        assert ("sha256" in res.file_info) is (mode != "fast")
+
+    # fast no usa la caché; standard y full tienen entradas distintas
+    assert seen == ["fast", "fast", "standard", "full"]
+
+
+def test_hash_algorithm_is_recorded_and_keys_the_cache(tmp_path: Path) -> None:
+    parsed: list[str] = []
+
+    class AlgoParser(MockParser):
+        def parse(self, input: ParserInput) -> CodeNode:
+            parsed.append(input.file_info["hash_algorithm"])
+            return super().parse(input)
+
+    fp = tmp_path / "h.py"
+    fp.write_text("x=1", encoding="utf-8")
+    pipeline = SimplePipeline(
+        parsers={"py": AlgoParser()}, cache=DiskCache(tmp_path / "cache")
+    )
+
+    for algorithm in ("sha256", "blake2b", "sha256", "blake2b"):
+        res = pipeline.process(
+            fp, AnalysisConf(repo_path=tmp_path, hash_algorithm=algorithm)
+        )
+        assert res.file_info["hash_algorithm"] == algorithm
+        assert res.file_info[algorithm] == get_hasher(algorithm)(b"x=1")
+
+    assert parsed == ["sha256", "blake2b"]  # cada algoritmo, su entrada
+
+
+@pytest.mark.parametrize("jobs, overlap", [(1, True), (2, False), (0, False)])
+def test_large_files_are_hashed_while_parsing_with_a_spare_cpu(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, jobs: int, overlap: bool
+) -> None:
+    fp = tmp_path / "big.py"
+    fp.write_text("x = 1\n" * 1000, encoding="utf-8")
+    monkeypatch.setattr(simple_pipeline, "PARALLEL_HASH_THRESHOLD", 1)
+    monkeypatch.setattr(simple_pipeline, "CPUS", 2)
+    monkeypatch.setattr("os.cpu_count", lambda: 2)  # --jobs 0: uno por CPU
+    threads: list[str] = []
+    real = get_hasher
+
+    def spy(algorithm: str) -> Callable[[Any], str]:
+        def hasher(data: Any) -> str:
+            threads.append(threading.current_thread().name)
+            return real(algorithm)(data)
+
+        return hasher
+
+    monkeypatch.setattr(simple_pipeline, "get_hasher", spy)
+    res = SimplePipeline(parsers={"py": MockParser()}).process(
+        fp, AnalysisConf(repo_path=tmp_path, profile=True, jobs=jobs)
+    )
+
+    assert res.root is not None
+    assert res.file_info["sha256"] == get_hasher("sha256")(fp.read_bytes())
+    assert threads[0].startswith("repogpt-hash") is overlap
+    assert "hash" in res.timings
+
+
+def test_process_passes_read_buffer_to_parser(tmp_path: Path) -> None:
+    seen: list[FileBuffer | None] = []
+
+    class BufferParser(MockParser):
+        def parse(self, input: ParserInput) -> CodeNode:
+            seen.append(input.data)
+            assert input.read_text() == "x = 1\n"
+            return super().parse(input)
+
+    fp = tmp_path / "buf.py"
+    fp.write_text("x = 1\n", encoding="utf-8")
+    pipeline = SimplePipeline(parsers={"py": BufferParser()}, processors={})
+    pipeline.process(fp, AnalysisConf(repo_path=tmp_path))
+
+    assert seen == [b"x = 1\n"]
+
+
+def test_process_maps_large_files_and_releases_them(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    buffers: list[Any] = []
+    texts: list[str] = []
+
+    class BufferParser(MockParser):
+        def parse(self, input: ParserInput) -> CodeNode:
+            buffers.append(input.data)
+            texts.append(input.read_text())
+            return super().parse(input)
+
+    fp = tmp_path / "big.py"
+    fp.write_text("x = 1\n" * 100, encoding="utf-8")
+    monkeypatch.setattr(file_utils, "MMAP_THRESHOLD", 64)
+    pipeline = SimplePipeline(parsers={"py": BufferParser()}, processors={})
+    res = pipeline.process(fp, AnalysisConf(repo_path=tmp_path))
+
+    assert isinstance(buffers[0], mmap.mmap) and buffers[0].closed
+    assert texts == ["x = 1\n" * 100]
+    assert res.file_info["size"] == 600
+
+
+def test_process_binary_file(tmp_path: Path) -> None:
+    fp = tmp_path / "blob.py"
+    fp.write_bytes(b"\x00\x01\x02")
+
+    pipeline = SimplePipeline(parsers={"py": MockParser()}, processors={})
+    result = pipeline.process(fp, AnalysisConf(repo_path=tmp_path))
+
+    assert result.skipped
+    assert result.root is None and result.error is None
+    assert result.file_info["size"] == 3
+
+
+def test_process_records_timings_only_when_profiling(tmp_path: Path) -> None:
+    fp = tmp_path / "mod.py"
+    fp.write_text("x = 1\n", encoding="utf-8")
+    pipeline = SimplePipeline(parsers={"py": MockParser()})
+
+    plain = pipeline.process(fp, AnalysisConf(repo_path=tmp_path))
+    profiled = pipeline.process(fp, AnalysisConf(repo_path=tmp_path, profile=True))
+
+    assert plain.timings == {}
+    assert set(profiled.timings) == {"read", "hash", "parse", "process"}
+    assert all(sec >= 0 for sec in profiled.timings.values())
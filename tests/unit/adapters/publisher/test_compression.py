@@ -0,0 +1,103 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from repogpt.adapters.publisher.compression import (
+    compressing,
+    resolve_compression,
+    zstd_available,
+)
+from repogpt.adapters.publisher.simple_publisher import SimplePublisher
+from repogpt.exceptions import ConfigurationError
+from repogpt.models import AnalysisConf, CodeNode, PipelineResult
+
+DECOMPRESS: dict[str, Callable[[bytes], bytes]] = {
+    ".gz": gzip.decompress,
+    ".bz2": bz2.decompress,
+    ".xz": lzma.decompress,
+}
+
+
+def _results(n: int) -> list[PipelineResult]:
+    return [
+        PipelineResult(
+            path=Path(f"m{i}.py"),
+            language="py",
+            root=CodeNode(id=str(i), type="Module", name=f"m{i}"),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("suffix", sorted(DECOMPRESS))
+@pytest.mark.parametrize("fmt", ["json", "ndjson"])
+def test_publish_compresses_by_suffix(tmp_path: Path, suffix: str, fmt: str) -> None:
+    output = tmp_path / f"out.{fmt}{suffix}"
+    conf = AnalysisConf(repo_path=tmp_path, output=output, output_format=fmt)
+    SimplePublisher().publish(_results(50), conf)
+
+    text = DECOMPRESS[suffix](output.read_bytes()).decode()
+    if fmt == "json":
+        names = [d["name"] for d in json.loads(text)]
+    else:
+        names = [json.loads(line)["name"] for line in text.splitlines()]
+    assert names == [f"m{i}" for i in range(50)]
+
+
+def test_explicit_compression_overrides_suffix(tmp_path: Path) -> None:
+    output = tmp_path / "out.ndjson"
+    conf = AnalysisConf(
+        repo_path=tmp_path,
+        output=output,
+        output_format="ndjson",
+        compression="gzip",
+        compress_level=1,
+    )
+    SimplePublisher().publish(_results(3), conf)
+    assert len(gzip.decompress(output.read_bytes()).splitlines()) == 3
+
+
+def test_resolve_compression() -> None:
+    assert resolve_compression(None, Path("a.ndjson.XZ")) == "xz"
+    assert resolve_compression(None, Path("a.json")) == "none"
+    assert resolve_compression(None, None) == "none"
+    assert resolve_compression("auto", None) == ("zstd" if zstd_available() else "gzip")
+    with pytest.raises(ConfigurationError):
+        resolve_compression("lz4", None)
+
+
+def test_compressing_leaves_raw_open_and_checks_level() -> None:
+    raw = io.BytesIO()
+    with compressing(raw, "gzip") as out:
+        out.write(b"hola\n")
+    assert not raw.closed
+    assert gzip.decompress(raw.getvalue()) == b"hola\n"
+
+    with pytest.raises(ConfigurationError):
+        with compressing(io.BytesIO(), "bz2", 0):
+            pass
+
+
+@pytest.mark.skipif(zstd_available(), reason="zstandard is installed")
+def test_zstd_without_package_is_a_configuration_error() -> None:
+    with pytest.raises(ConfigurationError):
+        with compressing(io.BytesIO(), "zstd"):
+            pass
+
+
+@pytest.mark.skipif(not zstd_available(), reason="zstandard not installed")
+def test_zstd_round_trip() -> None:
+    import zstandard
+
+    raw = io.BytesIO()
+    with compressing(raw, "zstd", 3) as out:
+        out.write(b"x" * 1000)
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(raw.getvalue()) == (
+        b"x" * 1000
+    )
@@ -0,0 +1,85 @@
+import importlib.util
+import json
+from collections.abc import Iterator
+
+import pytest
+
+from repogpt.adapters.publisher.encoders import (
+    StdlibEncoder,
+    get_encoder,
+    iter_json_array,
+)
+from repogpt.exceptions import ConfigurationError
+
+OBJ = {"id": "1", "name": "módulo", "metrics": {"loc": 3}, "tags": ["TODO"]}
+
+AVAILABLE = ["json"] + [
+    name for name in ("orjson", "msgspec") if importlib.util.find_spec(name)
+]
+
+
+@pytest.mark.parametrize("backend", AVAILABLE)
+def test_backends_round_trip(backend: str) -> None:
+    pretty = get_encoder(backend)
+    compact = get_encoder(backend, compact=True)
+
+    assert json.loads(pretty.encode([OBJ])) == [OBJ]
+    assert b'\n  "id"' in pretty.encode(OBJ)
+    assert b"\n" not in compact.encode([OBJ, OBJ])
+    line = compact.encode_line(OBJ)
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert json.loads(line) == OBJ
+    assert "módulo".encode() in line  # UTF-8, no escapes \u
+
+
+def test_auto_falls_back_to_stdlib(monkeypatch: pytest.MonkeyPatch) -> None:
+    import builtins
+
+    real_import = builtins.__import__
+
+    def no_fast(name: str, *args, **kwargs):  # type: ignore[no-untyped-def]
+        if name in ("orjson", "msgspec"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_fast)
+    assert isinstance(get_encoder("auto"), StdlibEncoder)
+    with pytest.raises(ConfigurationError):
+        get_encoder("orjson")
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ConfigurationError):
+        get_encoder("yaml")
+
+
+@pytest.mark.parametrize("objs", [[], [OBJ], [OBJ, {"a": [1, {"b": "x\ny"}]}, 3]])
+def test_iter_json_array_matches_json_dumps(objs: list[object]) -> None:
+    pretty = b"".join(iter_json_array(StdlibEncoder(), iter(objs)))
+    compact = b"".join(iter_json_array(StdlibEncoder(compact=True), iter(objs)))
+
+    assert pretty.decode() == json.dumps(objs, ensure_ascii=False, indent=2)
+    assert compact.decode() == json.dumps(
+        objs, ensure_ascii=False, separators=(",", ":")
+    )
+
+
+@pytest.mark.parametrize("backend", AVAILABLE)
+def test_iter_json_array_is_valid_for_every_backend(backend: str) -> None:
+    for compact in (False, True):
+        enc = get_encoder(backend, compact)
+        data = b"".join(iter_json_array(enc, [OBJ, OBJ]))
+        assert json.loads(data) == [OBJ, OBJ]
+
+
+def test_iter_json_array_is_lazy() -> None:
+    pulled: list[int] = []
+
+    def objs() -> Iterator[dict[str, int]]:
+        for i in range(3):
+            pulled.append(i)
+            yield {"i": i}
+
+    chunks = iter_json_array(StdlibEncoder(), objs())
+    next(chunks), next(chunks)  # "[" + primer elemento
+    assert pulled == [0]
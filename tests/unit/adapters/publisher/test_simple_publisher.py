@@ -1,9 +1,17 @@
 import json
+import os
+import stat
+import threading
 from pathlib import Path
+from collections.abc import Iterator
 from typing import Any
 
-from repogpt.adapters.publisher.simple_publisher import SimplePublisher
+from repogpt.adapters.publisher.simple_publisher import (
+    SimplePublisher,
+    serialize_result,
+)
 from repogpt.models import AnalysisConf, CodeNode, PipelineResult
+from repogpt.utils.file_utils import default_file_mode
 
 
 def test_publish_json(tmp_path: Path) -> None:
@@ -156,3 +164,100 @@ def test_publish_empty_results(tmp_path: Path) -> None:
 
     data = json.loads(output.read_text(encoding="utf-8"))
     assert data == []
+
+
+def test_publish_ndjson_consumes_results_lazily(tmp_path: Path) -> None:
+    output = tmp_path / "out.ndjson"
+    conf = AnalysisConf(
+        repo_path=tmp_path,
+        output=output,
+        output_format="ndjson",
+        flatten_kind="file",
+    )
+    produced: list[int] = []
+
+    def results() -> Iterator[PipelineResult]:
+        for i in range(3):
+            produced.append(i)
+            node = CodeNode(id=str(i), type="Module", name=f"m{i}", children=[])
+            yield PipelineResult(path=Path(f"m{i}.py"), language="py", root=node)
+
+    SimplePublisher().publish(results(), conf)
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert produced == [0, 1, 2]
+    assert [json.loads(line)["name"] for line in lines] == ["m0", "m1", "m2"]
+
+
+def test_publish_json_compact(tmp_path: Path) -> None:
+    output = tmp_path / "out.json"
+    conf = AnalysisConf(
+        repo_path=tmp_path, output=output, output_format="json", compact=True
+    )
+    node = CodeNode(id="1", type="Module", name="m", children=[])
+    SimplePublisher().publish(
+        [PipelineResult(path=Path("m.py"), language="py", root=node)], conf
+    )
+
+    raw = output.read_bytes()
+    assert b"\n" not in raw
+    assert json.loads(raw)[0]["name"] == "m"
+
+
+def test_publish_file_gets_umask_permissions(tmp_path: Path) -> None:
+    output = tmp_path / "out.json"
+    node = CodeNode(id="1", type="Module", name="m", children=[])
+    SimplePublisher().publish(
+        [PipelineResult(path=Path("m.py"), language="py", root=node)],
+        AnalysisConf(repo_path=tmp_path, output=output),
+    )
+
+    assert output.stat().st_mode & 0o777 == default_file_mode()
+
+
+def test_yield_serialized_nodes_uses_serializer(tmp_path: Path) -> None:
+    root = CodeNode(id="1", type="Module", name="m")
+    root.children.append(CodeNode(id="2", type="Function", name="f", parent_id="1"))
+    result = PipelineResult(path=Path("m.py"), language="py", root=root)
+
+    for flatten in ("node", "file"):
+        conf = AnalysisConf(repo_path=tmp_path, flatten_kind=flatten)
+        got = list(SimplePublisher()._yield_serialized_nodes(result, conf))
+        assert got == list(serialize_result(result, flatten))
+
+
+def _module(name: str = "m") -> PipelineResult:
+    node = CodeNode(id="1", type="Module", name=name, children=[])
+    return PipelineResult(path=Path(f"{name}.py"), language="py", root=node)
+
+
+def test_publish_through_symlink_writes_the_target(tmp_path: Path) -> None:
+    target = tmp_path / "real" / "out.json"
+    target.parent.mkdir()
+    target.write_text("[]")
+    link = tmp_path / "link.json"
+    link.symlink_to(target)
+
+    SimplePublisher().publish(
+        [_module()], AnalysisConf(repo_path=tmp_path, output=link)
+    )
+
+    assert link.is_symlink()
+    assert json.loads(target.read_text())[0]["name"] == "m"
+
+
+def test_publish_to_non_regular_file_writes_in_place(tmp_path: Path) -> None:
+    fifo = tmp_path / "out.fifo"
+    os.mkfifo(fifo)
+    received: list[bytes] = []
+    reader = threading.Thread(target=lambda: received.append(fifo.read_bytes()))
+    reader.start()
+
+    SimplePublisher().publish(
+        [_module()], AnalysisConf(repo_path=tmp_path, output=fifo)
+    )
+    reader.join()
+
+    assert stat.S_ISFIFO(fifo.stat().st_mode)
+    assert json.loads(received[0])[0]["name"] == "m"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.fifo"]
@@ -0,0 +1,197 @@
+import json
+import sqlite3
+from collections.abc import Iterator
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from repogpt.adapters.parser import parsers
+from repogpt.adapters.pipeline.simple_pipeline import SimplePipeline
+from repogpt.adapters.publisher.sqlite_publisher import SqlitePublisher
+from repogpt.exceptions import AnalysisError, ConfigurationError
+from repogpt.models import AnalysisConf, CodeNode, PipelineResult
+
+
+def _result(repo: Path, name: str, sha: str) -> PipelineResult:
+    root = CodeNode(
+        id=f"{name}:mod",
+        type="Module",
+        name=name,
+        comments=[{"line": 1, "text": "# TODO"}],
+    )
+    root.children = [
+        CodeNode(
+            id=f"{name}:cls",
+            type="Class",
+            name="A",
+            qualname="A",
+            parent_id=root.id,
+            tags=["TODO"],
+        ),
+        CodeNode(
+            id=f"{name}:imp",
+            type="Import",
+            parent_id=root.id,
+            dependencies=[{"name": "os", "type": "external"}],
+        ),
+    ]
+    return PipelineResult(
+        path=repo / f"{name}.py",
+        language="py",
+        root=root,
+        file_info={"size": 10, "sha256": sha},
+    )
+
+
+def _conf(tmp_path: Path) -> AnalysisConf:
+    return AnalysisConf(
+        repo_path=tmp_path, output=tmp_path / "a.sqlite", output_format="sqlite"
+    )
+
+
+def test_publish_normalized_tables(tmp_path: Path) -> None:
+    conf = _conf(tmp_path)
+    failed = PipelineResult(
+        path=tmp_path / "bad.py", language="py", root=None, error="boom"
+    )
+    SqlitePublisher().publish(
+        [_result(tmp_path, "a", "h1"), _result(tmp_path, "b", "h2"), failed], conf
+    )
+
+    db = sqlite3.connect(conf.output)  # type: ignore[arg-type]
+    assert db.execute("SELECT path, error FROM files ORDER BY path").fetchall() == [
+        ("a.py", None),
+        ("b.py", None),
+        ("bad.py", "boom"),
+    ]
+    classes = db.execute(
+        "SELECT f.path, n.qualname, n.parent_id, n.tags FROM nodes n "
+        "JOIN files f ON f.id = n.file_id WHERE n.type = 'Class' ORDER BY f.path"
+    ).fetchall()
+    assert classes == [
+        ("a.py", "A", "a:mod", '["TODO"]'),
+        ("b.py", "A", "b:mod", '["TODO"]'),
+    ]
+    importers = db.execute(
+        "SELECT DISTINCT f.path FROM dependencies d "
+        "JOIN files f ON f.id = d.file_id WHERE d.target = 'os' ORDER BY f.path"
+    ).fetchall()
+    assert importers == [("a.py",), ("b.py",)]
+    assert db.execute("SELECT COUNT(*) FROM comments").fetchone() == (2,)
+
+
+def test_rerun_rewrites_only_changed_files_and_prunes(tmp_path: Path) -> None:
+    conf = _conf(tmp_path)
+    SqlitePublisher().publish(
+        [_result(tmp_path, "a", "h1"), _result(tmp_path, "b", "h2")], conf
+    )
+    db = sqlite3.connect(conf.output)  # type: ignore[arg-type]
+    a_rows = db.execute(
+        "SELECT n.id FROM nodes n JOIN files f ON f.id = n.file_id "
+        "WHERE f.path = 'a.py'"
+    ).fetchall()
+
+    # a.py sin cambios, b.py borrado, c.py nuevo
+    SqlitePublisher().publish(
+        [_result(tmp_path, "a", "h1"), _result(tmp_path, "c", "h3")], conf
+    )
+
+    # cada publicación sustituye el fichero: hay que reabrir la base
+    db = sqlite3.connect(conf.output)  # type: ignore[arg-type]
+    assert db.execute("SELECT path FROM files ORDER BY path").fetchall() == [
+        ("a.py",),
+        ("c.py",),
+    ]
+    assert (
+        db.execute(
+            "SELECT n.id FROM nodes n JOIN files f ON f.id = n.file_id "
+            "WHERE f.path = 'a.py'"
+        ).fetchall()
+        == a_rows
+    )
+    assert db.execute("SELECT COUNT(*) FROM nodes").fetchone() == (6,)
+    assert db.execute("SELECT COUNT(*) FROM dependencies").fetchone() == (2,)
+
+    # contenido nuevo para a.py: se reemplazan sus filas
+    SqlitePublisher(prune=False).publish([_result(tmp_path, "a", "h9")], conf)
+    db = sqlite3.connect(conf.output)  # type: ignore[arg-type]
+    assert db.execute("SELECT COUNT(*) FROM files").fetchone() == (2,)
+    assert db.execute("SELECT sha256 FROM files WHERE path = 'a.py'").fetchone() == (
+        "h9",
+    )
+    assert db.execute("SELECT COUNT(*) FROM nodes").fetchone() == (6,)
+
+
+def test_aborted_run_rolls_back(tmp_path: Path) -> None:
+    conf = _conf(tmp_path)
+    SqlitePublisher().publish([_result(tmp_path, "a", "h1")], conf)
+
+    def aborted() -> Iterator[PipelineResult]:
+        yield _result(tmp_path, "a", "h2")
+        yield _result(tmp_path, "b", "h3")
+        raise AnalysisError("fail-fast")
+
+    with pytest.raises(AnalysisError):
+        SqlitePublisher().publish(aborted(), conf)
+
+    db = sqlite3.connect(conf.output)  # type: ignore[arg-type]
+    assert db.execute("SELECT path, sha256 FROM files").fetchall() == [("a.py", "h1")]
+    assert db.execute("SELECT COUNT(*) FROM nodes").fetchone() == (3,)
+
+
+def test_mode_change_rewrites_unchanged_files(tmp_path: Path) -> None:
+    (tmp_path / "m.py").write_text("def f(x):\n    if x:\n        return 1\n")
+    pipeline = SimplePipeline(parsers)
+
+    def run(mode: str) -> list[tuple[str | None]]:
+        conf = replace(_conf(tmp_path), mode=mode)
+        SqlitePublisher().publish([pipeline.process(tmp_path / "m.py", conf)], conf)
+        db = sqlite3.connect(conf.output)  # type: ignore[arg-type]
+        return db.execute(
+            "SELECT metrics FROM nodes WHERE type = 'Function'"
+        ).fetchall()
+
+    assert run("standard") == [(None,)]
+    (metrics,) = run("full")[0]
+    assert metrics is not None and "complexity" in json.loads(metrics)
+
+
+def test_batched_commits_still_publish_atomically(tmp_path: Path) -> None:
+    conf = _conf(tmp_path)
+    SqlitePublisher().publish([_result(tmp_path, "a", "h1")], conf)
+    assert conf.output is not None
+    before = conf.output.read_bytes()
+
+    def aborted() -> Iterator[PipelineResult]:
+        for i in range(5):
+            yield _result(tmp_path, f"m{i}", f"h{i}")
+        raise AnalysisError("fail-fast")
+
+    with pytest.raises(AnalysisError):
+        SqlitePublisher(batch_size=2).publish(aborted(), conf)
+    assert conf.output.read_bytes() == before
+    assert [p.name for p in tmp_path.iterdir()] == ["a.sqlite"]
+
+    SqlitePublisher(batch_size=2).publish(
+        [_result(tmp_path, f"m{i}", f"h{i}") for i in range(5)], conf
+    )
+    db = sqlite3.connect(conf.output)
+    assert db.execute("SELECT COUNT(*) FROM files").fetchone() == (5,)
+
+
+def test_non_database_output_is_a_configuration_error(tmp_path: Path) -> None:
+    conf = _conf(tmp_path)
+    assert conf.output is not None
+    conf.output.write_text("not a database, keep me\n" * 10)
+
+    with pytest.raises(ConfigurationError, match="not a SQLite database"):
+        SqlitePublisher().publish([_result(tmp_path, "a", "h1")], conf)
+    assert conf.output.read_text() == "not a database, keep me\n" * 10
+    assert [p.name for p in tmp_path.iterdir()] == ["a.sqlite"]
+
+
+def test_sqlite_to_stdout_is_rejected(tmp_path: Path) -> None:
+    conf = AnalysisConf(repo_path=tmp_path, to_stdout=True, output_format="sqlite")
+    with pytest.raises(ConfigurationError):
+        SqlitePublisher().publish([], conf)
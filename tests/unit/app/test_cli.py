@@ -0,0 +1,75 @@
+import json
+import sqlite3
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+import structlog
+
+from repogpt.app.cli import main
+
+
+@pytest.fixture(autouse=True)
+def _reset_logging() -> Iterator[None]:
+    # main() configura structlog contra el stderr capturado por pytest
+    yield
+    structlog.reset_defaults()
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "mod.py").write_text("x = 1\n")
+    (root / "README.md").write_text("# Title\n")
+    (root / "pkg" / "bin.py").write_bytes(b"x = 1\x00\x01")
+    return root
+
+
+def test_fail_fast_ignores_binary_files(tmp_path: Path, repo: Path) -> None:
+    output = tmp_path / "out.json"
+
+    code = main([str(repo), "--fail-fast", "--no-cache", "-o", str(output)])
+
+    assert code == 0
+    paths = {Path(n["path"]).name for n in json.loads(output.read_text())}
+    assert paths == {"mod.py", "README.md"}
+
+
+def test_sqlite_has_no_row_for_binary_files(tmp_path: Path, repo: Path) -> None:
+    output = tmp_path / "out.sqlite"
+
+    code = main([str(repo), "--no-cache", "--format", "sqlite", "-o", str(output)])
+
+    assert code == 0
+    rows = sqlite3.connect(output).execute("SELECT path, error FROM files").fetchall()
+    assert sorted(rows) == [("README.md", None), ("pkg/mod.py", None)]
+
+
+def test_configuration_errors_exit_with_usage_code(
+    tmp_path: Path, repo: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    output = tmp_path / "out.json"
+
+    code = main([str(repo), "--collector", "git", "--no-cache", "-o", str(output)])
+
+    assert code == 2
+    err = capsys.readouterr().err
+    assert "configuration error" in err and "Traceback" not in err
+    assert not output.exists()
+
+
+def test_missing_xxhash_is_a_usage_error(
+    tmp_path: Path,
+    repo: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setitem(sys.modules, "xxhash", None)  # import xxhash → ImportError
+
+    code = main([str(repo), "--hash-algorithm", "xxh3", "-o", str(tmp_path / "o")])
+
+    assert code == 2
+    err = capsys.readouterr().err
+    assert "xxhash" in err and "Traceback" not in err
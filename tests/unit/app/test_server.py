@@ -0,0 +1,174 @@
+import json
+import threading
+import urllib.request
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+from repogpt.adapters.collector.simple_collector import SimpleCollector
+from repogpt.adapters.parser import parsers
+from repogpt.adapters.pipeline.simple_pipeline import SimplePipeline
+from repogpt.app.server import AnalysisServer, make_http_server
+from repogpt.core.incremental import IncrementalAnalysis
+from repogpt.exceptions import ConfigurationError
+from repogpt.models import AnalysisConf
+
+SOURCE = '''
+class Greeter:
+    """Says hello."""
+
+    def hello(self):
+        return "hi"
+
+
+def hello():
+    pass
+'''
+
+
+def _server(*repos: Path) -> AnalysisServer:
+    app = AnalysisServer(
+        IncrementalAnalysis(
+            SimpleCollector(), SimplePipeline(parsers), AnalysisConf(repo_path=repo)
+        )
+        for repo in repos
+    )
+    app.load()
+    return app
+
+
+def _get(app: AnalysisServer, target: str, method: str = "GET") -> tuple[int, Any]:
+    status, body = app.handle(method, target)
+    return status, json.loads(body)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    root = tmp_path / "proj"
+    root.mkdir()
+    (root / "greet.py").write_text(SOURCE)
+    return root
+
+
+def test_query_by_name_and_type(repo: Path) -> None:
+    app = _server(repo)
+
+    status, nodes = _get(app, "/query?name=hello")
+    assert status == 200
+    assert sorted(n["qualname"] for n in nodes) == ["Greeter.hello", "hello"]
+
+    _, nodes = _get(app, "/query?name=Greeter&type=Function")
+    assert nodes == []
+
+    _, nodes = _get(app, "/query?path=greet.py&type=Class")
+    assert [n["docstring"] for n in nodes] == ["Says hello."]
+
+
+def test_repeated_query_is_served_from_cache(repo: Path) -> None:
+    app = _server(repo)
+
+    first = app.handle("GET", "/query?type=Function")
+    second = app.handle("GET", "/query?type=Function")
+
+    assert first == second
+    assert (app.hits, app.misses) == (1, 1)
+
+
+def test_refresh_invalidates_cached_answers(repo: Path) -> None:
+    app = _server(repo)
+    _, before = _get(app, "/query?type=Function")
+
+    (repo / "more.py").write_text("def extra():\n    pass\n")
+    status, changes = _get(app, "/refresh", method="POST")
+    _, after = _get(app, "/query?type=Function")
+
+    assert status == 200 and changes["added"] == 1
+    assert len(after) == len(before) + 1
+
+
+def test_answer_is_cached_under_the_generation_it_was_computed_from(
+    repo: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app = _server(repo)
+    analysis = app.repos["proj"].analysis
+    real = analysis.snapshot
+
+    def refresh_meanwhile() -> Any:
+        # el watcher aplica un cambio entre la consulta al LRU y el cálculo
+        monkeypatch.setattr(analysis, "snapshot", real)
+        (repo / "more.py").write_text("def extra():\n    pass\n")
+        analysis.refresh()
+        return real()
+
+    monkeypatch.setattr(analysis, "snapshot", refresh_meanwhile)
+    _, first = _get(app, "/analyze?flatten=file")
+    _, second = _get(app, "/analyze?flatten=file")
+
+    assert analysis.generation == 2
+    assert [Path(f["path"]).name for f in first] == ["greet.py", "more.py"]
+    assert second == first
+    assert (app.hits, app.misses) == (1, 1)
+
+
+def test_analyze_matches_publisher_layout(repo: Path) -> None:
+    app = _server(repo)
+
+    _, files = _get(app, "/analyze?flatten=file")
+
+    assert [Path(f["path"]).name for f in files] == ["greet.py"]
+    assert files[0]["type"] == "Module" and files[0]["children"]
+
+
+def test_node_returns_subtree(repo: Path) -> None:
+    app = _server(repo)
+    _, (cls,) = _get(app, "/query?type=Class")
+
+    status, node = _get(app, f"/node?id={cls['id']}")
+
+    assert status == 200
+    assert [c["name"] for c in node["children"]] == ["hello"]
+
+
+def test_errors(tmp_path: Path, repo: Path) -> None:
+    other = tmp_path / "other" / "proj"
+    other.mkdir(parents=True)
+    app = _server(repo, other)
+
+    assert list(app.repos) == ["proj", "proj-2"]
+    assert _get(app, "/query?type=Class")[0] == 400  # falta ?repo
+    assert _get(app, "/query?repo=nope&type=Class")[0] == 404
+    assert _get(app, "/query?repo=proj")[0] == 400  # sin filtros
+    assert _get(app, "/node?repo=proj&id=missing")[0] == 404
+    assert _get(app, "/nothing")[0] == 404
+
+
+def test_http_transport(repo: Path) -> None:
+    app = _server(repo)
+    server = make_http_server(app, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = cast(tuple[str, int], server.server_address)
+        with urllib.request.urlopen(f"http://{host}:{port}/repos") as resp:
+            repos = json.loads(resp.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert repos == [{"name": "proj", "path": str(repo), "generation": 1, "files": 1}]
+
+
+def test_socket_path_must_be_a_socket(tmp_path: Path, repo: Path) -> None:
+    app = _server(repo)
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+
+    with pytest.raises(ConfigurationError):
+        make_http_server(app, socket_path=path)
+    assert path.read_text() == "keep me"
+
+    stale = tmp_path / "repogpt.sock"
+    make_http_server(app, socket_path=stale).server_close()
+    server = make_http_server(app, socket_path=stale)  # reutiliza el anterior
+    server.server_close()
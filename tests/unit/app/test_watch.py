@@ -0,0 +1,113 @@
+import gzip
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from repogpt.adapters.collector.simple_collector import SimpleCollector
+from repogpt.adapters.parser import parsers
+from repogpt.adapters.pipeline.simple_pipeline import SimplePipeline
+from repogpt.adapters.publisher.simple_publisher import SimplePublisher
+from repogpt.app.watch import PollWatcher, make_watcher, publish_atomic, watch
+from repogpt.core.incremental import Changes, IncrementalAnalysis
+from repogpt.exceptions import ConfigurationError
+from repogpt.models import AnalysisConf
+from repogpt.utils.file_utils import default_file_mode
+
+
+def _analysis(repo: Path, output: Path) -> tuple[IncrementalAnalysis, AnalysisConf]:
+    conf = AnalysisConf(repo_path=repo, output=output, flatten_kind="file")
+    return IncrementalAnalysis(SimpleCollector(), SimplePipeline(parsers), conf), conf
+
+
+def _names(output: Path) -> list[str]:
+    return [Path(d["path"]).name for d in json.loads(output.read_text())]
+
+
+def test_publish_atomic_replaces_output(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text("x = 1\n")
+    output = tmp_path / "out.json"
+    analysis, conf = _analysis(repo, output)
+    analysis.full()
+
+    publish_atomic(SimplePublisher(), analysis, conf)
+
+    assert _names(output) == ["a.py"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.json", "repo"]
+    assert output.stat().st_mode & 0o777 == default_file_mode()
+
+
+def test_publish_atomic_hands_the_real_output_to_the_publisher(
+    tmp_path: Path,
+) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text("x = 1\n")
+    output = tmp_path / "out.json.gz"
+    analysis, conf = _analysis(repo, output)
+    analysis.full()
+    seen: list[Path | None] = []
+
+    class SpyPublisher(SimplePublisher):
+        def publish(self, results: Any, conf: AnalysisConf) -> None:
+            seen.append(conf.output)
+            super().publish(results, conf)
+
+    publish_atomic(SpyPublisher(), analysis, conf)
+
+    assert seen == [output]  # una sola escritura, sin temporal intermedio
+    docs = json.loads(gzip.decompress(output.read_bytes()))
+    assert [Path(d["path"]).name for d in docs] == ["a.py"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.json.gz", "repo"]
+
+
+def test_watch_applies_debounced_changes(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text("x = 1\n")
+    output = tmp_path / "out.json"
+    analysis, conf = _analysis(repo, output)
+    analysis.full()
+    batches: list[Changes] = []
+    stop = threading.Event()
+
+    def on_change(changes: Changes) -> None:
+        batches.append(changes)
+        publish_atomic(SimplePublisher(), analysis, conf)
+        stop.set()
+
+    thread = threading.Thread(
+        target=watch,
+        args=(analysis, PollWatcher(0.05)),
+        kwargs={"debounce": 0.1, "on_change": on_change, "stop": stop},
+    )
+    thread.start()
+    (repo / "b.py").write_text("y = 1\n")
+    (repo / "c.md").write_text("# C\n")
+    thread.join(timeout=10)
+    stop.set()
+
+    assert not thread.is_alive()
+    assert len(batches) == 1  # ambos ficheros en un único lote
+    assert sorted(p.name for p in batches[0].added) == ["b.py", "c.md"]
+    assert _names(output) == ["a.py", "b.py", "c.md"]
+
+
+def test_make_watcher(tmp_path: Path) -> None:
+    assert isinstance(make_watcher("poll", tmp_path, 1.0), PollWatcher)
+    with pytest.raises(ConfigurationError):
+        make_watcher("fsevents", tmp_path, 1.0)
+
+
+def test_watch_returns_when_stopped(tmp_path: Path) -> None:
+    analysis, _ = _analysis(tmp_path, tmp_path / "out.json")
+    stop = threading.Event()
+    stop.set()
+    start = time.monotonic()
+    watch(analysis, PollWatcher(10), stop=stop)
+    assert time.monotonic() - start < 1
@@ -0,0 +1,85 @@
+import asyncio
+from collections.abc import AsyncIterator, Generator
+from pathlib import Path
+from typing import cast
+
+import pytest
+
+from repogpt.adapters.collector.async_collector import AsyncCollector
+from repogpt.adapters.collector.simple_collector import SimpleCollector
+from repogpt.adapters.parser import parsers
+from repogpt.adapters.pipeline.async_pipeline import AsyncPipeline
+from repogpt.adapters.pipeline.simple_pipeline import SimplePipeline
+from repogpt.core.async_executor import arun_pipeline, run_pipeline_async
+from repogpt.core.executor import run_pipeline
+from repogpt.models import AnalysisConf, PipelineResult
+
+
+def _make_repo(root: Path) -> None:
+    for pkg in ("a", "b", "b/c"):
+        (root / pkg).mkdir(parents=True, exist_ok=True)
+        for i in range(4):
+            (root / pkg / f"m{i}.py").write_text(f"def f{i}():\n    return {i}\n")
+    (root / "top.md").write_text("# Title\n")
+
+
+@pytest.mark.parametrize(
+    "executor, jobs", [("thread", 1), ("thread", 3), ("process", 2)]
+)
+def test_async_run_matches_sync(tmp_path: Path, executor: str, jobs: int) -> None:
+    _make_repo(tmp_path)
+    conf = AnalysisConf(
+        repo_path=tmp_path, jobs=jobs, executor=executor, io_concurrency=4
+    )
+    sync = list(
+        run_pipeline(SimplePipeline(parsers), SimpleCollector().iter_files(conf), conf)
+    )
+
+    results = list(run_pipeline_async(AsyncCollector(), AsyncPipeline(parsers), conf))
+
+    assert [r.path for r in results] == [r.path for r in sync]
+    assert [r.file_info for r in results] == [r.file_info for r in sync]
+    assert all(r.root is not None for r in results)
+
+
+def test_sync_collector_is_adapted(tmp_path: Path) -> None:
+    _make_repo(tmp_path)
+    conf = AnalysisConf(repo_path=tmp_path)
+
+    results = list(run_pipeline_async(SimpleCollector(), AsyncPipeline(parsers), conf))
+
+    assert len(results) == 13
+
+
+def test_read_errors_become_results(tmp_path: Path) -> None:
+    conf = AnalysisConf(repo_path=tmp_path)
+
+    async def files() -> AsyncIterator[Path]:
+        yield tmp_path / "missing.py"
+
+    async def collect() -> list[PipelineResult]:
+        return [r async for r in arun_pipeline(AsyncPipeline(parsers), files(), conf)]
+
+    (result,) = asyncio.run(collect())
+    assert result.root is None and (result.error or "").startswith("read error")
+
+
+def test_consumer_can_stop_early(tmp_path: Path) -> None:
+    _make_repo(tmp_path)
+    conf = AnalysisConf(repo_path=tmp_path, io_concurrency=2)
+
+    results = cast(
+        Generator[PipelineResult, None, None],
+        run_pipeline_async(AsyncCollector(), AsyncPipeline(parsers), conf),
+    )
+    first = next(results)
+    results.close()
+
+    assert first.root is not None
+
+
+def test_collector_errors_reach_consumer(tmp_path: Path) -> None:
+    conf = AnalysisConf(repo_path=tmp_path / "nope")
+
+    with pytest.raises(FileNotFoundError):
+        list(run_pipeline_async(AsyncCollector(), AsyncPipeline(parsers), conf))
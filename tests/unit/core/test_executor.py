@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import pytest
+
+from repogpt.adapters.parser import parsers
+from repogpt.adapters.pipeline.simple_pipeline import SimplePipeline
+from repogpt.core.executor import resolve_jobs, run_pipeline
+from repogpt.exceptions import ConfigurationError
+from repogpt.models import AnalysisConf
+
+
+def _make_files(tmp_path: Path, n: int) -> list[Path]:
+    files = []
+    for i in range(n):
+        fp = tmp_path / f"mod_{i:03}.py"
+        fp.write_text(f"def f{i}():\n    return {i}\n", encoding="utf-8")
+        files.append(fp)
+    return files
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_results_keep_input_order(tmp_path: Path, executor: str) -> None:
+    files = _make_files(tmp_path, 20)
+    pipeline = SimplePipeline(parsers=parsers, processors={})
+    conf = AnalysisConf(repo_path=tmp_path, jobs=3, executor=executor)
+
+    results = list(run_pipeline(pipeline, files, conf))
+
+    assert [r.path for r in results] == files
+    assert all(r.root is not None for r in results)
+    assert [r.root.children[0].name for r in results if r.root] == [
+        f"f{i}" for i in range(20)
+    ]
+
+
+def test_parallel_matches_sequential(tmp_path: Path) -> None:
+    files = _make_files(tmp_path, 5)
+    pipeline = SimplePipeline(parsers=parsers, processors={})
+    seq = list(run_pipeline(pipeline, files, AnalysisConf(repo_path=tmp_path)))
+    par = list(run_pipeline(pipeline, files, AnalysisConf(repo_path=tmp_path, jobs=2)))
+    assert [r.file_info for r in seq] == [r.file_info for r in par]
+
+
+def test_unknown_executor_raises(tmp_path: Path) -> None:
+    files = _make_files(tmp_path, 2)
+    pipeline = SimplePipeline(parsers=parsers, processors={})
+    conf = AnalysisConf(repo_path=tmp_path, jobs=2, executor="gpu")
+    with pytest.raises(ConfigurationError):
+        list(run_pipeline(pipeline, files, conf))
+
+
+def test_resolve_jobs_auto() -> None:
+    assert resolve_jobs(3) == 3
+    assert resolve_jobs(0) >= 1
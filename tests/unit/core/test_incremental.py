@@ -0,0 +1,58 @@
+import os
+from pathlib import Path
+
+from repogpt.adapters.collector.simple_collector import SimpleCollector
+from repogpt.adapters.parser import parsers
+from repogpt.adapters.pipeline.simple_pipeline import SimplePipeline
+from repogpt.core.incremental import IncrementalAnalysis
+from repogpt.models import AnalysisConf, PipelineResult
+
+
+class CountingPipeline(SimplePipeline):
+    def __init__(self) -> None:
+        super().__init__(parsers=parsers)
+        self.seen: list[str] = []
+
+    def process(self, file: Path, conf: AnalysisConf) -> PipelineResult:
+        self.seen.append(file.name)
+        return super().process(file, conf)
+
+
+def _touch(path: Path, text: str) -> None:
+    path.write_text(text, encoding="utf-8")
+    # mtime distinto aunque el sistema de ficheros tenga poca resolución
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_refresh_only_reprocesses_changed_files(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_text("y = 2\n")
+    (tmp_path / "c.md").write_text("# C\n")
+    pipeline = CountingPipeline()
+    analysis = IncrementalAnalysis(
+        SimpleCollector(), pipeline, AnalysisConf(repo_path=tmp_path)
+    )
+
+    first = analysis.full()
+    assert len(first.added) == 3
+    assert [r.path.name for r in analysis.results()] == ["a.py", "b.py", "c.md"]
+
+    pipeline.seen.clear()
+    assert not analysis.refresh()  # sin cambios: no se procesa nada
+    assert pipeline.seen == []
+
+    _touch(tmp_path / "a.py", "def f():\n    pass\n")
+    (tmp_path / "b.py").unlink()
+    (tmp_path / "d.py").write_text("z = 3\n")
+    changes = analysis.refresh()
+
+    assert [p.name for p in changes.modified] == ["a.py"]
+    assert [p.name for p in changes.added] == ["d.py"]
+    assert [p.name for p in changes.deleted] == ["b.py"]
+    assert sorted(pipeline.seen) == ["a.py", "d.py"]
+    results = analysis.results()
+    assert [r.path.name for r in results] == ["a.py", "c.md", "d.py"]
+    root = results[0].root
+    assert root is not None and [c.name for c in root.children] == ["f"]
+    assert analysis.generation == 2
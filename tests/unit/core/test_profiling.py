@@ -0,0 +1,82 @@
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+from repogpt.core.profiling import Profiler
+from repogpt.models import CodeNode, PipelineResult
+
+
+def _result(name: str, size: int, parse: float, ok: bool = True) -> PipelineResult:
+    return PipelineResult(
+        path=Path(name),
+        language=name.rsplit(".", 1)[1],
+        root=CodeNode(id=name, type="Module") if ok else None,
+        file_info={"size": size},
+        timings={"read": 0.001, "parse": parse},
+    )
+
+
+def test_nested_stages_are_exclusive() -> None:
+    prof = Profiler()
+    with prof.stage("publish"):
+        for _ in prof.timed_iter("pipeline", range(3)):
+            pass
+    prof.finish()
+
+    s = prof.summary()
+    assert set(s["stages"]) == {"publish", "pipeline"}
+    total = sum(v["seconds"] for v in s["stages"].values())
+    assert total <= s["total_seconds"] + 1e-3
+
+
+def test_timed_iter_closes_upstream() -> None:
+    closed = []
+
+    def gen() -> Iterator[int]:
+        try:
+            yield from range(10)
+        finally:
+            closed.append(True)
+
+    prof = Profiler()
+    it = prof.timed_iter("collect", gen())
+    next(it)
+    it.close()
+    assert closed == [True]
+
+
+def test_summary_languages_and_top_files(tmp_path: Path) -> None:
+    prof = Profiler()
+    prof.record(_result("a.py", 100, 0.5))
+    prof.record(_result("b.py", 5000, 0.1, ok=False))
+    prof.record(_result("c.md", 10, 0.2))
+    prof.finish()
+
+    s = prof.summary(top=2)
+    assert s["languages"]["py"] == {
+        "files": 2,
+        "failed": 1,
+        "bytes": 5100,
+        "seconds": 0.602,
+    }
+    assert [f["path"] for f in s["slowest"]] == ["a.py", "c.md"]
+    assert [f["path"] for f in s["largest"]] == ["b.py", "a.py"]
+    assert s["file_stages"]["parse"] == 0.8
+    assert "a.py" in prof.report(top=2)
+
+    out = tmp_path / "profile.json"
+    prof.write_json(out, top=2)
+    assert json.loads(out.read_text())["files"] == 3
+
+
+def test_only_top_files_are_kept() -> None:
+    prof = Profiler(top=3)
+    for i in range(100):
+        prof.record(_result(f"f{i}.py", i % 7, i / 100))
+
+    s = prof.summary()
+    assert s["files"] == 100
+    assert s["languages"]["py"]["files"] == 100
+    assert [f["path"] for f in s["slowest"]] == ["f99.py", "f98.py", "f97.py"]
+    assert [f["path"] for f in s["largest"]] == ["f6.py", "f13.py", "f20.py"]
+    assert len(prof._slowest) == len(prof._largest) == 3
@@ -0,0 +1,115 @@
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import pytest
+
+from repogpt.adapters.publisher.simple_publisher import SimplePublisher
+from repogpt.core.profiling import Profiler
+from repogpt.core.service import CodeRepoAnalysisService
+from repogpt.exceptions import AnalysisError
+from repogpt.models import AnalysisConf, CodeNode, CollectionResult, PipelineResult
+
+
+class FakeCollector:
+    def __init__(self, files: list[Path]) -> None:
+        self.files = files
+
+    def collect(self, conf: AnalysisConf) -> CollectionResult:
+        return CollectionResult(files=self.files, skipped=[])
+
+    def iter_files(self, conf: AnalysisConf) -> Iterator[Path]:
+        return iter(self.files)
+
+
+class FakePipeline:
+    def process(self, file: Path, conf: AnalysisConf) -> PipelineResult:
+        if file.name.startswith("bad"):
+            return PipelineResult(path=file, language="py", root=None, error="boom")
+        node = CodeNode(id=file.name, type="Module", name=file.stem)
+        return PipelineResult(path=file, language="py", root=node)
+
+
+class RecordingPublisher:
+    def __init__(self) -> None:
+        self.seen: list[Path] = []
+
+    def publish(self, results: Iterable[PipelineResult], conf: AnalysisConf) -> None:
+        for r in results:
+            self.seen.append(r.path)
+
+
+def _service(files: list[str]) -> tuple[CodeRepoAnalysisService, RecordingPublisher]:
+    publisher = RecordingPublisher()
+    service = CodeRepoAnalysisService(
+        collector=FakeCollector([Path(f) for f in files]),
+        pipeline=FakePipeline(),
+        publisher=publisher,
+    )
+    return service, publisher
+
+
+def test_run_streams_every_result_to_publisher(tmp_path: Path) -> None:
+    service, publisher = _service(["a.py", "bad.py", "b.py"])
+    service.run(AnalysisConf(repo_path=tmp_path))
+    assert publisher.seen == [Path("a.py"), Path("bad.py"), Path("b.py")]
+
+
+def test_run_fail_fast_stops_at_first_error(tmp_path: Path) -> None:
+    service, publisher = _service(["a.py", "bad.py", "b.py"])
+    with pytest.raises(AnalysisError):
+        service.run(AnalysisConf(repo_path=tmp_path, fail_fast=True))
+    assert publisher.seen == [Path("a.py")]
+
+
+def test_fail_fast_leaves_previous_output_untouched(tmp_path: Path) -> None:
+    output = tmp_path / "ff_out.json"
+    output.write_bytes(b'[{"name": "previous"}]\n')
+    service = CodeRepoAnalysisService(
+        collector=FakeCollector([Path("a.py"), Path("bad.py"), Path("b.py")]),
+        pipeline=FakePipeline(),
+        publisher=SimplePublisher(),
+    )
+
+    conf = AnalysisConf(repo_path=tmp_path, output=output, fail_fast=True)
+    with pytest.raises(AnalysisError):
+        service.run(conf)
+
+    assert output.read_bytes() == b'[{"name": "previous"}]\n'
+    assert [p.name for p in tmp_path.iterdir()] == ["ff_out.json"]  # sin temporal
+
+
+def test_fail_fast_with_nothing_processed_keeps_previous_output(
+    tmp_path: Path,
+) -> None:
+    output = tmp_path / "out.json"
+    output.write_bytes(b"[]\n")
+    profiler = Profiler()
+    service = CodeRepoAnalysisService(
+        collector=FakeCollector([]),
+        pipeline=FakePipeline(),
+        publisher=SimplePublisher(),
+        profiler=profiler,
+    )
+
+    with pytest.raises(AnalysisError):
+        service.run(AnalysisConf(repo_path=tmp_path, output=output, fail_fast=True))
+
+    assert output.read_bytes() == b"[]\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+    assert profiler.summary()["files"] == 0  # el profiler quedó cerrado
+
+
+def test_run_with_profiler_records_every_file(tmp_path: Path) -> None:
+    publisher = RecordingPublisher()
+    profiler = Profiler()
+    service = CodeRepoAnalysisService(
+        collector=FakeCollector([Path("a.py"), Path("bad.py")]),
+        pipeline=FakePipeline(),
+        publisher=publisher,
+        profiler=profiler,
+    )
+    service.run(AnalysisConf(repo_path=tmp_path, profile=True))
+
+    summary = profiler.summary()
+    assert summary["files"] == 2
+    assert set(summary["stages"]) == {"collect", "pipeline", "publish"}
@@ -0,0 +1,97 @@
+import mmap
+import os
+from pathlib import Path
+
+import pytest
+
+from repogpt.exceptions import ConfigurationError
+from repogpt.utils.file_utils import (
+    calculate_file_hash,
+    content_digest,
+    decode_text,
+    default_file_mode,
+    get_hasher,
+    is_likely_binary,
+    looks_binary,
+    read_file_buffer,
+    release_buffer,
+)
+
+
+def test_buffer_helpers_match_file_helpers(tmp_path: Path) -> None:
+    fp = tmp_path / "a.py"
+    fp.write_bytes("x = 'ñ'\r\ny = 2\r\n".encode())
+    data = read_file_buffer(fp)
+
+    assert isinstance(data, bytes)
+    assert get_hasher("sha256")(data) == calculate_file_hash(fp)
+    assert looks_binary(data) is is_likely_binary(fp) is False
+    assert decode_text(data) == fp.read_text(encoding="utf-8", errors="replace")
+
+
+def test_default_file_mode_follows_umask() -> None:
+    old = os.umask(0o027)
+    try:
+        assert default_file_mode() == 0o640
+    finally:
+        os.umask(old)
+
+
+def test_looks_binary_only_checks_prefix() -> None:
+    assert looks_binary(b"abc\x00def")
+    assert not looks_binary(b"a" * 2048 + b"\x00")
+
+
+def test_decode_text_replaces_invalid_utf8() -> None:
+    assert decode_text(b"caf\xe9\rok") == "caf�\nok"
+
+
+def test_large_files_are_mapped_and_match_plain_read(tmp_path: Path) -> None:
+    fp = tmp_path / "big.py"
+    fp.write_bytes("x = 'ñ'\r\n".encode() * 1000)
+
+    small = read_file_buffer(fp, threshold=1 << 30)
+    mapped = read_file_buffer(fp, threshold=1)
+    try:
+        assert isinstance(small, bytes)
+        assert isinstance(mapped, mmap.mmap)
+        sha256 = get_hasher("sha256")
+        assert sha256(mapped) == sha256(small) == calculate_file_hash(fp)
+        assert decode_text(mapped) == decode_text(small)
+        assert looks_binary(mapped) is False
+    finally:
+        release_buffer(mapped)
+    assert mapped.closed
+
+
+def test_empty_file_is_read_not_mapped(tmp_path: Path) -> None:
+    fp = tmp_path / "empty.py"
+    fp.write_bytes(b"")
+
+    assert read_file_buffer(fp, threshold=0) == b""
+
+
+@pytest.mark.parametrize("algorithm", ["sha256", "blake2b", "xxh3"])
+def test_hashers_are_deterministic_hex(algorithm: str) -> None:
+    if algorithm == "xxh3":
+        pytest.importorskip("xxhash")
+    hasher = get_hasher(algorithm)
+
+    digest = hasher(b"x = 1\n")
+
+    assert digest == hasher(b"x = 1\n")
+    assert digest != hasher(b"x = 2\n")
+    assert len(digest) == {"sha256": 64, "blake2b": 64, "xxh3": 32}[algorithm]
+    int(digest, 16)
+
+
+def test_unknown_hash_algorithm() -> None:
+    with pytest.raises(ConfigurationError):
+        get_hasher("crc32")
+
+
+def test_content_digest_is_qualified_except_for_sha256() -> None:
+    assert content_digest({"sha256": "ab"}) == "ab"
+    assert content_digest({"hash_algorithm": "sha256", "sha256": "ab"}) == "ab"
+    assert content_digest({"hash_algorithm": "xxh3", "xxh3": "cd"}) == "xxh3:cd"
+    assert content_digest({"size": 3}) is None
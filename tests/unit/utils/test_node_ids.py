@@ -0,0 +1,17 @@
+from repogpt.utils.node_ids import NodeIdFactory, make_node_id
+
+
+def test_ids_are_deterministic_and_distinct() -> None:
+    a = make_node_id("pkg/a.py", "Function", "foo")
+    assert a == make_node_id("pkg/a.py", "Function", "foo")
+    assert a != make_node_id("pkg/b.py", "Function", "foo")
+    assert a != make_node_id("pkg/a.py", "Class", "foo")
+    assert len(a) == 24
+
+
+def test_factory_disambiguates_repeats_by_order() -> None:
+    make_id = NodeIdFactory("a.py")
+    first, second = make_id("Import", None), make_id("Import", None)
+    assert first != second
+    assert first == make_node_id("a.py", "Import", "", 0)
+    assert second == make_node_id("a.py", "Import", "", 1)
@@ -0,0 +1,61 @@
+from repogpt.models import CodeNode
+from repogpt.utils import node_table
+from repogpt.utils.node_table import NodeTable
+
+
+def _tree(path: str) -> CodeNode:
+    root = CodeNode(id=f"{path}:m", type="Module", name="m", path=path, start_line=1)
+    cls = CodeNode(
+        id=f"{path}:C",
+        type="Class",
+        name="C",
+        path=path,
+        parent_id=root.id,
+        docstring="Doc",
+    )
+    cls.children.append(
+        CodeNode(
+            id=f"{path}:f",
+            type="Function",
+            name="f",
+            path=path,
+            parent_id=cls.id,
+            comments=[{"text": "x", "line": 3}],
+        )
+    )
+    root.children.extend(
+        [cls, CodeNode(id=f"{path}:g", type="Function", path=path, parent_id=root.id)]
+    )
+    return root
+
+
+def test_views_roundtrip_to_codenode() -> None:
+    table = NodeTable()
+    trees = [_tree("a.py"), _tree("b.py")]
+    for t in trees:
+        table.add_tree(t)
+
+    assert len(table) == 8
+    assert [v.to_codenode() for v in table.iter_roots()] == trees
+
+
+def test_view_exposes_codenode_interface() -> None:
+    table = NodeTable()
+    root = table.view(table.add_tree(_tree("a.py")))
+
+    cls, func = root.children
+    assert (cls.type, cls.name, cls.docstring) == ("Class", "C", "Doc")
+    assert cls.parent_id == root.id
+    assert [c.name for c in cls.children] == ["f"]
+    assert cls.children[0].comments == [{"text": "x", "line": 3}]
+    assert func.end_line is None
+    # Contenedores vacíos compartidos, no uno por nodo
+    assert func.comments is node_table._EMPTY and func.tags is node_table._EMPTY
+    assert func.metrics is node_table._EMPTY_MAPPING
+
+
+def test_paths_are_interned() -> None:
+    table = NodeTable()
+    table.add_tree(_tree("".join(["pkg/", "mod.py"])))
+    table.add_tree(_tree("".join(["pkg/", "mod", ".py"])))
+    assert len({id(p) for p in table.paths}) == 1
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+from repogpt.models import CodeNode, PipelineResult
+from repogpt.utils.repo_index import RepoIndex
+
+
+def _result(path: str) -> PipelineResult:
+    root = CodeNode(id=f"{path}:m", type="Module", name="m", path=path)
+    cls = CodeNode(
+        id=f"{path}:A",
+        type="Class",
+        name="A",
+        qualname="A",
+        path=path,
+        parent_id=root.id,
+        docstring="Doc A",
+    )
+    cls.children.append(
+        CodeNode(
+            id=f"{path}:A.f",
+            type="Function",
+            name="f",
+            qualname="A.f",
+            path=path,
+            parent_id=cls.id,
+            tags=["TODO"],
+            comments=[{"text": "# TODO", "line": 3}],
+        )
+    )
+    root.children.append(cls)
+    return PipelineResult(path=Path(path), language="py", root=root)
+
+
+def _index() -> RepoIndex:
+    failed = PipelineResult(path=Path("bad.py"), language="py", root=None)
+    return RepoIndex.from_results([_result("a.py"), failed, _result("b.py")])
+
+
+def test_lookups() -> None:
+    index = _index()
+
+    assert len(index) == 6
+    assert [v.path for v in index.by_type("Class")] == ["a.py", "b.py"]
+    assert [v.id for v in index.by_qualname("A.f")] == ["a.py:A.f", "b.py:A.f"]
+    assert [v.id for v in index.by_name("f")] == ["a.py:A.f", "b.py:A.f"]
+    assert [v.type for v in index.by_path("b.py")] == ["Module", "Class", "Function"]
+    assert [v.id for v in index.by_tag("TODO")] == ["a.py:A.f", "b.py:A.f"]
+    assert index.by_type("Missing") == []
+    assert index.paths == ["a.py", "b.py"]
+    assert index.types == ["Class", "Function", "Module"]
+
+    node = index.get("a.py:A")
+    assert node is not None and node.docstring == "Doc A"
+    assert index.get("nope") is None
+
+
+def test_adjacency() -> None:
+    index = _index()
+
+    assert [v.id for v in index.children("a.py:A")] == ["a.py:A.f"]
+    parent = index.parent("a.py:A.f")
+    assert parent is not None and parent.id == "a.py:A"
+    assert index.parent("a.py:m") is None
+    assert [v.id for v in index.ancestors("b.py:A.f")] == ["b.py:A", "b.py:m"]
+
+
+def test_where_is_lazy_and_can_use_type_index() -> None:
+    index = _index()
+
+    it = index.where(lambda v: v.docstring is not None)
+    assert next(it).id == "a.py:A"
+    assert [v.id for v in it] == ["b.py:A"]
+    funcs = index.where(lambda v: v.path == "b.py", type_="Function")
+    assert [v.id for v in funcs] == ["b.py:A.f"]
+    assert [c["line"] for c in index.comments()] == [3, 3]
+    assert list(index.docstrings()) == ["Doc A", "Doc A"]
@@ -1,9 +1,12 @@
 import os
+from typing import Any
 
 from repogpt.utils.text_processing import (
+    LineIndex,
     count_blank_lines,
     extract_comments,
     extract_todos_fixmes,
+    scan_python_source,
 )
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "../../data")
@@ -108,3 +111,47 @@ def test_comments_edge_cases_md() -> None:
     assert any("emoji" in t or "🎉" in t for t in texts)
     assert any("caracteres raros" in t for t in texts)
     assert any("ComentarioSinEspacios" in t for t in texts)
+
+
+def test_line_index_matches_newline_count() -> None:
+    text = load_file("edge_cases.md") + "\n\nfin sin salto"
+    index = LineIndex(text)
+    for offset in range(len(text)):
+        assert index.line_of(offset) == text.count("\n", 0, offset) + 1
+    assert len(index) == text.count("\n") + 1
+
+
+def test_markdown_comments_with_shared_line_index() -> None:
+    text = load_file("with_comments.md")
+    shared = extract_comments(text, language="markdown", line_index=LineIndex(text))
+    assert shared == extract_comments(text, language="markdown")
+
+
+def _reference_scan(text: str) -> tuple[list[dict[str, Any]], int, int]:
+    loc = len([line for line in text.splitlines() if line.strip()])
+    return extract_comments(text, language="python"), count_blank_lines(text), loc
+
+
+def test_scan_python_source_matches_separate_passes() -> None:
+    for name in (
+        "basic.py",
+        "bad.py",
+        "docstring_examples.py",
+        "edge_cases.py",
+        "edge_cases_blanklines.py",
+        "edge_cases_comments.py",
+    ):
+        text = load_file(name)
+        assert scan_python_source(text) == _reference_scan(text), name
+
+
+def test_scan_python_source_edge_inputs() -> None:
+    for text in (
+        "",
+        "x = 1\n\n\n",
+        "x = 1  # c\n\n   \ny = 2",
+        "def f(:\n    # roto\n\n    pass\n",  # tokenizer se detiene antes del final
+        "a = 1\f# form feed\n \n",  # separadores exóticos
+        's = """\n# no es comentario\n\n"""\n',
+    ):
+        assert scan_python_source(text) == _reference_scan(text), repr(text)
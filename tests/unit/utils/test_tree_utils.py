@@ -0,0 +1,70 @@
+import dataclasses
+import json
+from typing import Any
+
+from repogpt.models import CodeNode
+from repogpt.utils.tree_utils import (
+    flatten_tree,
+    iter_flat_nodes,
+    node_from_dict,
+    node_to_dict,
+    nodes_by_type,
+)
+
+
+def _tree() -> CodeNode:
+    root = CodeNode(id="m", type="Module", name="mod", metrics={"blank_lines": 1})
+    cls = CodeNode(id="c", type="Class", name="C", parent_id="m", tags=["TODO"])
+    cls.children.append(
+        CodeNode(
+            id="f",
+            type="Function",
+            name="f",
+            parent_id="c",
+            comments=[{"text": "hola", "line": 3}],
+        )
+    )
+    root.children.extend(
+        [cls, CodeNode(id="g", type="Function", name="g", parent_id="m")]
+    )
+    return root
+
+
+def _asdict_flat(root: CodeNode) -> list[dict[str, Any]]:
+    out = []
+
+    def walk(node: CodeNode) -> None:
+        d = dataclasses.asdict(node)
+        d.pop("children")
+        out.append(d)
+        for child in node.children:
+            walk(child)
+
+    walk(root)
+    return out
+
+
+def test_flat_serialization_matches_asdict() -> None:
+    root = _tree()
+    flat = flatten_tree(root)
+    assert [n["id"] for n in flat] == ["m", "c", "f", "g"]
+    # Mismo contenido y mismo orden de claves que la versión basada en asdict
+    assert json.dumps(flat) == json.dumps(_asdict_flat(root))
+
+
+def test_nested_serialization_matches_asdict_and_roundtrips() -> None:
+    root = _tree()
+    nested = node_to_dict(root, nested=True)
+    assert json.dumps(nested) == json.dumps(dataclasses.asdict(root))
+    assert node_from_dict(nested) == root
+
+
+def test_serialized_containers_are_independent_of_the_tree() -> None:
+    root = _tree()
+    flat = next(iter_flat_nodes(root))
+    flat["metrics"]["extra"] = 1
+    assert "extra" not in root.metrics
+
+
+def test_nodes_by_type() -> None:
+    assert [n["name"] for n in nodes_by_type(_tree(), "Function")] == ["f", "g"]